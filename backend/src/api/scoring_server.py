@@ -0,0 +1,561 @@
+"""
+Takei-prime スコアリングAPIサーバー（asyncio、標準ライブラリのみ）
+
+候補者・チームの配列表現をメモリに常駐させ、同時に届いたリクエストを
+数ミリ秒ごとにまとめて（マイクロバッチ）一括計算する。
+
+    cd backend
+    python -m src.api.scoring_server --port 8000
+    python -m src.api.scoring_server --snapshot ../data/demo/snapshot
+
+エンドポイント:
+    POST /api/v1/matching/calculate                       1ペアのFitスコア
+    POST /api/v1/matching/batch                           複数ペアのFitスコア
+    GET  /api/v1/matching/candidates/{candidate_id}/teams  候補者への配置推薦（上位K件）
+    GET  /api/v1/matching/teams/{team_id}/candidates       チームへの候補者推薦（上位K件）
+    GET  /health                                          稼働確認
+    GET  /metrics                                         エンドポイント別レイテンシ（p50/p99）
+
+mode には Preferenceモード名（stability 等）、weights には任意の α/β/γ を指定できる。
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from ..core.fit_score_calculator import (
+    CandidateBatch,
+    CandidateProfile,
+    FitComponents,
+    FitScoreEngine,
+    PreferenceMode,
+    SkillIndex,
+    TeamBatch,
+    TeamProfile,
+    pack_profiles,
+    resolve_weights,
+    round_score,
+)
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data" / "demo"
+
+# マイクロバッチの待ち時間（秒）と最大件数
+BATCH_WINDOW = 0.002
+MAX_BATCH_SIZE = 512
+
+# レイテンシ統計に保持する直近件数
+LATENCY_SAMPLES = 10_000
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH_PAIRS = 10_000
+DEFAULT_TOP_K = 10
+
+STATUS_TEXT = {
+    200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class MicroBatcher:
+    """
+    submit された要素を BATCH_WINDOW 秒（または max_batch 件）ごとにまとめて compute に渡す
+
+    compute は要素のリストを受け取り、同じ順序の結果リストを返す。
+    計算はイベントループを止めないようスレッドで実行する。
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[List], List],
+        window: float = BATCH_WINDOW,
+        max_batch: int = MAX_BATCH_SIZE
+    ):
+        self._compute = compute
+        self._window = window
+        self._max_batch = max_batch
+        self._pending: List[Tuple[object, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            asyncio.get_running_loop().create_task(self._run(pending))
+
+    async def _run(self, pending: List[Tuple[object, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(pending)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                None, self._compute, [item for item, _ in pending]
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class LatencyRecorder:
+    """エンドポイント別のレイテンシ（直近 LATENCY_SAMPLES 件）"""
+
+    def __init__(self):
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, route: str, seconds: float) -> None:
+        self._samples.setdefault(route, deque(maxlen=LATENCY_SAMPLES)).append(seconds)
+        self._counts[route] = self._counts.get(route, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for route, samples in self._samples.items():
+            values = np.fromiter(samples, dtype=np.float64) * 1000
+            result[route] = {
+                "count": self._counts[route],
+                "p50_ms": round(float(np.percentile(values, 50)), 3),
+                "p99_ms": round(float(np.percentile(values, 99)), 3),
+                "max_ms": round(float(values.max()), 3),
+            }
+        return result
+
+
+class ScoringService:
+    """
+    常駐データに対するスコア計算
+
+    候補者行の要求（ペア・候補者へのチーム推薦）は「対象候補者 × 全チーム」、
+    チーム列の要求（チームへの候補者推薦）は「全候補者 × 対象チーム」として
+    マイクロバッチごとに1回の一括計算にまとめる。
+    """
+
+    def __init__(
+        self,
+        candidates: CandidateBatch,
+        teams: TeamBatch,
+        candidate_profiles: Optional[List[CandidateProfile]] = None,
+        team_profiles: Optional[List[TeamProfile]] = None
+    ):
+        self.candidates = candidates
+        self.teams = teams
+        self.engine = FitScoreEngine()
+        self._candidate_rows = {cid: i for i, cid in enumerate(candidates.ids)}
+        self._team_cols = {tid: i for i, tid in enumerate(teams.ids)}
+        self._candidate_profiles = candidate_profiles
+        self._team_profiles = team_profiles
+        self.row_batcher = MicroBatcher(self._score_rows)
+        self.col_batcher = MicroBatcher(self._score_cols)
+        self.latency = LatencyRecorder()
+
+    @classmethod
+    def from_json(cls, data_dir: Path = DATA_DIR) -> "ScoringService":
+        with open(data_dir / "candidates.json", "r", encoding="utf-8") as f:
+            candidates = [CandidateProfile.from_dict(r) for r in json.load(f)["candidates"]]
+        with open(data_dir / "teams.json", "r", encoding="utf-8") as f:
+            teams = [TeamProfile.from_dict(r) for r in json.load(f)["teams"]]
+        skill_index = SkillIndex.from_master_file(data_dir / "skills_master.json")
+        candidate_batch, team_batch = pack_profiles(candidates, teams, skill_index)
+        return cls(candidate_batch, team_batch, candidates, teams)
+
+    @classmethod
+    def from_snapshot(cls, path: Path, section: str = "candidates") -> "ScoringService":
+        from ..core.snapshot import Snapshot
+
+        snapshot = Snapshot.open(path)
+        return cls(snapshot.candidate_batch(section), snapshot.team_batch())
+
+    # ------------------------------------------------------------------
+    # 一括計算（スレッドで実行）
+    # ------------------------------------------------------------------
+
+    def _score_rows(self, rows: List[int]) -> List[FitComponents]:
+        unique, inverse = np.unique(np.asarray(rows, dtype=np.int64), return_inverse=True)
+        components = self.engine.score_components(self.candidates.take(unique), self.teams)
+        return [_slice(components, np.s_[i:i + 1, :]) for i in inverse]
+
+    def _score_cols(self, cols: List[int]) -> List[FitComponents]:
+        unique, inverse = np.unique(np.asarray(cols, dtype=np.int64), return_inverse=True)
+        components = self.engine.score_components(self.candidates, self.teams.take(unique))
+        return [_slice(components, np.s_[:, i:i + 1]) for i in inverse]
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    async def score_pair(self, candidate_id: str, team_id: str, preference, include_breakdown: bool = False) -> Dict:
+        row, col = self._row(candidate_id), self._col(team_id)
+        components = await self.row_batcher.submit(row)
+        result = _scores(components, preference, 0, col)
+        result.update(candidate_id=candidate_id, team_id=team_id, confidence=self._confidence(row, col))
+        if include_breakdown:
+            result["breakdown"] = self._breakdown(row, col, preference)
+        return result
+
+    async def score_pairs(self, pairs: List[Tuple[str, str]], preference) -> List[Dict]:
+        lookups = [(self._row(cid), self._col(tid)) for cid, tid in pairs]
+        components = await asyncio.gather(*(self.row_batcher.submit(row) for row, _ in lookups))
+        results = []
+        for (cid, tid), (row, col), comp in zip(pairs, lookups, components):
+            result = _scores(comp, preference, 0, col)
+            result.update(candidate_id=cid, team_id=tid, confidence=self._confidence(row, col))
+            results.append(result)
+        return results
+
+    async def top_teams(self, candidate_id: str, k: int, preference) -> List[Dict]:
+        components = await self.row_batcher.submit(self._row(candidate_id))
+        return _top_k(components, preference, self.teams.ids, k, axis=1)
+
+    async def top_candidates(self, team_id: str, k: int, preference) -> List[Dict]:
+        components = await self.col_batcher.submit(self._col(team_id))
+        return _top_k(components, preference, self.candidates.ids, k, axis=0)
+
+    def _confidence(self, row: int, col: int) -> float:
+        """calculate_fit_score の confidence と同じ値（配列表現は常に性格データを持つ）"""
+        return round_score(FitScoreEngine.confidence_from_counts(
+            int(np.count_nonzero(self.candidates.levels[row])),
+            int(self.teams.req_counts[col])
+        ))
+
+    def _breakdown(self, row: int, col: int, preference) -> Dict:
+        """計算詳細（プロファイルを保持している場合のみ。単一ペアのスカラー計算）"""
+        if self._candidate_profiles is None or self._team_profiles is None:
+            raise HTTPError(400, "このデータソースでは計算詳細を取得できません")
+        candidate = self._candidate_profiles[row]
+        team = self._team_profiles[col]
+        if isinstance(preference, PreferenceMode):
+            engine = FitScoreEngine(preference)
+        else:
+            engine = FitScoreEngine(weights=preference)
+        return engine.calculate_fit_score(
+            candidate.skills, team.requirements, candidate.personality, team.culture,
+            manager_similarity=team.manager_similarity,
+            workload_rate=team.workload_rate,
+            recent_move=candidate.recent_move,
+            move_count_last_year=candidate.move_count_last_year,
+            handover_load=candidate.handover_load,
+            manager_change=candidate.manager_change
+        ).breakdown
+
+    def _row(self, candidate_id: str) -> int:
+        try:
+            return self._candidate_rows[candidate_id]
+        except KeyError:
+            raise HTTPError(404, f"候補者が見つかりません: {candidate_id}") from None
+
+    def _col(self, team_id: str) -> int:
+        try:
+            return self._team_cols[team_id]
+        except KeyError:
+            raise HTTPError(404, f"チームが見つかりません: {team_id}") from None
+
+
+def _slice(components: FitComponents, index) -> FitComponents:
+    return FitComponents(
+        skill_match=components.skill_match[index],
+        retention=components.retention[index],
+        friction=components.friction[index],
+        personality_similarity=components.personality_similarity[index]
+    )
+
+
+def _scores(components: FitComponents, preference, row: int, col: int) -> Dict:
+    return {
+        "total_score": float(components.combine(preference)[row, col]),
+        "skill_match_score": round_score(float(components.skill_match[row, col])),
+        "retention_score": round_score(float(components.retention[row, col])),
+        "friction_score": round_score(float(components.friction[row, col])),
+    }
+
+
+def _top_k(components: FitComponents, preference, ids: List[str], k: int, axis: int) -> List[Dict]:
+    """axis=1: 1行（チーム方向）、axis=0: 1列（候補者方向）のランキング"""
+    totals = components.combine(preference)
+    scores = totals[0] if axis == 1 else totals[:, 0]
+    order = np.argsort(-scores, kind="stable")[:k]
+    results = []
+    for i in order:
+        row, col = (0, i) if axis == 1 else (i, 0)
+        result = _scores(components, preference, row, col)
+        result["id"] = ids[i]
+        results.append(result)
+    return results
+
+
+# ----------------------------------------------------------------------
+# HTTP
+# ----------------------------------------------------------------------
+
+class ScoringServer:
+    """最小限の HTTP/1.1 サーバー（keep-alive 対応）"""
+
+    ROUTES = [
+        ("POST", re.compile(r"^/api/v1/matching/calculate$"), "calculate"),
+        ("POST", re.compile(r"^/api/v1/matching/batch$"), "batch"),
+        ("GET", re.compile(r"^/api/v1/matching/candidates/(?P<candidate_id>[^/]+)/teams$"), "candidate_teams"),
+        ("GET", re.compile(r"^/api/v1/matching/teams/(?P<team_id>[^/]+)/candidates$"), "team_candidates"),
+        ("GET", re.compile(r"^/health$"), "health"),
+        ("GET", re.compile(r"^/metrics$"), "metrics"),
+    ]
+
+    def __init__(self, service: ScoringService):
+        self.service = service
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        server = await asyncio.start_server(self._handle, host, port)
+        print(f"🚀 スコアリングAPI: http://{host}:{port} "
+              f"(候補者 {len(self.service.candidates)} 人 / チーム {len(self.service.teams)} チーム)")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "不正なリクエスト行です"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = _content_length(headers.get("content-length"))
+                except HTTPError as e:
+                    # 本文の終わりが分からないため接続を閉じる
+                    await self._respond(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self._dispatch(method, target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Optional[Dict]]:
+        if method == "OPTIONS":
+            return 204, None
+        url = urlsplit(target)
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            if route_method != method:
+                return 405, {"error": f"{method} は使用できません"}
+            start = time.perf_counter()
+            try:
+                payload = await getattr(self, f"_{name}")(match.groupdict(), parse_qs(url.query), body)
+                status = 200
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            self.service.latency.record(name, time.perf_counter() - start)
+            return status, payload
+        return 404, {"error": f"エンドポイントが見つかりません: {url.path}"}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Optional[Dict], keep_alive: bool) -> None:
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Access-Control-Allow-Origin: *",
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+            "Access-Control-Allow-Headers: Content-Type",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # ------------------------------------------------------------------
+    # ハンドラー
+    # ------------------------------------------------------------------
+
+    async def _calculate(self, params: Dict, query: Dict, body: bytes) -> Dict:
+        request = _json_body(body)
+        options = request.get("options")
+        if options is None:
+            options = {}
+        elif not isinstance(options, dict):
+            raise HTTPError(400, "options はJSONオブジェクトで指定してください")
+        include_explanation = options.get("include_explanation", False)
+        if not isinstance(include_explanation, bool):
+            raise HTTPError(400, "options.include_explanation は true / false で指定してください")
+        return await self.service.score_pair(
+            _required(request, "candidate_id"),
+            _required(request, "team_id"),
+            _preference(request.get("mode"), request.get("weights")),
+            include_breakdown=include_explanation
+        )
+
+    async def _batch(self, params: Dict, query: Dict, body: bytes) -> Dict:
+        request = _json_body(body)
+        pairs = request.get("pairs")
+        if not isinstance(pairs, list):
+            raise HTTPError(400, "pairs は配列で指定してください")
+        if len(pairs) > MAX_BATCH_PAIRS:
+            raise HTTPError(400, f"pairs は {MAX_BATCH_PAIRS} 件以下にしてください")
+        preference = _preference(request.get("mode"), request.get("weights"))
+        results = await self.service.score_pairs(
+            [(_required(p, "candidate_id"), _required(p, "team_id")) for p in pairs], preference
+        )
+        return {"results": results}
+
+    async def _candidate_teams(self, params: Dict, query: Dict, body: bytes) -> Dict:
+        preference = _preference(_first(query, "mode"), None)
+        results = await self.service.top_teams(params["candidate_id"], _top_k_param(query), preference)
+        return {"candidate_id": params["candidate_id"], "results": results}
+
+    async def _team_candidates(self, params: Dict, query: Dict, body: bytes) -> Dict:
+        preference = _preference(_first(query, "mode"), None)
+        results = await self.service.top_candidates(params["team_id"], _top_k_param(query), preference)
+        return {"team_id": params["team_id"], "results": results}
+
+    async def _health(self, params: Dict, query: Dict, body: bytes) -> Dict:
+        return {
+            "status": "ok",
+            "candidates": len(self.service.candidates),
+            "teams": len(self.service.teams),
+        }
+
+    async def _metrics(self, params: Dict, query: Dict, body: bytes) -> Dict:
+        batchers = {"candidate_rows": self.service.row_batcher, "team_columns": self.service.col_batcher}
+        return {
+            "latency": self.service.latency.summary(),
+            "batches": {
+                name: {
+                    "batches": b.batches,
+                    "items": b.items,
+                    "average_size": round(b.items / b.batches, 2) if b.batches else 0.0,
+                }
+                for name, b in batchers.items()
+            },
+        }
+
+
+def _json_body(body: bytes) -> Dict:
+    try:
+        request = json.loads(body or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise HTTPError(400, "JSONとして解析できません") from None
+    if not isinstance(request, dict):
+        raise HTTPError(400, "JSONオブジェクトで指定してください")
+    return request
+
+
+def _content_length(value: Optional[str]) -> int:
+    """Content-Length を検証（不正値は400、MAX_BODY_BYTES 超過は413）"""
+    if not value:
+        return 0
+    if not (value.isascii() and value.isdigit()):
+        raise HTTPError(400, f"Content-Length が不正です: {value}")
+    length = int(value)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"リクエストが大きすぎます（上限 {MAX_BODY_BYTES} バイト）")
+    return length
+
+
+def _required(request: Dict, key: str) -> str:
+    if not isinstance(request, dict) or key not in request:
+        raise HTTPError(400, f"{key} を指定してください")
+    value = request[key]
+    if not isinstance(value, str):
+        raise HTTPError(400, f"{key} は文字列で指定してください")
+    return value
+
+
+def _first(query: Dict, key: str) -> Optional[str]:
+    values = query.get(key)
+    return values[0] if values else None
+
+
+def _top_k_param(query: Dict) -> int:
+    try:
+        k = int(_first(query, "k") or DEFAULT_TOP_K)
+    except ValueError:
+        raise HTTPError(400, "k は整数で指定してください") from None
+    if k < 1:
+        raise HTTPError(400, "k は1以上で指定してください")
+    return k
+
+
+def _preference(mode: Optional[str], weights: Optional[Dict]) -> PreferenceMode | Dict[str, float]:
+    """mode（Preferenceモード名）または weights（α/β/γ）から重みを決定"""
+    if weights is not None:
+        try:
+            return resolve_weights(weights)
+        except (ValueError, TypeError) as e:
+            raise HTTPError(400, str(e)) from None
+    try:
+        return PreferenceMode(mode or PreferenceMode.STABILITY.value)
+    except ValueError:
+        raise HTTPError(400, f"不明なPreferenceモードです: {mode}") from None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Takei-prime スコアリングAPIサーバー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="JSONデータのディレクトリ")
+    parser.add_argument("--snapshot", type=Path, help="列指向スナップショット（指定時は JSON より優先）")
+    args = parser.parse_args()
+
+    if args.snapshot is not None:
+        service = ScoringService.from_snapshot(args.snapshot)
+    else:
+        service = ScoringService.from_json(args.data_dir)
+    try:
+        asyncio.run(ScoringServer(service).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
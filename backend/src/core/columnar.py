@@ -0,0 +1,265 @@
+"""
+Takei-prime 列指向データコンテナ
+
+従業員全体（10^5人規模）のスキル・性格を連続配列で保持し、
+1人分のデータは配列を参照する軽量ビューとして渡す。ビューは Skill /
+PersonalityProfile と同じ属性を持つため、スカラー計算APIにそのまま渡せる。
+
+- SkillTable: 全員のスキルを CSR 形式（offsets + 列番号・レベル・年数）で保持
+- PersonalityMatrix: 全員の Big Five を (N, 5) 行列で保持
+"""
+
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from .fit_score_calculator import (
+    BIG_FIVE_DIMENSIONS,
+    CandidateBatch,
+    Skill,
+    SkillIndex,
+)
+from .personality_similarity import normalize_vectors
+
+
+class SkillView:
+    """SkillTable の1要素を参照するビュー（Skill と同じ属性）"""
+
+    __slots__ = ("_table", "_pos")
+
+    def __init__(self, table: "SkillTable", pos: int):
+        self._table = table
+        self._pos = pos
+
+    @property
+    def skill_id(self) -> str:
+        return self._table.skill_index.skill_ids[self._table.columns[self._pos]]
+
+    @property
+    def proficiency_level(self) -> int:
+        return int(self._table.levels[self._pos])
+
+    @property
+    def years_of_experience(self) -> float:
+        return float(self._table.years[self._pos])
+
+    def to_skill(self) -> Skill:
+        return Skill(self.skill_id, self.proficiency_level, self.years_of_experience)
+
+    def __repr__(self) -> str:
+        return (
+            f"SkillView(skill_id={self.skill_id!r}, "
+            f"proficiency_level={self.proficiency_level}, "
+            f"years_of_experience={self.years_of_experience})"
+        )
+
+
+class SkillList(Sequence):
+    """1人分のスキル一覧ビュー（List[Skill] の代わりに使える）"""
+
+    __slots__ = ("_table", "_start", "_stop")
+
+    def __init__(self, table: "SkillTable", start: int, stop: int):
+        self._table = table
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return SkillView(self._table, self._start + i)
+
+    def __iter__(self) -> Iterator[SkillView]:
+        for pos in range(self._start, self._stop):
+            yield SkillView(self._table, pos)
+
+
+class SkillTable:
+    """
+    全員分のスキルを連続配列で保持
+
+    i 番目の人のスキルは offsets[i]:offsets[i + 1] の範囲。
+    """
+
+    def __init__(
+        self,
+        skill_index: SkillIndex,
+        offsets: np.ndarray,
+        columns: np.ndarray,
+        levels: np.ndarray,
+        years: np.ndarray
+    ):
+        self.skill_index = skill_index
+        self.offsets = offsets    # (N + 1,) int64
+        self.columns = columns    # (K,) int32 スキル列番号
+        self.levels = levels      # (K,) int8
+        self.years = years        # (K,) float64
+
+    @classmethod
+    def from_skill_lists(
+        cls,
+        skill_lists: Iterable[Iterable[Skill]],
+        skill_index: SkillIndex
+    ) -> "SkillTable":
+        """Skill リストの並びから生成（索引にないスキルIDは索引を拡張する）"""
+        counts: List[int] = []
+        skill_ids: List[str] = []
+        levels: List[int] = []
+        years: List[float] = []
+        for skills in skill_lists:
+            n = 0
+            for skill in skills:
+                skill_ids.append(skill.skill_id)
+                levels.append(skill.proficiency_level)
+                years.append(skill.years_of_experience)
+                n += 1
+            counts.append(n)
+
+        skill_index = skill_index.extended(skill_ids)
+        return cls(
+            skill_index,
+            offsets=np.concatenate([[0], np.cumsum(counts, dtype=np.int64)]).astype(np.int64),
+            columns=np.array([skill_index.columns[sid] for sid in skill_ids], dtype=np.int32),
+            levels=np.array(levels, dtype=np.int8),
+            years=np.array(years, dtype=np.float64)
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], skill_index: SkillIndex) -> "SkillTable":
+        """candidates.json / employees.json のレコード（skills 配列）から生成"""
+        return cls.from_skill_lists(
+            ([Skill.from_dict(s) for s in record["skills"]] for record in records),
+            skill_index
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> SkillList:
+        return self.skills_of(i)
+
+    def skills_of(self, i: int) -> SkillList:
+        """i 番目の人のスキル一覧ビュー"""
+        return SkillList(self, int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def owners(self) -> np.ndarray:
+        """各要素の持ち主の行番号 (K,)"""
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+    def to_dense(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (人数, スキル列数) の密行列に展開
+
+        同一スキルが複数ある場合は _find_skill と同じく先頭を採用する。
+
+        Returns:
+            (levels int8, years float64)
+        """
+        n_skills = len(self.skill_index)
+        levels = np.zeros((len(self), n_skills), dtype=np.int8)
+        years = np.zeros((len(self), n_skills), dtype=np.float64)
+        keys = self.owners() * n_skills + self.columns
+        _, first = np.unique(keys, return_index=True)
+        levels.flat[keys[first]] = self.levels[first]
+        years.flat[keys[first]] = self.years[first]
+        return levels, years
+
+
+class PersonalityView:
+    """PersonalityMatrix の1行を参照するビュー（PersonalityProfile と同じ属性）"""
+
+    __slots__ = ("_matrix", "_row")
+
+    def __init__(self, matrix: "PersonalityMatrix", row: int):
+        self._matrix = matrix
+        self._row = row
+
+    @property
+    def openness(self) -> float:
+        return float(self._matrix.values[self._row, 0])
+
+    @property
+    def conscientiousness(self) -> float:
+        return float(self._matrix.values[self._row, 1])
+
+    @property
+    def extraversion(self) -> float:
+        return float(self._matrix.values[self._row, 2])
+
+    @property
+    def agreeableness(self) -> float:
+        return float(self._matrix.values[self._row, 3])
+
+    @property
+    def neuroticism(self) -> float:
+        return float(self._matrix.values[self._row, 4])
+
+    def to_vector(self) -> np.ndarray:
+        """行ビュー（コピーなし）"""
+        return self._matrix.values[self._row]
+
+    def as_tuple(self) -> tuple[float, float, float, float, float]:
+        return tuple(self._matrix.values[self._row].tolist())
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{dim}={value}" for dim, value in zip(BIG_FIVE_DIMENSIONS, self.as_tuple())
+        )
+        return f"PersonalityView({values})"
+
+
+class PersonalityMatrix:
+    """全員分の Big Five を (N, 5) 行列で保持"""
+
+    def __init__(self, values: np.ndarray):
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], key: str = "personality_profile") -> "PersonalityMatrix":
+        """レコードの personality_profile（チームは key="culture_profile"）から生成"""
+        rows = [[record[key][dim] for dim in BIG_FIVE_DIMENSIONS] for record in records]
+        return cls(np.array(rows, dtype=np.float64).reshape(len(rows), len(BIG_FIVE_DIMENSIONS)))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, row: int) -> PersonalityView:
+        return PersonalityView(self, row)
+
+    def units(self) -> np.ndarray:
+        """正規化済みベクトル (N, 5) float64"""
+        return normalize_vectors(self.values)
+
+
+def build_candidate_batch(
+    ids: List[str],
+    skills: SkillTable,
+    personalities: PersonalityMatrix
+) -> CandidateBatch:
+    """
+    列指向コンテナから CandidateBatch を作成（1人ずつのオブジェクト生成なし）
+
+    異動回数などスコア計算用の付随情報は既定値（異動なし）とする。
+    """
+    n = len(ids)
+    levels, years = skills.to_dense()
+    personality = personalities.values.astype(np.float64)
+    return CandidateBatch(
+        ids=list(ids),
+        skill_index=skills.skill_index,
+        levels=levels,
+        years=years,
+        personality=personality,
+        personality_units=normalize_vectors(personality),
+        recent_move=np.zeros(n, dtype=bool),
+        move_count=np.zeros(n, dtype=np.int64),
+        handover_load=np.zeros(n, dtype=np.float64),
+        manager_change=np.zeros(n, dtype=bool)
+    )
@@ -0,0 +1,347 @@
+"""
+Takei-prime 性格（Big Five）近傍インデックス
+
+従業員・候補者・チーム文化の Big Five を単位ベクトルに正規化して保持し、
+コサイン類似度の近い順に検索する。Retention / Friction の性格類似度と同じ
+スケール（(cos + 1) × 50、0-100）でスコアを返す。
+
+- 構造: 転置ファイル（IVF）。球面 k-means で約 √N 個のクラスタに分け、
+  クエリに近い n_probe 個のクラスタだけを厳密計算するため計算量は O(√N)
+- 種別（"employee" / "candidate" / "team"）ごとに別のインデックスを持ち、
+  「候補者に文化の近いチーム」「上司に性格の近い従業員」のように引ける
+- 追加したベクトルは既存のクラスタに割り当てる。件数が学習時の2倍を
+  超えたらクラスタを作り直す
+
+manager_similarity: チームの上司の性格が登録されていれば、人物と上司の
+類似度を返す（未登録なら None。エンジン側は従来通り 50 を使う）。
+teams.json の manager_id（emp_001 など）は employees.json のどの従業員ID
+（emp_001_01 など）とも一致せず、上司本人の性格データはない。そのため
+from_records は manager_id が従業員として登録されていないチームについて、
+メンバーのうちレベルが最も高い人（同レベルは在籍年数の長い順、ID順）を
+上司代行として対応付ける（ACTING_MANAGER_LEVELS）。
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .fit_score_calculator import BIG_FIVE_DIMENSIONS
+from .personality_similarity import normalize_vectors
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data" / "demo"
+
+KINDS = ("employee", "candidate", "team")
+
+# クエリ時に探索するクラスタ数の既定値
+DEFAULT_N_PROBE = 3
+
+# 球面 k-means の反復回数
+KMEANS_ITERATIONS = 10
+
+# 上司代行を選ぶときのレベルの優先順（employees.json の level）
+ACTING_MANAGER_LEVELS = ("lead", "senior", "mid", "junior")
+
+
+@dataclass
+class Neighbor:
+    """検索結果1件"""
+    id: str
+    kind: str
+    similarity: float  # 0-100（性格類似度と同じスケール）
+
+
+def personality_vector(profile: Dict) -> List[float]:
+    """personality_profile / culture_profile から Big Five を取り出す"""
+    return [profile[dim] for dim in BIG_FIVE_DIMENSIONS]
+
+
+def resolve_team_managers(employee_records: Iterable[Dict], team_records: Iterable[Dict]) -> Dict[str, str]:
+    """
+    チームID → 上司として扱う従業員ID
+
+    manager_id が従業員として存在すればそのまま使い、存在しなければ
+    チームのメンバーから上司代行（レベルが最も高く、在籍年数の長い人）を選ぶ。
+    メンバーもいないチームは含めない。
+    """
+    employee_records = list(employee_records)
+    known = {e["id"] for e in employee_records}
+    rank = {level: i for i, level in enumerate(ACTING_MANAGER_LEVELS)}
+    acting: Dict[str, Dict] = {}
+    for employee in employee_records:
+        team_id = employee.get("team_id")
+        current = acting.get(team_id)
+        key = (rank.get(employee.get("level"), len(rank)), -employee.get("tenure", 0.0), employee["id"])
+        if current is None or key < current[0]:
+            acting[team_id] = (key, employee["id"])
+
+    managers = {}
+    for team in team_records:
+        manager = team.get("manager_id")
+        if manager in known:
+            managers[team["id"]] = manager
+        elif team["id"] in acting:
+            managers[team["id"]] = acting[team["id"]][1]
+    return managers
+
+
+class _InvertedFile:
+    """1種別分の IVF"""
+
+    def __init__(self, seed: int):
+        self._rng = np.random.default_rng(seed)
+        self.ids: List[str] = []
+        self.units = np.zeros((0, len(BIG_FIVE_DIMENSIONS)), dtype=np.float64)
+        self.centroids = np.zeros((0, len(BIG_FIVE_DIMENSIONS)), dtype=np.float64)
+        self.lists: List[np.ndarray] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: Sequence[str], units: np.ndarray) -> None:
+        start = len(self.ids)
+        self.ids.extend(ids)
+        self.units = np.vstack([self.units, units])
+        if self._trained_size == 0 or len(self.ids) > 2 * self._trained_size:
+            self.train()
+            return
+        rows = np.arange(start, len(self.ids))
+        assignment = np.argmax(units @ self.centroids.T, axis=1)
+        for cluster in np.unique(assignment):
+            self.lists[cluster] = np.concatenate([self.lists[cluster], rows[assignment == cluster]])
+
+    def train(self, n_lists: Optional[int] = None) -> None:
+        """球面 k-means でクラスタを作り直す"""
+        n = len(self.ids)
+        self._trained_size = n
+        if n == 0:
+            self.centroids = self.units[:0].copy()
+            self.lists = []
+            return
+        k = min(n, n_lists or max(1, int(round(np.sqrt(n)))))
+        centroids = self.units[self._rng.choice(n, size=k, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(self.units @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, self.units)
+            counts = np.bincount(assignment, minlength=k)
+            empty = counts == 0
+            if empty.any():
+                # 空のクラスタは任意の点で置き換える
+                sums[empty] = self.units[self._rng.choice(n, size=int(empty.sum()))]
+            centroids = normalize_vectors(sums)
+        self.centroids = centroids
+        assignment = np.argmax(self.units @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(k + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(k)]
+
+    def search(self, unit: np.ndarray, k: int, n_probe: Optional[int]) -> tuple[np.ndarray, np.ndarray]:
+        """(行, コサイン類似度) を類似度の降順で最大 k 件"""
+        if len(self.ids) == 0 or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        n_lists = len(self.lists)
+        probe = n_lists if n_probe is None else min(max(1, n_probe), n_lists)
+        order = np.argsort(-(self.centroids @ unit), kind="stable")
+        rows = np.concatenate([self.lists[c] for c in order[:probe]])
+        # 候補が k 件に満たなければ探索クラスタを広げる
+        while len(rows) < k and probe < n_lists:
+            rows = np.concatenate([rows, self.lists[order[probe]]])
+            probe += 1
+
+        cosine = self.units[rows] @ unit
+        if len(rows) > k:
+            top = np.argpartition(-cosine, k - 1)[:k]
+            rows, cosine = rows[top], cosine[top]
+        order = np.lexsort((rows, -cosine))
+        return rows[order], cosine[order]
+
+
+class CultureIndex:
+    """
+    従業員・候補者・チーム文化の性格近傍インデックス
+
+    同じIDを同じ種別に重複して登録しないこと（上書きはしない）。
+    """
+
+    def __init__(self, n_probe: int = DEFAULT_N_PROBE, seed: int = 0):
+        """
+        Args:
+            n_probe: クエリごとに厳密計算するクラスタ数の既定値
+            seed: クラスタ初期化の乱数シード
+        """
+        self.n_probe = n_probe
+        self._indexes = {kind: _InvertedFile(seed) for kind in KINDS}
+        self._vectors: Dict[str, np.ndarray] = {}   # ID → 正規化済みベクトル（全種別）
+        self._team_managers: Dict[str, str] = {}
+
+    @classmethod
+    def from_records(
+        cls,
+        employee_records: Iterable[Dict] = (),
+        candidate_records: Iterable[Dict] = (),
+        team_records: Iterable[Dict] = (),
+        n_probe: int = DEFAULT_N_PROBE
+    ) -> "CultureIndex":
+        """
+        employees.json / candidates.json / teams.json のレコードから作成
+
+        上司は resolve_team_managers で対応付ける（manager_id が従業員にない
+        チームは上司代行）。
+        """
+        index = cls(n_probe=n_probe)
+        employee_records = list(employee_records)
+        candidate_records = list(candidate_records)
+        team_records = list(team_records)
+        index.add([e["id"] for e in employee_records],
+                  [personality_vector(e["personality_profile"]) for e in employee_records], "employee")
+        index.add([c["id"] for c in candidate_records],
+                  [personality_vector(c["personality_profile"]) for c in candidate_records], "candidate")
+        index.add([t["id"] for t in team_records],
+                  [personality_vector(t["culture_profile"]) for t in team_records], "team")
+        index.set_team_managers(resolve_team_managers(employee_records, team_records))
+        return index
+
+    @classmethod
+    def from_files(cls, data_dir: Path = DATA_DIR, n_probe: int = DEFAULT_N_PROBE) -> "CultureIndex":
+        records = {}
+        for name, key in (("employees", "employees"), ("candidates", "candidates"), ("teams", "teams")):
+            with open(Path(data_dir) / f"{name}.json", "r", encoding="utf-8") as f:
+                records[key] = json.load(f)[key]
+        return cls.from_records(records["employees"], records["candidates"], records["teams"], n_probe)
+
+    # ------------------------------------------------------------------
+    # 登録
+    # ------------------------------------------------------------------
+
+    def add(self, ids: Sequence[str], vectors: Sequence[Sequence[float]], kind: str) -> None:
+        """Big Five（0-100）を種別ごとに登録"""
+        index = self._index(kind)
+        if len(ids) == 0:
+            return
+        units = normalize_vectors(np.asarray(vectors, dtype=np.float64).reshape(len(ids), -1))
+        index.add(list(ids), units)
+        self._vectors.update(zip(ids, units))
+
+    def set_team_managers(self, team_managers: Dict[str, str]) -> None:
+        """チームID → 上司の従業員ID（resolve_team_managers の結果など）"""
+        self._team_managers.update(team_managers)
+
+    def rebuild(self) -> None:
+        """全種別のクラスタを作り直す（大量追加後など）"""
+        for index in self._indexes.values():
+            index.train()
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self._indexes.values())
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._vectors
+
+    # ------------------------------------------------------------------
+    # 検索
+    # ------------------------------------------------------------------
+
+    def nearest(
+        self,
+        vector: Sequence[float],
+        k: int = 10,
+        kind: str = "team",
+        exclude: Iterable[str] = (),
+        n_probe: Optional[int] = None,
+        exact: bool = False
+    ) -> List[Neighbor]:
+        """
+        Big Five（0-100）に近い順に最大 k 件
+
+        Args:
+            exclude: 結果から除くID（自分自身など）
+            n_probe: 探索クラスタ数（None はインデックスの既定値）
+            exact: True なら全件を厳密計算（n_probe は無視）
+        """
+        index = self._index(kind)
+        exclude = set(exclude)
+        unit = normalize_vectors(np.asarray(vector, dtype=np.float64)[None, :])[0]
+        probe = None if exact else (self.n_probe if n_probe is None else n_probe)
+        rows, cosine = index.search(unit, k + len(exclude), probe)
+        results = [
+            Neighbor(id=index.ids[row], kind=kind, similarity=float((c + 1) * 50))
+            for row, c in zip(rows, cosine)
+            if index.ids[row] not in exclude
+        ]
+        return results[:k]
+
+    def nearest_to(
+        self,
+        item_id: str,
+        k: int = 10,
+        kind: str = "team",
+        n_probe: Optional[int] = None,
+        exact: bool = False
+    ) -> List[Neighbor]:
+        """登録済みのIDに近い順に最大 k 件（自分自身は除く）"""
+        return self.nearest(self._vector(item_id), k, kind, exclude=(item_id,), n_probe=n_probe, exact=exact)
+
+    def closest_teams(
+        self,
+        vector: Sequence[float],
+        k: int = 10,
+        n_probe: Optional[int] = None,
+        exact: bool = False
+    ) -> List[Neighbor]:
+        """文化が近いチーム（候補者の配置先の事前絞り込み用）"""
+        return self.nearest(vector, k, "team", n_probe=n_probe, exact=exact)
+
+    def similar_employees(
+        self,
+        person_id: str,
+        k: int = 10,
+        n_probe: Optional[int] = None,
+        exact: bool = False
+    ) -> List[Neighbor]:
+        """登録済みの人物（上司など）に性格が近い従業員"""
+        return self.nearest_to(person_id, k, "employee", n_probe=n_probe, exact=exact)
+
+    # ------------------------------------------------------------------
+    # 上司類似度
+    # ------------------------------------------------------------------
+
+    def manager_similarity(self, vector: Sequence[float], team_id: str) -> Optional[float]:
+        """
+        人物とチームの上司の性格類似度（0-100）
+
+        上司の性格が未登録の場合は None（RetentionCalculator は 50 として扱う）。
+        """
+        manager = self._team_managers.get(team_id)
+        if manager is None or manager not in self._vectors:
+            return None
+        unit = normalize_vectors(np.asarray(vector, dtype=np.float64)[None, :])[0]
+        return float((self._vectors[manager] @ unit + 1) * 50)
+
+    def manager_similarity_matrix(self, personality_units: np.ndarray, team_ids: Sequence[str]) -> np.ndarray:
+        """
+        (人数, チーム数) の上司類似度。上司の性格が未登録のチームの列は 50
+
+        personality_units は CandidateBatch.personality_units と同じ正規化済みベクトル。
+        """
+        matrix = np.full((len(personality_units), len(team_ids)), 50.0)
+        for col, team_id in enumerate(team_ids):
+            manager = self._team_managers.get(team_id)
+            if manager is not None and manager in self._vectors:
+                matrix[:, col] = (personality_units @ self._vectors[manager] + 1) * 50
+        return matrix
+
+    def _index(self, kind: str) -> _InvertedFile:
+        try:
+            return self._indexes[kind]
+        except KeyError:
+            raise ValueError(f"不明な種別です: {kind}（{', '.join(KINDS)} のいずれか）") from None
+
+    def _vector(self, item_id: str) -> np.ndarray:
+        try:
+            return self._vectors[item_id]
+        except KeyError:
+            raise KeyError(f"インデックスに登録されていません: {item_id}") from None
@@ -0,0 +1,333 @@
+"""
+Takei-prime Fitスコアキャッシュ
+
+FitScoreEngine.calculate_fit_score の結果を、入力内容のハッシュをキーに保持する。
+ダッシュボードやシミュレーションで同じ（候補者, チーム, モード）を繰り返し
+計算する場合に、内容が変わっていなければ再計算しない。
+
+- キー: 候補者（スキル・性格・異動状況）、チーム（要求スキル・文化・稼働率・
+  上司類似度）、Preferenceモードと重み。オブジェクトの同一性ではなく内容で
+  判定するため、JSON から作り直したプロファイルでもヒットする
+- メモリ: OrderedDict による LRU（上限件数を超えたら最も古いものから破棄）。
+  Skill / TeamRequirement / PersonalityProfile は不変なので、入力をそのまま
+  タプルにしたものをキーにする（文字列化・内容ハッシュの計算をしない）
+- ディスク（任意）: sqlite に内容ハッシュ（key）をキーとして書き込み、
+  再起動後もメモリミス時に参照する。候補者・チームのハッシュはメモ化する
+
+breakdown はキャッシュせず、アクセス時に同じ入力から作成する。
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .fit_score_calculator import (
+    FitScoreEngine,
+    FitScoreResult,
+    PersonalityProfile,
+    Skill,
+    TeamRequirement,
+)
+
+# スコア計算式を変更した場合は上げる（ディスク上の古いエントリを無効化）
+CACHE_VERSION = "1"
+
+# ディスクへの書き込みをまとめてコミットする件数
+COMMIT_INTERVAL = 256
+
+# メモ化する候補者・チームのハッシュの件数
+FINGERPRINT_CACHE_SIZE = 65_536
+
+Scores = Tuple[float, float, float, float, float]
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def candidate_fingerprint(
+    skills: Iterable[Skill],
+    personality: PersonalityProfile
+) -> str:
+    """候補者のスキル・性格の内容ハッシュ（同じ内容の2回目以降はメモ化した値）"""
+    return _candidate_fingerprint(tuple(skills), personality)
+
+
+def team_fingerprint(
+    requirements: Iterable[TeamRequirement],
+    culture: PersonalityProfile,
+    workload_rate: float
+) -> str:
+    """チームの要求スキル・文化・稼働率の内容ハッシュ（同じ内容の2回目以降はメモ化した値）"""
+    return _team_fingerprint(tuple(requirements), culture, workload_rate)
+
+
+@lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)
+def _candidate_fingerprint(skills: Tuple[Skill, ...], personality: PersonalityProfile) -> str:
+    skill_part = ";".join(
+        f"{s.skill_id}:{s.proficiency_level}:{float(s.years_of_experience)!r}" for s in skills
+    )
+    personality_part = ",".join(repr(float(v)) for v in personality.as_tuple())
+    return _digest(f"{skill_part}|{personality_part}")
+
+
+@lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)
+def _team_fingerprint(
+    requirements: Tuple[TeamRequirement, ...],
+    culture: PersonalityProfile,
+    workload_rate: float
+) -> str:
+    requirement_part = ";".join(
+        f"{r.skill_id}:{r.required_level}:{int(bool(r.is_mandatory))}:{r.priority}" for r in requirements
+    )
+    culture_part = ",".join(repr(float(v)) for v in culture.as_tuple())
+    return _digest(f"{requirement_part}|{culture_part}|{float(workload_rate)!r}")
+
+
+class _MemoryKey:
+    """メモリ上のLRUのキー（入力のタプル。ハッシュは1回だけ計算する）"""
+
+    __slots__ = ("values", "_hash")
+
+    def __init__(self, values: tuple):
+        self.values = values
+        self._hash = hash(values)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _MemoryKey) and self.values == other.values
+
+
+@dataclass
+class CacheStats:
+    """キャッシュの利用状況"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _DiskStore:
+    """sqlite によるスコアの永続化"""
+
+    def __init__(self, path: Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fit_scores ("
+            "key TEXT PRIMARY KEY, total REAL, skill_match REAL, retention REAL, "
+            "friction REAL, confidence REAL)"
+        )
+        self._conn.commit()
+        self._pending = 0
+
+    def get(self, key: str) -> Optional[Scores]:
+        row = self._conn.execute(
+            "SELECT total, skill_match, retention, friction, confidence FROM fit_scores WHERE key = ?",
+            (key,)
+        ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def put(self, key: str, scores: Scores) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO fit_scores VALUES (?, ?, ?, ?, ?, ?)", (key, *scores))
+        self._pending += 1
+        if self._pending >= COMMIT_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._conn.commit()
+            self._pending = 0
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM fit_scores")
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+
+class FitScoreCache:
+    """
+    calculate_fit_score の結果キャッシュ
+
+    engine と同じ引数で calculate_fit_score を呼び出せる。
+    """
+
+    def __init__(
+        self,
+        engine: Optional[FitScoreEngine] = None,
+        max_entries: int = 100_000,
+        db_path: Optional[Path] = None
+    ):
+        """
+        Args:
+            engine: 計算に使うエンジン（既定は STABILITY モード）
+            max_entries: メモリ上に保持する最大件数
+            db_path: sqlite ファイル。指定時はディスクにも保存する
+        """
+        self.engine = engine or FitScoreEngine()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[_MemoryKey, Scores]" = OrderedDict()
+        self._disk = _DiskStore(db_path) if db_path is not None else None
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """利用状況（呼び出し時点のコピー）"""
+        with self._lock:
+            return CacheStats(
+                memory_hits=self._stats.memory_hits,
+                disk_hits=self._stats.disk_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size=len(self._entries)
+            )
+
+    def key(
+        self,
+        candidate_skills: List[Skill],
+        team_requirements: List[TeamRequirement],
+        candidate_personality: PersonalityProfile,
+        team_culture: PersonalityProfile,
+        manager_similarity: Optional[float] = None,
+        workload_rate: float = 70.0,
+        recent_move: bool = False,
+        move_count_last_year: int = 0,
+        handover_load: float = 0.0,
+        manager_change: bool = False
+    ) -> str:
+        """calculate_fit_score の入力とエンジンの重みからディスク用のキャッシュキー（内容ハッシュ）を作成"""
+        weights = self.engine.weights
+        context = (
+            f"{manager_similarity!r}|{int(bool(recent_move))}|{move_count_last_year}|"
+            f"{float(handover_load)!r}|{int(bool(manager_change))}"
+        )
+        mode = (
+            f"{self.engine.preference_mode.value}|"
+            f"{weights['alpha']!r},{weights['beta']!r},{weights['gamma']!r}"
+        )
+        return _digest("/".join((
+            CACHE_VERSION,
+            candidate_fingerprint(candidate_skills, candidate_personality),
+            team_fingerprint(team_requirements, team_culture, workload_rate),
+            context,
+            mode
+        )))
+
+    def calculate_fit_score(
+        self,
+        candidate_skills: List[Skill],
+        team_requirements: List[TeamRequirement],
+        candidate_personality: PersonalityProfile,
+        team_culture: PersonalityProfile,
+        manager_similarity: Optional[float] = None,
+        workload_rate: float = 70.0,
+        recent_move: bool = False,
+        move_count_last_year: int = 0,
+        handover_load: float = 0.0,
+        manager_change: bool = False,
+        include_breakdown: bool = True
+    ) -> FitScoreResult:
+        """
+        キャッシュ経由で総合Fitスコアを計算
+
+        キャッシュから返す結果の breakdown は初回アクセス時に作成する
+        （include_breakdown はミス時の計算方法にのみ影響し、値は同じ）。
+        """
+        inputs = (
+            candidate_skills, team_requirements,
+            candidate_personality, team_culture, manager_similarity, workload_rate, recent_move,
+            move_count_last_year, handover_load, manager_change
+        )
+        engine = self.engine
+        mode, weights = engine.preference_mode, engine.weights
+        memory_key = _MemoryKey((
+            tuple(candidate_skills), tuple(team_requirements), *inputs[2:],
+            mode, weights["alpha"], weights["beta"], weights["gamma"]
+        ))
+        scores = self._lookup(memory_key, inputs)
+        if scores is None:
+            result = engine.calculate_fit_score(*inputs, include_breakdown=include_breakdown)
+            self._store(memory_key, inputs, result._scores())
+            return result
+
+        return FitScoreResult(*scores, explain=lambda: engine._explain(inputs, mode, weights))
+
+    def flush(self) -> None:
+        """ディスクへの未コミット分を書き込む"""
+        if self._disk is not None:
+            with self._lock:
+                self._disk.flush()
+
+    def clear(self, disk: bool = False) -> None:
+        """メモリ上のエントリと統計を消去（disk=True でディスクも消去）"""
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStats()
+            if disk and self._disk is not None:
+                self._disk.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            with self._lock:
+                self._disk.close()
+                self._disk = None
+
+    def __enter__(self) -> "FitScoreCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, memory_key: _MemoryKey, inputs: tuple) -> Optional[Scores]:
+        with self._lock:
+            scores = self._entries.get(memory_key)
+            if scores is not None:
+                self._entries.move_to_end(memory_key)
+                self._stats.memory_hits += 1
+                return scores
+            if self._disk is not None:
+                scores = self._disk.get(self.key(*inputs))
+                if scores is not None:
+                    self._stats.disk_hits += 1
+                    self._remember(memory_key, scores)
+                    return scores
+            self._stats.misses += 1
+            return None
+
+    def _store(self, memory_key: _MemoryKey, inputs: tuple, scores: Scores) -> None:
+        with self._lock:
+            self._remember(memory_key, scores)
+            if self._disk is not None:
+                self._disk.put(self.key(*inputs), scores)
+
+    def _remember(self, key: _MemoryKey, scores: Scores) -> None:
+        self._entries[key] = scores
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
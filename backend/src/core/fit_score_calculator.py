@@ -4,11 +4,29 @@ Takei-prime Fitスコア計算エンジン
 Fit = α × SkillMatch + β × Retention - γ × Friction
 """
 
+from __future__ import annotations
+
+from contextlib import AbstractContextManager, nullcontext
 from enum import Enum
-from typing import List, Dict, Optional
-from dataclasses import dataclass
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional
+from dataclasses import dataclass, field
+
+from .lazy_import import lazy_import
+from .personality_similarity import (
+    cosine_similarity_score,
+    normalize_vectors,
+    similarity_matrix,
+    similarity_pairs,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .instrumentation import Instrumentation
+else:
+    # 配列計算を使うまで numpy を読み込まない（単一ペアの計算は純Python）
+    np = lazy_import("numpy")
 
 
 class PreferenceMode(Enum):
@@ -29,6 +47,16 @@ PREFERENCE_WEIGHTS = {
     PreferenceMode.INNOVATION: {"alpha": 0.5, "beta": 0.3, "gamma": 0.2},
 }
 
+
+def resolve_weights(preference: PreferenceMode | Dict[str, float]) -> Dict[str, float]:
+    """Preferenceモードまたは任意の重み辞書から α/β/γ を取得"""
+    if isinstance(preference, PreferenceMode):
+        return PREFERENCE_WEIGHTS[preference]
+    missing = {"alpha", "beta", "gamma"} - set(preference)
+    if missing:
+        raise ValueError(f"重みが不足しています: {sorted(missing)}")
+    return {key: float(preference[key]) for key in ("alpha", "beta", "gamma")}
+
 # Big Five 性格特性の次元
 BIG_FIVE_DIMENSIONS = [
     'openness',          # 開放性
@@ -39,15 +67,25 @@ BIG_FIVE_DIMENSIONS = [
 ]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Skill:
     """スキル情報"""
     skill_id: str
     proficiency_level: int  # 1-5
     years_of_experience: float
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Skill":
+        """skills 配列の要素から生成"""
+        return cls(
+            skill_id=data["skill_id"],
+            # 一部のデモデータは required_level キーで保有レベルを持つ
+            proficiency_level=data.get("proficiency_level", data.get("required_level", 0)),
+            years_of_experience=data["years_of_experience"]
+        )
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class TeamRequirement:
     """チーム要求スキル"""
     skill_id: str
@@ -55,8 +93,18 @@ class TeamRequirement:
     is_mandatory: bool
     priority: int  # 1: high, 2: medium, 3: low
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TeamRequirement":
+        """requirements 配列の要素から生成"""
+        return cls(
+            skill_id=data["skill_id"],
+            required_level=data["required_level"],
+            is_mandatory=data["is_mandatory"],
+            priority=data["priority"]
+        )
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class PersonalityProfile:
     """性格プロファイル (Big Five)"""
     openness: float
@@ -64,27 +112,573 @@ class PersonalityProfile:
     extraversion: float
     agreeableness: float
     neuroticism: float
+    _vector: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
 
     def to_vector(self) -> np.ndarray:
-        """ベクトル表現に変換"""
-        return np.array([
+        """ベクトル表現に変換（初回のみ作成し、読み取り専用で共有）"""
+        if self._vector is None:
+            vector = np.array([
+                self.openness,
+                self.conscientiousness,
+                self.extraversion,
+                self.agreeableness,
+                self.neuroticism
+            ])
+            vector.flags.writeable = False
+            object.__setattr__(self, "_vector", vector)
+        return self._vector
+
+    def as_tuple(self) -> tuple[float, float, float, float, float]:
+        """タプル表現（配列を確保しない）"""
+        return (
             self.openness,
             self.conscientiousness,
             self.extraversion,
             self.agreeableness,
             self.neuroticism
-        ])
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PersonalityProfile":
+        """personality_profile / culture_profile 辞書から生成（variance等は無視）"""
+        return cls(**{dim: data[dim] for dim in BIG_FIVE_DIMENSIONS})
+
+
+@dataclass(slots=True)
+class CandidateProfile:
+    """候補者プロファイル（一括計算用）"""
+    id: str
+    skills: List[Skill]
+    personality: PersonalityProfile
+    recent_move: bool = False
+    move_count_last_year: int = 0
+    handover_load: float = 0.0
+    manager_change: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CandidateProfile":
+        """candidates.json / employees.json のレコードから生成"""
+        return cls(
+            id=data["id"],
+            skills=[Skill.from_dict(s) for s in data["skills"]],
+            personality=PersonalityProfile.from_dict(data["personality_profile"])
+        )
+
+
+@dataclass(slots=True)
+class TeamProfile:
+    """チームプロファイル（一括計算用）"""
+    id: str
+    requirements: List[TeamRequirement]
+    culture: PersonalityProfile
+    workload_rate: float = 70.0
+    manager_similarity: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TeamProfile":
+        """teams.json のレコードから生成"""
+        return cls(
+            id=data["id"],
+            requirements=[TeamRequirement.from_dict(req) for req in data["requirements"]],
+            culture=PersonalityProfile.from_dict(data["culture_profile"]),
+            workload_rate=data.get("workload_average", 70.0)
+        )
 
 
-@dataclass
 class FitScoreResult:
-    """Fitスコア計算結果"""
-    total_score: float
-    skill_match_score: float
-    retention_score: float
-    friction_score: float
-    confidence: float
-    breakdown: Dict[str, any]
+    """
+    Fitスコア計算結果
+
+    breakdown は計算時に渡されたものを保持するか、explain（入力を保持した
+    再計算関数）から初回アクセス時に作成する。スコアのみのランキング処理では
+    詳細情報を作らずに済む。
+    """
+
+    __slots__ = (
+        "total_score",
+        "skill_match_score",
+        "retention_score",
+        "friction_score",
+        "confidence",
+        "_breakdown",
+        "_explain"
+    )
+
+    def __init__(
+        self,
+        total_score: float,
+        skill_match_score: float,
+        retention_score: float,
+        friction_score: float,
+        confidence: float,
+        breakdown: Optional[Dict[str, any]] = None,
+        explain: Optional[Callable[[], Dict[str, any]]] = None
+    ):
+        self.total_score = total_score
+        self.skill_match_score = skill_match_score
+        self.retention_score = retention_score
+        self.friction_score = friction_score
+        self.confidence = confidence
+        self._breakdown = breakdown
+        self._explain = explain
+
+    @property
+    def breakdown(self) -> Dict[str, any]:
+        """計算詳細（未作成なら入力から再計算して保持）"""
+        if self._breakdown is None:
+            self._breakdown = self._explain() if self._explain is not None else {}
+            self._explain = None
+        return self._breakdown
+
+    @property
+    def has_breakdown(self) -> bool:
+        """詳細情報が作成済みか"""
+        return self._breakdown is not None
+
+    def _scores(self) -> tuple:
+        return (
+            self.total_score,
+            self.skill_match_score,
+            self.retention_score,
+            self.friction_score,
+            self.confidence
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FitScoreResult):
+            return NotImplemented
+        return self._scores() == other._scores() and self.breakdown == other.breakdown
+
+    def __repr__(self) -> str:
+        return (
+            f"FitScoreResult(total_score={self.total_score!r}, "
+            f"skill_match_score={self.skill_match_score!r}, "
+            f"retention_score={self.retention_score!r}, "
+            f"friction_score={self.friction_score!r}, "
+            f"confidence={self.confidence!r})"
+        )
+
+
+class SkillIndex:
+    """
+    スキルID → 列番号の対応表
+
+    skills_master.json の並び順で列を割り当てる。マスタにないスキルIDは
+    extended() で末尾に追加できる。
+    """
+
+    def __init__(self, skill_ids: List[str]):
+        self.skill_ids: List[str] = list(skill_ids)
+        self.columns: Dict[str, int] = {}
+        for skill_id in self.skill_ids:
+            self.columns.setdefault(skill_id, len(self.columns))
+        self.skill_ids = list(self.columns)
+
+    @classmethod
+    def from_master(cls, skills_master: List[Dict]) -> "SkillIndex":
+        """skills_master.json の "skills" 配列から生成"""
+        return cls([skill["id"] for skill in skills_master])
+
+    @classmethod
+    def from_master_file(cls, path) -> "SkillIndex":
+        """skills_master.json を読み込んで生成"""
+        import json  # 起動時間を抑えるため使用時に読み込む
+
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_master(json.load(f)["skills"])
+
+    def extended(self, skill_ids) -> "SkillIndex":
+        """未登録のスキルIDを末尾に追加した索引を返す（全て登録済みなら自身）"""
+        missing = [sid for sid in skill_ids if sid not in self.columns]
+        if not missing:
+            return self
+        return SkillIndex(self.skill_ids + missing)
+
+    def column(self, skill_id: str) -> Optional[int]:
+        return self.columns.get(skill_id)
+
+    def __len__(self) -> int:
+        return len(self.skill_ids)
+
+    def __contains__(self, skill_id: str) -> bool:
+        return skill_id in self.columns
+
+
+def build_skill_index(
+    candidates: List[CandidateProfile],
+    teams: List[TeamProfile],
+    base: Optional[SkillIndex] = None
+) -> SkillIndex:
+    """候補者・チームに出現するスキルIDを網羅する索引を作成"""
+    skill_ids = [s.skill_id for c in candidates for s in c.skills]
+    skill_ids += [req.skill_id for t in teams for req in t.requirements]
+    if base is None:
+        return SkillIndex(skill_ids)
+    return base.extended(skill_ids)
+
+
+class SkillVector:
+    """
+    1人分のスキル保有状況（密ベクトル）
+
+    levels[col] が 0 の列は未保有。SkillMatchCalculator.calculate_vector で使用。
+    """
+
+    def __init__(self, skill_index: SkillIndex, levels: np.ndarray, years: np.ndarray):
+        self.skill_index = skill_index
+        self.levels = levels
+        self.years = years
+
+    @cached_property
+    def mask(self) -> int:
+        """保有スキル列のビットマスク"""
+        return int.from_bytes(np.packbits(self.levels > 0, bitorder="little").tobytes(), "little")
+
+    @classmethod
+    def from_skills(cls, skills: List[Skill], skill_index: SkillIndex) -> "SkillVector":
+        """Skillリストから生成（同一スキルは _find_skill と同じく先頭を採用）"""
+        levels = np.zeros(len(skill_index), dtype=np.int8)
+        years = np.zeros(len(skill_index), dtype=np.float64)
+        for skill in skills:
+            col = skill_index.column(skill.skill_id)
+            if col is None or levels[col] > 0:
+                continue
+            levels[col] = skill.proficiency_level
+            years[col] = skill.years_of_experience
+        return cls(skill_index, levels, years)
+
+    def __len__(self) -> int:
+        """保有スキル数"""
+        return int(np.count_nonzero(self.levels))
+
+
+class RequirementVector:
+    """
+    1チーム分の要求スキル（コンパイル済みの不変プロファイル）
+
+    要求の列番号・レベル・優先度重み（_get_priority_weight 適用済み）に加え、
+    必須スキルのビットマスクと最低レベルの密ベクトルを初回参照時に作成して
+    保持する。必須チェックはビットAND1回とベクトル比較1回で済む。
+    """
+
+    def __init__(
+        self,
+        skill_index: SkillIndex,
+        columns: np.ndarray,
+        levels: np.ndarray,
+        mandatory: np.ndarray,
+        weights: np.ndarray
+    ):
+        self.skill_index = skill_index
+        self.columns = columns
+        self.levels = levels
+        self.mandatory = mandatory
+        self.weights = weights
+        for array in (columns, levels, mandatory, weights):
+            array.setflags(write=False)
+
+    @cached_property
+    def mandatory_mask(self) -> int:
+        """必須スキル列のビットマスク"""
+        mask = 0
+        for col in self.columns[self.mandatory].tolist():
+            mask |= 1 << col
+        return mask
+
+    @cached_property
+    def min_levels(self) -> np.ndarray:
+        """(スキル数,) 必須スキルの最低レベル（必須でない列は0）"""
+        min_levels = np.zeros(len(self.skill_index), dtype=np.int8)
+        np.maximum.at(min_levels, self.columns[self.mandatory], self.levels[self.mandatory])
+        min_levels.setflags(write=False)
+        return min_levels
+
+    def meets_mandatory(self, skill_vector: SkillVector) -> bool:
+        """必須スキルを全て要求レベル以上で保有しているか"""
+        mask = self.mandatory_mask
+        return (skill_vector.mask & mask) == mask and bool(np.all(skill_vector.levels >= self.min_levels))
+
+    @classmethod
+    def from_requirements(
+        cls,
+        requirements: List[TeamRequirement],
+        skill_index: SkillIndex
+    ) -> "RequirementVector":
+        """TeamRequirementリストから生成（スキルIDは索引に登録済みであること）"""
+        return cls(
+            skill_index,
+            columns=np.array(
+                [skill_index.columns[req.skill_id] for req in requirements], dtype=np.int32
+            ),
+            levels=np.array([req.required_level for req in requirements], dtype=np.int8),
+            mandatory=np.array([req.is_mandatory for req in requirements], dtype=bool),
+            weights=np.array(
+                [SkillMatchCalculator._get_priority_weight(req.priority) for req in requirements],
+                dtype=np.float64
+            )
+        )
+
+    def __len__(self) -> int:
+        """要求スキル数"""
+        return len(self.columns)
+
+
+@dataclass
+class CandidateBatch:
+    """
+    候補者集合の配列表現
+
+    levels (int8) / years (float64) は (候補者数, スキル列数) の行列で、
+    列は skill_index に従う。levels が 0 の列は未保有。
+    """
+    ids: List[str]
+    skill_index: SkillIndex
+    levels: np.ndarray          # (C, S) int8 保有レベル
+    years: np.ndarray           # (C, S) float64 経験年数
+    personality: np.ndarray     # (C, 5) Big Five
+    personality_units: np.ndarray  # (C, 5) 正規化済み Big Five
+    recent_move: np.ndarray     # (C,) bool
+    move_count: np.ndarray      # (C,) 直近1年の異動回数
+    handover_load: np.ndarray   # (C,)
+    manager_change: np.ndarray  # (C,) bool
+
+    @classmethod
+    def from_profiles(
+        cls,
+        candidates: List[CandidateProfile],
+        skill_index: SkillIndex
+    ) -> "CandidateBatch":
+        n = len(candidates)
+        levels = np.zeros((n, len(skill_index)), dtype=np.int8)
+        years = np.zeros((n, len(skill_index)), dtype=np.float64)
+        for row, candidate in enumerate(candidates):
+            for skill in candidate.skills:
+                col = skill_index.column(skill.skill_id)
+                if col is None or levels[row, col] > 0:
+                    continue
+                levels[row, col] = skill.proficiency_level
+                years[row, col] = skill.years_of_experience
+
+        personality = np.array(
+            [c.personality.as_tuple() for c in candidates], dtype=np.float64
+        ).reshape(n, len(BIG_FIVE_DIMENSIONS))
+
+        return cls(
+            ids=[c.id for c in candidates],
+            skill_index=skill_index,
+            levels=levels,
+            years=years,
+            personality=personality,
+            personality_units=normalize_vectors(personality),
+            recent_move=np.array([c.recent_move for c in candidates], dtype=bool),
+            move_count=np.array([c.move_count_last_year for c in candidates], dtype=np.int64),
+            handover_load=np.array([c.handover_load for c in candidates], dtype=np.float64),
+            manager_change=np.array([c.manager_change for c in candidates], dtype=bool)
+        )
+
+    def skill_vector(self, row: int) -> SkillVector:
+        """row 番目の候補者のスキルベクトル（コピーなし）"""
+        return SkillVector(self.skill_index, self.levels[row], self.years[row])
+
+    @classmethod
+    def concat(cls, batches: List["CandidateBatch"]) -> "CandidateBatch":
+        """同じスキル索引を持つ配列表現を行方向に連結"""
+        skill_index = batches[0].skill_index
+        if any(b.skill_index is not skill_index for b in batches):
+            raise ValueError("スキル索引が異なる配列表現は連結できません")
+        return cls(
+            ids=[cid for b in batches for cid in b.ids],
+            skill_index=skill_index,
+            levels=np.concatenate([b.levels for b in batches]),
+            years=np.concatenate([b.years for b in batches]),
+            personality=np.concatenate([b.personality for b in batches]),
+            personality_units=np.concatenate([b.personality_units for b in batches]),
+            recent_move=np.concatenate([b.recent_move for b in batches]),
+            move_count=np.concatenate([b.move_count for b in batches]),
+            handover_load=np.concatenate([b.handover_load for b in batches]),
+            manager_change=np.concatenate([b.manager_change for b in batches])
+        )
+
+    def with_skill_index(self, skill_index: SkillIndex) -> "CandidateBatch":
+        """列を追加した索引（extended() の結果）に合わせてゼロ列を補う"""
+        extra = len(skill_index) - len(self.skill_index)
+        if extra < 0 or skill_index.skill_ids[:len(self.skill_index)] != self.skill_index.skill_ids:
+            raise ValueError("既存の列順を保った索引を指定してください")
+        return CandidateBatch(
+            ids=self.ids,
+            skill_index=skill_index,
+            levels=np.pad(self.levels, ((0, 0), (0, extra))),
+            years=np.pad(self.years, ((0, 0), (0, extra))),
+            personality=self.personality,
+            personality_units=self.personality_units,
+            recent_move=self.recent_move,
+            move_count=self.move_count,
+            handover_load=self.handover_load,
+            manager_change=self.manager_change
+        )
+
+    def take(self, rows) -> "CandidateBatch":
+        """指定行の候補者だけを持つ部分集合"""
+        rows = np.asarray(rows, dtype=np.int64)
+        return CandidateBatch(
+            ids=[self.ids[r] for r in rows],
+            skill_index=self.skill_index,
+            levels=self.levels[rows],
+            years=self.years[rows],
+            personality=self.personality[rows],
+            personality_units=self.personality_units[rows],
+            recent_move=self.recent_move[rows],
+            move_count=self.move_count[rows],
+            handover_load=self.handover_load[rows],
+            manager_change=self.manager_change[rows]
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass
+class TeamBatch:
+    """
+    チーム集合の配列表現
+
+    全チームの要求スキルを1次元に平坦化して保持する。チーム t の要求は
+    req_offsets[t]:req_offsets[t + 1] の範囲。membership (R, T) は
+    要求→チームの対応で、チーム単位の集計は行列積で行う。
+    """
+    ids: List[str]
+    skill_index: SkillIndex
+    req_columns: np.ndarray     # (R,) int32 スキル列番号
+    req_levels: np.ndarray      # (R,) int8 要求レベル
+    req_mandatory: np.ndarray   # (R,) bool
+    req_weights: np.ndarray     # (R,) 優先度重み
+    req_offsets: np.ndarray     # (T + 1,)
+    membership: np.ndarray      # (R, T) 要求→チーム
+    req_counts: np.ndarray      # (T,) チームごとの要求数
+    culture: np.ndarray         # (T, 5) Big Five
+    culture_units: np.ndarray   # (T, 5) 正規化済み Big Five
+    workload_rate: np.ndarray   # (T,)
+    manager_similarity: np.ndarray  # (T,) 未指定は50
+
+    @classmethod
+    def from_profiles(
+        cls,
+        teams: List[TeamProfile],
+        skill_index: SkillIndex
+    ) -> "TeamBatch":
+        reqs = [(t, req) for t, team in enumerate(teams) for req in team.requirements]
+        membership = np.zeros((len(reqs), len(teams)), dtype=np.float64)
+        for r, (t, _) in enumerate(reqs):
+            membership[r, t] = 1.0
+        req_counts = np.array([len(t.requirements) for t in teams], dtype=np.int64)
+        flat = RequirementVector.from_requirements([req for _, req in reqs], skill_index)
+        culture = np.array(
+            [t.culture.as_tuple() for t in teams], dtype=np.float64
+        ).reshape(len(teams), len(BIG_FIVE_DIMENSIONS))
+
+        return cls(
+            ids=[t.id for t in teams],
+            skill_index=skill_index,
+            req_columns=flat.columns,
+            req_levels=flat.levels,
+            req_mandatory=flat.mandatory,
+            req_weights=flat.weights,
+            req_offsets=np.concatenate([[0], np.cumsum(req_counts)]).astype(np.int64),
+            membership=membership,
+            req_counts=req_counts,
+            culture=culture,
+            culture_units=normalize_vectors(culture),
+            workload_rate=np.array([t.workload_rate for t in teams], dtype=np.float64),
+            manager_similarity=np.array(
+                [50.0 if t.manager_similarity is None else t.manager_similarity for t in teams],
+                dtype=np.float64
+            )
+        )
+
+    def take(self, teams) -> "TeamBatch":
+        """指定チームだけを持つ部分集合（要求スキルも詰め直す）"""
+        teams = np.asarray(teams, dtype=np.int64)
+        req_counts = self.req_counts[teams]
+        req_rows = np.concatenate(
+            [np.arange(self.req_offsets[t], self.req_offsets[t + 1]) for t in teams]
+        ).astype(np.int64) if len(teams) else np.zeros(0, dtype=np.int64)
+        membership = np.zeros((len(req_rows), len(teams)), dtype=np.float64)
+        membership[np.arange(len(req_rows)), np.repeat(np.arange(len(teams)), req_counts)] = 1.0
+
+        return TeamBatch(
+            ids=[self.ids[t] for t in teams],
+            skill_index=self.skill_index,
+            req_columns=self.req_columns[req_rows],
+            req_levels=self.req_levels[req_rows],
+            req_mandatory=self.req_mandatory[req_rows],
+            req_weights=self.req_weights[req_rows],
+            req_offsets=np.concatenate([[0], np.cumsum(req_counts)]).astype(np.int64),
+            membership=membership,
+            req_counts=req_counts,
+            culture=self.culture[teams],
+            culture_units=self.culture_units[teams],
+            workload_rate=self.workload_rate[teams],
+            manager_similarity=self.manager_similarity[teams]
+        )
+
+    def requirement_vector(self, team: int) -> RequirementVector:
+        """team 番目のチームの要求スキル（コピーなし）"""
+        start, stop = self.req_offsets[team], self.req_offsets[team + 1]
+        return RequirementVector(
+            self.skill_index,
+            self.req_columns[start:stop],
+            self.req_levels[start:stop],
+            self.req_mandatory[start:stop],
+            self.req_weights[start:stop]
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def pack_profiles(
+    candidates: List[CandidateProfile],
+    teams: List[TeamProfile],
+    skill_index: Optional[SkillIndex] = None
+) -> tuple[CandidateBatch, TeamBatch]:
+    """
+    候補者・チームを共通のスキル列で配列化
+
+    skill_index（通常は skills_master.json 由来）を渡すとその列順を使い、
+    マスタにないスキルIDのみ末尾に追加する。
+    """
+    index = build_skill_index(candidates, teams, skill_index)
+    return (
+        CandidateBatch.from_profiles(candidates, index),
+        TeamBatch.from_profiles(teams, index)
+    )
+
+
+@dataclass
+class FitComponents:
+    """全ペアの構成スコア行列 (候補者数, チーム数)"""
+    skill_match: np.ndarray
+    retention: np.ndarray
+    friction: np.ndarray
+    personality_similarity: np.ndarray
+
+    def combine(self, weights: PreferenceMode | Dict[str, float]) -> np.ndarray:
+        """重み（Preferenceモードまたは α/β/γ 辞書）を適用して総合Fitスコア行列を計算"""
+        weights = resolve_weights(weights)
+        total = (
+            weights["alpha"] * self.skill_match +
+            weights["beta"] * self.retention -
+            weights["gamma"] * self.friction
+        )
+        return round_score(np.clip(total, 0, 100))
+
+    def combine_modes(
+        self,
+        modes: Optional[List[PreferenceMode]] = None
+    ) -> Dict[PreferenceMode, np.ndarray]:
+        """全Preferenceモード（既定は5プリセット）の総合スコア行列を計算（combine と同じ値）"""
+        modes = list(PreferenceMode) if modes is None else modes
+        return {mode: self.combine(mode) for mode in modes}
 
 
 class SkillMatchCalculator:
@@ -92,19 +686,26 @@ class SkillMatchCalculator:
 
     @staticmethod
     def calculate(
-        candidate_skills: List[Skill],
-        team_requirements: List[TeamRequirement]
+        candidate_skills: List[Skill] | SkillVector,
+        team_requirements: List[TeamRequirement] | RequirementVector
     ) -> tuple[float, Dict]:
         """
         スキルマッチスコアを計算
+
+        SkillVector / RequirementVector を渡した場合は calculate_vector で計算する。
         
         Returns:
             (score: 0-100, breakdown: 詳細情報)
         """
+        if isinstance(candidate_skills, SkillVector):
+            return SkillMatchCalculator.calculate_vector(candidate_skills, team_requirements)
+
+        skill_map = SkillMatchCalculator._index_skills(candidate_skills)
+
         # 1. 必須スキルチェック
         mandatory_reqs = [req for req in team_requirements if req.is_mandatory]
         mandatory_check = SkillMatchCalculator._check_mandatory_skills(
-            candidate_skills, mandatory_reqs
+            candidate_skills, mandatory_reqs, skill_map
         )
         
         if not mandatory_check["all_met"]:
@@ -118,9 +719,7 @@ class SkillMatchCalculator:
         skill_details = []
         
         for req in team_requirements:
-            candidate_skill = SkillMatchCalculator._find_skill(
-                candidate_skills, req.skill_id
-            )
+            candidate_skill = skill_map.get(req.skill_id)
             
             if candidate_skill:
                 level_score = SkillMatchCalculator._calculate_level_match(
@@ -168,16 +767,214 @@ class SkillMatchCalculator:
             "average_score": final_score
         }
 
+    @staticmethod
+    def score(
+        candidate_skills: List[Skill] | SkillVector,
+        team_requirements: List[TeamRequirement] | RequirementVector
+    ) -> float:
+        """
+        スコアのみを計算（詳細情報を作らない高速版、calculate と同じ値）
+        """
+        if isinstance(candidate_skills, SkillVector):
+            return SkillMatchCalculator.calculate_vector(
+                candidate_skills, team_requirements, with_details=False
+            )[0]
+        if not team_requirements:
+            return 0.0
+
+        skill_map = SkillMatchCalculator._index_skills(candidate_skills)
+        total = 0
+        for req in team_requirements:
+            candidate_skill = skill_map.get(req.skill_id)
+            if candidate_skill is None:
+                if req.is_mandatory:
+                    return 0.0
+                continue
+            if req.is_mandatory and candidate_skill.proficiency_level < req.required_level:
+                return 0.0
+
+            level_score = SkillMatchCalculator._calculate_level_match(
+                candidate_skill.proficiency_level,
+                req.required_level
+            )
+            exp_bonus = min(candidate_skill.years_of_experience / 5.0, 1.0) * 10
+            total += (level_score + exp_bonus) * SkillMatchCalculator._get_priority_weight(req.priority)
+
+        return min(100.0, total / len(team_requirements))
+
+    # 行列計算時の候補者ブロックサイズ（中間配列 C×R のメモリを抑える）
+    MATRIX_CHUNK_SIZE = 2048
+
+    @staticmethod
+    def calculate_matrix(candidates: CandidateBatch, teams: TeamBatch) -> np.ndarray:
+        """
+        全ペアのスキルマッチスコアを一括計算（calculate と同じ数値）
+
+        Returns:
+            (候補者数, チーム数) のスコア行列 0-100
+        """
+        n_candidates = len(candidates)
+        result = np.zeros((n_candidates, len(teams)), dtype=np.float64)
+        if n_candidates == 0 or len(teams) == 0 or len(teams.req_columns) == 0:
+            return result
+
+        req_counts = teams.req_counts.astype(np.float64)
+        has_reqs = teams.req_counts > 0
+        denom = np.where(has_reqs, req_counts, 1.0)
+        mandatory_matrix = teams.membership * teams.req_mandatory[:, None]
+        required = teams.req_levels.astype(np.int64)
+
+        step = SkillMatchCalculator.MATRIX_CHUNK_SIZE
+        for start in range(0, n_candidates, step):
+            stop = min(start + step, n_candidates)
+            levels = candidates.levels[start:stop][:, teams.req_columns].astype(np.int64)
+            years = candidates.years[start:stop][:, teams.req_columns].astype(np.float64)
+            has_skill = levels > 0
+
+            # 1. 必須スキルチェック
+            unmet = ~has_skill | (levels < required)
+            unmet_count = unmet.astype(np.float64) @ mandatory_matrix
+
+            # 2. スキルレベルマッチング
+            diff = levels - required
+            level_score = np.where(
+                diff >= 0,
+                np.minimum(90 + diff * 5, 100),
+                np.maximum(0, 70 + diff * 20)
+            )
+            exp_bonus = np.minimum(years / 5.0, 1.0) * 10
+            weighted = np.where(has_skill, (level_score + exp_bonus) * teams.req_weights, 0.0)
+
+            # 3. 加重平均
+            score = np.minimum(100.0, (weighted @ teams.membership) / denom)
+            score[:, ~has_reqs] = 0.0
+            score[unmet_count > 0] = 0.0
+            result[start:stop] = score
+
+        return result
+
+    @staticmethod
+    def calculate_vector(
+        skill_vector: SkillVector,
+        requirements: RequirementVector,
+        with_details: bool = True
+    ) -> tuple[float, Dict]:
+        """
+        配列表現でスキルマッチスコアを計算（calculate と同じ結果）
+
+        必須チェック・レベル照合は列番号による配列参照で行う。
+        with_details=False の場合は詳細情報を作らず空の辞書を返す。
+        
+        Returns:
+            (score: 0-100, breakdown: 詳細情報)
+        """
+        skill_ids = requirements.skill_index.skill_ids
+        levels = skill_vector.levels[requirements.columns].astype(np.int64)
+        years = skill_vector.years[requirements.columns].astype(np.float64)
+        required = requirements.levels.astype(np.int64)
+        has_skill = levels > 0
+
+        # 1. 必須スキルチェック
+        if not with_details:
+            if len(requirements) == 0 or not requirements.meets_mandatory(skill_vector):
+                return 0.0, {}
+            return min(100.0, SkillMatchCalculator._weighted_level_sum(
+                levels, years, required, requirements.weights
+            ) / len(requirements)), {}
+
+        unmet = requirements.mandatory & (~has_skill | (levels < required))
+        missing_skills = [
+            skill_ids[col] if not held else f"{skill_ids[col]} (レベル不足)"
+            for col, held in zip(requirements.columns[unmet], has_skill[unmet])
+        ]
+        mandatory_check = {
+            "all_met": len(missing_skills) == 0,
+            "missing_skills": missing_skills,
+            "mandatory_count": int(np.count_nonzero(requirements.mandatory))
+        }
+
+        if not mandatory_check["all_met"]:
+            return 0.0, {
+                "mandatory_check": mandatory_check,
+                "reason": "必須スキル不足"
+            }
+
+        # 2. スキルレベルマッチング
+        level_scores, exp_bonus, weighted = SkillMatchCalculator._level_arrays(
+            levels, years, required, requirements.weights
+        )
+
+        skill_details = []
+        for i, col in enumerate(requirements.columns):
+            if has_skill[i]:
+                skill_details.append({
+                    "skill_id": skill_ids[col],
+                    "candidate_level": int(levels[i]),
+                    "required_level": int(required[i]),
+                    "level_score": int(level_scores[i]),
+                    "experience_bonus": float(exp_bonus[i]),
+                    "weighted_score": float(weighted[i])
+                })
+            else:
+                skill_details.append({
+                    "skill_id": skill_ids[col],
+                    "candidate_level": 0,
+                    "required_level": int(required[i]),
+                    "level_score": 0,
+                    "reason": "スキル保有なし"
+                })
+
+        # 3. 加重平均
+        if len(requirements) == 0:
+            return 0.0, {"reason": "評価対象スキルなし"}
+
+        final_score = sum(weighted.tolist()) / len(requirements)
+
+        return min(100.0, final_score), {
+            "mandatory_check": mandatory_check,
+            "skill_details": skill_details,
+            "average_score": final_score
+        }
+
+    @staticmethod
+    def _level_arrays(
+        levels: np.ndarray,
+        years: np.ndarray,
+        required: np.ndarray,
+        weights: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """要求ごとの (レベルスコア, 経験年数ボーナス, 重み付きスコア)。未保有は重み付き0"""
+        diff = levels - required
+        level_scores = np.where(
+            diff >= 0, np.minimum(90 + diff * 5, 100), np.maximum(0, 70 + diff * 20)
+        )
+        exp_bonus = np.minimum(years / 5.0, 1.0) * 10
+        weighted = np.where(levels > 0, (level_scores + exp_bonus) * weights, 0.0)
+        return level_scores, exp_bonus, weighted
+
+    @staticmethod
+    def _weighted_level_sum(
+        levels: np.ndarray,
+        years: np.ndarray,
+        required: np.ndarray,
+        weights: np.ndarray
+    ) -> float:
+        """重み付きスコアの合計（calculate と同じく先頭から順に加算）"""
+        return sum(SkillMatchCalculator._level_arrays(levels, years, required, weights)[2].tolist())
+
     @staticmethod
     def _check_mandatory_skills(
         candidate_skills: List[Skill],
-        mandatory_reqs: List[TeamRequirement]
+        mandatory_reqs: List[TeamRequirement],
+        skill_map: Optional[Dict[str, Skill]] = None
     ) -> Dict:
         """必須スキルチェック"""
+        if skill_map is None:
+            skill_map = SkillMatchCalculator._index_skills(candidate_skills)
         missing_skills = []
         
         for req in mandatory_reqs:
-            skill = SkillMatchCalculator._find_skill(candidate_skills, req.skill_id)
+            skill = skill_map.get(req.skill_id)
             if not skill:
                 missing_skills.append(req.skill_id)
             elif skill.proficiency_level < req.required_level:
@@ -189,6 +986,14 @@ class SkillMatchCalculator:
             "mandatory_count": len(mandatory_reqs)
         }
 
+    @staticmethod
+    def _index_skills(skills: List[Skill]) -> Dict[str, Skill]:
+        """スキルID→スキルの辞書（同一IDは _find_skill と同じく先頭を採用）"""
+        skill_map: Dict[str, Skill] = {}
+        for skill in skills:
+            skill_map.setdefault(skill.skill_id, skill)
+        return skill_map
+
     @staticmethod
     def _find_skill(skills: List[Skill], skill_id: str) -> Optional[Skill]:
         """スキルIDでスキルを検索"""
@@ -274,6 +1079,36 @@ class RetentionCalculator:
         
         return retention_score, breakdown
 
+    @staticmethod
+    def score(
+        candidate_personality: PersonalityProfile,
+        team_culture: PersonalityProfile,
+        manager_similarity: Optional[float] = None,
+        workload_rate: float = 70.0,
+        recent_move: bool = False
+    ) -> tuple[float, float]:
+        """
+        スコアのみを計算（詳細情報を作らない高速版、calculate と同じ値）
+
+        Returns:
+            (retention: 0-100, 性格類似度: 0-100)
+        """
+        personality_sim = RetentionCalculator._calculate_personality_similarity(
+            candidate_personality,
+            team_culture
+        )
+        mgr_sim = manager_similarity if manager_similarity is not None else 50.0
+        workload_risk = RetentionCalculator._calculate_workload_risk(workload_rate)
+        recent_move_risk = 50.0 if recent_move else 0.0
+
+        retention_score = (
+            0.4 * personality_sim +
+            0.2 * mgr_sim +
+            0.2 * (100 - workload_risk) +
+            0.2 * (100 - recent_move_risk)
+        )
+        return retention_score, personality_sim
+
     @staticmethod
     def _calculate_personality_similarity(
         candidate: PersonalityProfile,
@@ -285,16 +1120,80 @@ class RetentionCalculator:
         Returns:
             0-100のスコア
         """
-        candidate_vec = candidate.to_vector().reshape(1, -1)
-        team_vec = team.to_vector().reshape(1, -1)
-        
-        # コサイン類似度 (-1 to 1)
-        similarity = cosine_similarity(candidate_vec, team_vec)[0][0]
-        
-        # 0-100スケールに正規化
-        score = (similarity + 1) * 50
-        
-        return score
+        # コサイン類似度 (-1 to 1) を0-100スケールに正規化
+        return cosine_similarity_score(candidate.as_tuple(), team.as_tuple())
+
+    @staticmethod
+    def calculate_matrix(
+        candidates: CandidateBatch,
+        teams: TeamBatch,
+        manager_similarity: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        全ペアのリテンションスコアを一括計算（calculate と同じ数値）
+
+        Args:
+            manager_similarity: (候補者数, チーム数) の上司類似度。未指定時は
+                チームごとの teams.manager_similarity を全候補者に使う
+
+        Returns:
+            (retention行列, 性格類似度行列) いずれも (候補者数, チーム数)
+        """
+        personality_sim = similarity_matrix(candidates.personality_units, teams.culture_units)
+        workload_risk = RetentionCalculator._workload_risk_vector(teams.workload_rate)
+        recent_move_risk = np.where(candidates.recent_move, 50.0, 0.0)
+        if manager_similarity is None:
+            manager_similarity = teams.manager_similarity[None, :]
+
+        retention = (
+            0.4 * personality_sim +
+            0.2 * manager_similarity +
+            0.2 * (100 - workload_risk)[None, :] +
+            0.2 * (100 - recent_move_risk)[:, None]
+        )
+        return retention, personality_sim
+
+    @staticmethod
+    def calculate_pairs(
+        personality_units: np.ndarray,
+        culture_units: np.ndarray,
+        manager_similarity: np.ndarray,
+        workload_rate: np.ndarray,
+        recent_move: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (候補者, チーム文化) の組ごとのリテンションスコア（calculate と同じ式）
+
+        チーム文化を組ごとに変えて評価する場合（配置シミュレーション等）に使う。
+        引数はいずれも先頭の次元が組の数。
+
+        Returns:
+            (retention, 性格類似度) いずれも (組の数,)
+        """
+        personality_sim = similarity_pairs(personality_units, culture_units)
+        workload_risk = RetentionCalculator._workload_risk_vector(workload_rate)
+        recent_move_risk = np.where(recent_move, 50.0, 0.0)
+
+        retention = (
+            0.4 * personality_sim +
+            0.2 * manager_similarity +
+            0.2 * (100 - workload_risk) +
+            0.2 * (100 - recent_move_risk)
+        )
+        return retention, personality_sim
+
+    @staticmethod
+    def _workload_risk_vector(workload_rate: np.ndarray) -> np.ndarray:
+        """_calculate_workload_risk の配列版"""
+        return np.where(
+            workload_rate < 60,
+            0.0,
+            np.where(
+                workload_rate < 80,
+                (workload_rate - 60) * 1.5,
+                30 + (workload_rate - 80) * 3.5
+            )
+        )
 
     @staticmethod
     def _calculate_workload_risk(workload_rate: float) -> float:
@@ -369,6 +1268,82 @@ class FrictionCalculator:
         
         return friction_score, breakdown
 
+    @staticmethod
+    def score(
+        move_count_last_year: int = 0,
+        handover_load: float = 0.0,
+        manager_change: bool = False,
+        personality_distance: float = 50.0
+    ) -> float:
+        """スコアのみを計算（詳細情報を作らない高速版、calculate と同じ値）"""
+        move_score = FrictionCalculator._calculate_move_score(move_count_last_year)
+        handover_score = min(handover_load, 100.0)
+        manager_change_score = 50.0 if manager_change else 0.0
+        personality_friction = 100.0 - personality_distance
+
+        return (
+            0.35 * move_score +
+            0.25 * handover_score +
+            0.2 * manager_change_score +
+            0.2 * personality_friction
+        )
+
+    @staticmethod
+    def calculate_matrix(
+        candidates: CandidateBatch,
+        personality_similarity: np.ndarray
+    ) -> np.ndarray:
+        """
+        全ペアのフリクションスコアを一括計算（calculate と同じ数値）
+
+        Args:
+            personality_similarity: RetentionCalculator.calculate_matrix の類似度行列
+
+        Returns:
+            (候補者数, チーム数) のスコア行列
+        """
+        return FrictionCalculator.calculate_pairs(
+            candidates.move_count[:, None],
+            candidates.handover_load[:, None],
+            candidates.manager_change[:, None],
+            personality_similarity
+        )
+
+    @staticmethod
+    def calculate_pairs(
+        move_count: np.ndarray,
+        handover_load: np.ndarray,
+        manager_change: np.ndarray,
+        personality_similarity: np.ndarray
+    ) -> np.ndarray:
+        """
+        (候補者, チーム文化) の組ごとのフリクションスコア（calculate と同じ式）
+
+        引数はブロードキャスト可能な配列（calculate_matrix は候補者側を列ベクトルで渡す）。
+        """
+        move_score = FrictionCalculator._move_score_vector(move_count)
+        handover_score = np.minimum(handover_load, 100.0)
+        manager_change_score = np.where(manager_change, 50.0, 0.0)
+
+        # calculate には 100 - 類似度 が渡され、再度 100 - x されるため類似度そのもの
+        personality_friction = personality_similarity
+
+        return (
+            0.35 * move_score +
+            0.25 * handover_score +
+            0.2 * manager_change_score +
+            0.2 * personality_friction
+        )
+
+    @staticmethod
+    def _move_score_vector(move_count: np.ndarray) -> np.ndarray:
+        """_calculate_move_score の配列版"""
+        return np.select(
+            [move_count == 0, move_count == 1, move_count == 2],
+            [0.0, 30.0, 60.0],
+            default=np.minimum(100.0, 60 + (move_count - 2) * 20.0)
+        )
+
     @staticmethod
     def _calculate_move_score(move_count: int) -> float:
         """
@@ -390,12 +1365,50 @@ class FrictionCalculator:
             return min(100, 60 + (move_count - 2) * 20)
 
 
+# 計測しない場合のステージ（何もしない）
+_NO_STAGE = nullcontext()
+
+
+def round_score(value):
+    """
+    スコアを小数2桁に丸める（スカラー・配列共通）
+
+    np.round と同じ「×100 → 最近接偶数に丸め → ÷100」で計算するため、
+    calculate_fit_score と行列計算（FitComponents.combine 等）の結果がビット単位で一致する。
+    """
+    if isinstance(value, (int, float)):
+        return round(value * 100) / 100
+    return np.round(value, 2)
+
+
 class FitScoreEngine:
     """Fitスコア計算エンジン"""
 
-    def __init__(self, preference_mode: PreferenceMode = PreferenceMode.STABILITY):
+    def __init__(
+        self,
+        preference_mode: PreferenceMode = PreferenceMode.STABILITY,
+        weights: Optional[Dict[str, float]] = None,
+        instrumentation: Optional["Instrumentation"] = None
+    ):
+        """
+        Args:
+            preference_mode: 経営方針モード
+            weights: 任意の α/β/γ。指定時はモードのプリセット重みより優先
+            instrumentation: 指定時はステージ別の回数・所要時間を記録（instrumentation.py）
+        """
         self.preference_mode = preference_mode
-        self.weights = PREFERENCE_WEIGHTS[preference_mode]
+        self.weights = resolve_weights(weights if weights is not None else preference_mode)
+        self.instrumentation = instrumentation
+
+    def _stage(self, name: str, items: int = 1) -> AbstractContextManager:
+        """ステージの計時（instrumentation 未設定時は何もしない）"""
+        if self.instrumentation is None:
+            return _NO_STAGE
+        return self.instrumentation.stage(name, items)
+
+    def _count(self, name: str, value: int = 1) -> None:
+        if self.instrumentation is not None:
+            self.instrumentation.increment(name, value)
 
     def calculate_fit_score(
         self,
@@ -411,72 +1424,275 @@ class FitScoreEngine:
         # Friction用
         move_count_last_year: int = 0,
         handover_load: float = 0.0,
-        manager_change: bool = False
+        manager_change: bool = False,
+        include_breakdown: bool = True
     ) -> FitScoreResult:
         """
         総合Fitスコアを計算
         
         Fit = α × SkillMatch + β × Retention - γ × Friction
+
+        include_breakdown=False の場合はスコアのみを計算し、breakdown は
+        初回アクセス時に同じ入力から作成する（一括ランキング向け）。
         """
-        # 1. SkillMatch計算
-        skill_match, skill_breakdown = SkillMatchCalculator.calculate(
-            candidate_skills,
-            team_requirements
+        inputs = (
+            candidate_skills, team_requirements,
+            candidate_personality, team_culture, manager_similarity, workload_rate, recent_move,
+            move_count_last_year, handover_load, manager_change
+        )
+        mode, weights = self.preference_mode, self.weights
+        self._count("fit_scores")
+
+        if include_breakdown:
+            components = self._calculate_components(*inputs)
+            with self._stage("breakdown"):
+                return self._build_result(components, mode, weights)
+
+        return self._build_result(
+            self._calculate_scores(*inputs),
+            mode,
+            weights,
+            explain=lambda: self._explain(inputs, mode, weights)
         )
+
+    def _explain(self, inputs: tuple, mode: PreferenceMode, weights: Dict[str, float]) -> Dict:
+        """include_breakdown=False の結果の breakdown を作成"""
+        components = self._calculate_components(*inputs)
+        with self._stage("breakdown"):
+            return self._build_breakdown(components, mode, weights)
+
+    def compare_preference_modes(
+        self,
+        candidate_skills: List[Skill],
+        team_requirements: List[TeamRequirement],
+        candidate_personality: PersonalityProfile,
+        team_culture: PersonalityProfile,
+        manager_similarity: Optional[float] = None,
+        workload_rate: float = 70.0,
+        recent_move: bool = False,
+        move_count_last_year: int = 0,
+        handover_load: float = 0.0,
+        manager_change: bool = False
+    ) -> Dict[PreferenceMode, FitScoreResult]:
+        """
+        全Preferenceモードの結果を一度に計算
+
+        モードに依存しない SkillMatch / Retention / Friction は1回だけ計算し、
+        各モードの重みで総合スコアだけを組み直す。
+        """
+        components = self._calculate_components(
+            candidate_skills, team_requirements,
+            candidate_personality, team_culture, manager_similarity, workload_rate, recent_move,
+            move_count_last_year, handover_load, manager_change
+        )
+        return {
+            mode: self._build_result(components, mode, PREFERENCE_WEIGHTS[mode])
+            for mode in PreferenceMode
+        }
+
+    def _calculate_components(
+        self,
+        candidate_skills: List[Skill],
+        team_requirements: List[TeamRequirement],
+        candidate_personality: PersonalityProfile,
+        team_culture: PersonalityProfile,
+        manager_similarity: Optional[float],
+        workload_rate: float,
+        recent_move: bool,
+        move_count_last_year: int,
+        handover_load: float,
+        manager_change: bool
+    ) -> Dict:
+        """モードに依存しない構成スコアと詳細を計算"""
+        # 1. SkillMatch計算
+        with self._stage("skill_match"):
+            skill_match, skill_breakdown = SkillMatchCalculator.calculate(
+                candidate_skills,
+                team_requirements
+            )
         
         # 2. Retention計算
-        retention, retention_breakdown = RetentionCalculator.calculate(
-            candidate_personality,
-            team_culture,
-            manager_similarity,
-            workload_rate,
-            recent_move
-        )
+        with self._stage("retention"):
+            retention, retention_breakdown = RetentionCalculator.calculate(
+                candidate_personality,
+                team_culture,
+                manager_similarity,
+                workload_rate,
+                recent_move
+            )
         
         # 3. Friction計算
-        friction, friction_breakdown = FrictionCalculator.calculate(
-            move_count_last_year,
-            handover_load,
-            manager_change,
-            100.0 - retention_breakdown["personality_similarity"]  # 類似度の逆
-        )
+        with self._stage("friction"):
+            friction, friction_breakdown = FrictionCalculator.calculate(
+                move_count_last_year,
+                handover_load,
+                manager_change,
+                100.0 - retention_breakdown["personality_similarity"]  # 類似度の逆
+            )
         
+        # 信頼度計算（データ充実度に基づく）
+        with self._stage("confidence"):
+            confidence = self._calculate_confidence(
+                candidate_skills,
+                team_requirements,
+                candidate_personality
+            )
+
+        return {
+            "skill_match": skill_match,
+            "retention": retention,
+            "friction": friction,
+            "confidence": confidence,
+            "skill_match_detail": skill_breakdown,
+            "retention_detail": retention_breakdown,
+            "friction_detail": friction_breakdown
+        }
+
+    def _calculate_scores(
+        self,
+        candidate_skills: List[Skill],
+        team_requirements: List[TeamRequirement],
+        candidate_personality: PersonalityProfile,
+        team_culture: PersonalityProfile,
+        manager_similarity: Optional[float],
+        workload_rate: float,
+        recent_move: bool,
+        move_count_last_year: int,
+        handover_load: float,
+        manager_change: bool
+    ) -> Dict:
+        """構成スコアのみを計算（詳細情報なし、_calculate_components と同じ値）"""
+        with self._stage("skill_match"):
+            skill_match = SkillMatchCalculator.score(candidate_skills, team_requirements)
+        with self._stage("retention"):
+            retention, personality_sim = RetentionCalculator.score(
+                candidate_personality,
+                team_culture,
+                manager_similarity,
+                workload_rate,
+                recent_move
+            )
+        with self._stage("friction"):
+            friction = FrictionCalculator.score(
+                move_count_last_year,
+                handover_load,
+                manager_change,
+                100.0 - personality_sim  # 類似度の逆
+            )
+        with self._stage("confidence"):
+            confidence = self._calculate_confidence(
+                candidate_skills,
+                team_requirements,
+                candidate_personality
+            )
+        return {
+            "skill_match": skill_match,
+            "retention": retention,
+            "friction": friction,
+            "confidence": confidence
+        }
+
+    @staticmethod
+    def _build_breakdown(
+        components: Dict,
+        preference_mode: PreferenceMode,
+        weights: Dict[str, float]
+    ) -> Dict:
+        """結果の詳細情報を作成"""
+        return {
+            "preference_mode": preference_mode.value,
+            "weights": weights,
+            "skill_match_detail": components["skill_match_detail"],
+            "retention_detail": components["retention_detail"],
+            "friction_detail": components["friction_detail"]
+        }
+
+    @staticmethod
+    def _build_result(
+        components: Dict,
+        preference_mode: PreferenceMode,
+        weights: Dict[str, float],
+        explain: Optional[Callable[[], Dict]] = None
+    ) -> FitScoreResult:
+        """
+        構成スコアに重みを適用して結果を作成
+
+        components に詳細情報がない場合は explain で遅延作成する。
+        """
         # 4. 総合計算
-        alpha = self.weights["alpha"]
-        beta = self.weights["beta"]
-        gamma = self.weights["gamma"]
+        alpha = weights["alpha"]
+        beta = weights["beta"]
+        gamma = weights["gamma"]
         
         total_score = (
-            alpha * skill_match +
-            beta * retention -
-            gamma * friction
+            alpha * components["skill_match"] +
+            beta * components["retention"] -
+            gamma * components["friction"]
         )
         
         # 0-100にクリップ
         total_score = max(0, min(100, total_score))
         
-        # 信頼度計算（データ充実度に基づく）
-        confidence = self._calculate_confidence(
-            candidate_skills,
-            team_requirements,
-            candidate_personality
-        )
-        
         return FitScoreResult(
-            total_score=round(total_score, 2),
-            skill_match_score=round(skill_match, 2),
-            retention_score=round(retention, 2),
-            friction_score=round(friction, 2),
-            confidence=round(confidence, 2),
-            breakdown={
-                "preference_mode": self.preference_mode.value,
-                "weights": self.weights,
-                "skill_match_detail": skill_breakdown,
-                "retention_detail": retention_breakdown,
-                "friction_detail": friction_breakdown
-            }
+            total_score=round_score(total_score),
+            skill_match_score=round_score(components["skill_match"]),
+            retention_score=round_score(components["retention"]),
+            friction_score=round_score(components["friction"]),
+            confidence=round_score(components["confidence"]),
+            breakdown=(
+                FitScoreEngine._build_breakdown(components, preference_mode, weights)
+                if "skill_match_detail" in components else None
+            ),
+            explain=explain
+        )
+
+    def score_components(
+        self,
+        candidates: List[CandidateProfile] | CandidateBatch,
+        teams: List[TeamProfile] | TeamBatch,
+        manager_similarity: Optional[np.ndarray] = None
+    ) -> FitComponents:
+        """
+        全ペアの SkillMatch / Retention / Friction を一括計算
+
+        プロファイルのリストを渡した場合は共通スキル列で配列化してから計算する。
+        manager_similarity には候補者×チームの上司類似度（culture_index.py）を渡せる。
+        """
+        if isinstance(candidates, CandidateBatch) != isinstance(teams, TeamBatch):
+            raise TypeError("候補者とチームは両方ともプロファイルか、両方とも配列表現で渡してください")
+        if not isinstance(candidates, CandidateBatch):
+            with self._stage("pack", len(candidates)):
+                candidates, teams = pack_profiles(candidates, teams)
+        pairs = len(candidates) * len(teams)
+        self._count("pairs", pairs)
+
+        with self._stage("skill_match_matrix", pairs):
+            skill_match = SkillMatchCalculator.calculate_matrix(candidates, teams)
+        with self._stage("retention_matrix", pairs):
+            retention, personality_sim = RetentionCalculator.calculate_matrix(candidates, teams, manager_similarity)
+        with self._stage("friction_matrix", pairs):
+            friction = FrictionCalculator.calculate_matrix(candidates, personality_sim)
+
+        return FitComponents(
+            skill_match=skill_match,
+            retention=retention,
+            friction=friction,
+            personality_similarity=personality_sim
         )
 
+    def score_matrix(
+        self,
+        candidates: List[CandidateProfile] | CandidateBatch,
+        teams: List[TeamProfile] | TeamBatch
+    ) -> np.ndarray:
+        """
+        全ペアの総合Fitスコアを一括計算
+
+        Returns:
+            (候補者数, チーム数) の行列。各要素は calculate_fit_score の total_score と同じ値
+        """
+        return self.score_components(candidates, teams).combine(self.weights)
+
     def _calculate_confidence(
         self,
         candidate_skills: List[Skill],
@@ -486,72 +1702,47 @@ class FitScoreEngine:
         """
         計算結果の信頼度を算出
         
+        Returns:
+            0.0-1.0の信頼度
+        """
+        return self.confidence_from_counts(
+            len(candidate_skills), len(team_requirements), bool(personality)
+        )
+
+    @staticmethod
+    def confidence_from_counts(
+        skill_count: int,
+        requirement_count: int,
+        has_personality: bool = True
+    ) -> float:
+        """
+        保有スキル数・要求スキル数から信頼度を算出（配列表現からも使えるよう件数で受け取る）
+        
         Returns:
             0.0-1.0の信頼度
         """
         confidence_factors = []
         
         # スキルデータの充実度
-        if len(candidate_skills) >= 5:
+        if skill_count >= 5:
             confidence_factors.append(1.0)
-        elif len(candidate_skills) >= 3:
+        elif skill_count >= 3:
             confidence_factors.append(0.8)
         else:
             confidence_factors.append(0.5)
         
         # チーム要求の明確さ
-        if len(team_requirements) >= 5:
+        if requirement_count >= 5:
             confidence_factors.append(1.0)
-        elif len(team_requirements) >= 3:
+        elif requirement_count >= 3:
             confidence_factors.append(0.8)
         else:
             confidence_factors.append(0.6)
         
         # 性格データの有無
-        if personality:
+        if has_personality:
             confidence_factors.append(1.0)
         else:
             confidence_factors.append(0.5)
         
         return sum(confidence_factors) / len(confidence_factors)
-
-
-# 使用例
-if __name__ == "__main__":
-    # サンプルデータ
-    candidate_skills = [
-        Skill("sk_001", 5, 7.5),  # Python
-        Skill("sk_007", 4, 4.0),   # 機械学習
-        Skill("sk_009", 4, 6.0),   # SQL
-    ]
-    
-    team_reqs = [
-        TeamRequirement("sk_001", 4, True, 1),   # Python必須
-        TeamRequirement("sk_007", 4, True, 1),   # ML必須
-        TeamRequirement("sk_009", 3, True, 2),   # SQL必須
-    ]
-    
-    candidate_personality = PersonalityProfile(75, 80, 45, 60, 35)
-    team_culture = PersonalityProfile(80, 75, 50, 65, 40)
-    
-    # Fitスコア計算
-    engine = FitScoreEngine(PreferenceMode.STABILITY)
-    result = engine.calculate_fit_score(
-        candidate_skills=candidate_skills,
-        team_requirements=team_reqs,
-        candidate_personality=candidate_personality,
-        team_culture=team_culture,
-        workload_rate=75.0,
-        recent_move=False,
-        move_count_last_year=0,
-        handover_load=20.0,
-        manager_change=False
-    )
-    
-    print(f"総合Fitスコア: {result.total_score}/100")
-    print(f"├ SkillMatch: {result.skill_match_score}/100")
-    print(f"├ Retention: {result.retention_score}/100")
-    print(f"├ Friction: {result.friction_score}/100")
-    print(f"└ 信頼度: {result.confidence}")
-
-
@@ -0,0 +1,358 @@
+"""
+Takei-prime Fitスコアインデックス
+
+候補者×チームの総合スコア行列と構成スコア行列（SkillMatch / Retention / Friction）を
+保持し、レコード変更時は影響する行（候補者）または列（チーム）だけを再計算する。
+週次・月次の更新サイクルを全件バッチではなく逐次反映で回すためのもの。
+
+構成スコアはPreferenceモードに依存しないため、モード・重みの切替は
+保持済み行列の線形結合だけで行う。
+
+行列と候補者側の配列は容量を倍々に確保したバッファに保持し、有効な
+範囲（候補者数×チーム数）のビューとして参照する。追加は末尾の1行・1列への
+書き込み、削除は末尾の行・列との入れ替えで行い、行列全体をコピーしない
+（削除後は候補者・チームの並び順が変わる）。
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .fit_score_calculator import (
+    CandidateBatch,
+    CandidateProfile,
+    FitComponents,
+    FitScoreEngine,
+    PreferenceMode,
+    SkillIndex,
+    TeamBatch,
+    TeamProfile,
+    build_skill_index,
+)
+
+
+# 候補者1人ごとに1行を持つ CandidateBatch の配列
+_CANDIDATE_ARRAYS = (
+    "levels", "years", "personality", "personality_units",
+    "recent_move", "move_count", "handover_load", "manager_change",
+)
+
+# 保持する (候補者数, チーム数) の行列
+_MATRICES = ("skill_match", "retention", "friction", "personality_similarity", "total")
+
+
+class FitScoreIndex:
+    """
+    全ペアのFitスコアを保持し差分更新するインデックス
+
+    行は候補者、列はチーム。候補者側の配列表現は行単位で更新し、
+    チーム側（件数が少ない）は変更時にプロファイルから再構築する。
+    """
+
+    def __init__(
+        self,
+        candidates: List[CandidateProfile],
+        teams: List[TeamProfile],
+        mode: PreferenceMode = PreferenceMode.STABILITY,
+        skill_index: Optional[SkillIndex] = None
+    ):
+        self.engine = FitScoreEngine(mode)
+        self.skill_index = build_skill_index(candidates, teams, skill_index)
+        self._teams: List[TeamProfile] = list(teams)
+        # 行数は容量（_n_rows 行目以降は未使用）
+        self._candidate_buffer = CandidateBatch.from_profiles(candidates, self.skill_index)
+        self._candidate_ids: List[str] = list(self._candidate_buffer.ids)
+        self._n_rows = len(self._candidate_ids)
+        self._team_batch: Optional[TeamBatch] = None
+        self._candidate_rows: Dict[str, int] = {}
+        self._team_cols: Dict[str, int] = {}
+        self._reindex()
+
+        components = self.engine.score_components(self._candidates, self._team_arrays())
+        self._matrices: Dict[str, np.ndarray] = {
+            "skill_match": components.skill_match,
+            "retention": components.retention,
+            "friction": components.friction,
+            "personality_similarity": components.personality_similarity,
+            "total": components.combine(self.engine.weights),
+        }
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    @property
+    def candidate_ids(self) -> List[str]:
+        return self._candidate_ids
+
+    @property
+    def team_ids(self) -> List[str]:
+        return [team.id for team in self._teams]
+
+    @property
+    def skill_match(self) -> np.ndarray:
+        return self._matrix("skill_match")
+
+    @property
+    def retention(self) -> np.ndarray:
+        return self._matrix("retention")
+
+    @property
+    def friction(self) -> np.ndarray:
+        return self._matrix("friction")
+
+    @property
+    def personality_similarity(self) -> np.ndarray:
+        return self._matrix("personality_similarity")
+
+    @property
+    def total(self) -> np.ndarray:
+        """(候補者数, チーム数) 現在のモードでの総合スコア"""
+        return self._matrix("total")
+
+    @property
+    def components(self) -> FitComponents:
+        return FitComponents(
+            skill_match=self.skill_match,
+            retention=self.retention,
+            friction=self.friction,
+            personality_similarity=self.personality_similarity
+        )
+
+    def score(self, candidate_id: str, team_id: str) -> float:
+        return float(self.total[self._candidate_rows[candidate_id], self._team_cols[team_id]])
+
+    # ------------------------------------------------------------------
+    # Preferenceモード切替（構成スコアの線形結合のみで再ランキング）
+    # ------------------------------------------------------------------
+
+    def set_preference(self, preference: PreferenceMode | Dict[str, float]) -> None:
+        """Preferenceモードまたは任意の α/β/γ に切り替え（再スコアリングなし）"""
+        if isinstance(preference, PreferenceMode):
+            self.engine = FitScoreEngine(preference)
+        else:
+            self.engine = FitScoreEngine(self.engine.preference_mode, weights=preference)
+        self.total[...] = self.components.combine(self.engine.weights)
+
+    def scores_for(self, preference: PreferenceMode | Dict[str, float]) -> np.ndarray:
+        """指定モード・重みでの総合スコア行列（現在のモードは変更しない）"""
+        return self.components.combine(preference)
+
+    def rank_teams(
+        self,
+        candidate_id: str,
+        preference: Optional[PreferenceMode | Dict[str, float]] = None,
+        k: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """候補者に対するチームのランキング（preference 省略時は現在のモード）"""
+        row = self._candidate_rows[candidate_id]
+        scores = self.total[row] if preference is None else self._row_components(row).combine(preference)[0]
+        return self._ranking(self.team_ids, scores, k)
+
+    def rank_candidates(
+        self,
+        team_id: str,
+        preference: Optional[PreferenceMode | Dict[str, float]] = None,
+        k: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """チームに対する候補者のランキング（preference 省略時は現在のモード）"""
+        col = self._team_cols[team_id]
+        scores = self.total[:, col] if preference is None else self._col_components(col).combine(preference)[:, 0]
+        return self._ranking(self.candidate_ids, scores, k)
+
+    def compare_modes_for_candidate(
+        self,
+        candidate_id: str,
+        k: Optional[int] = None
+    ) -> Dict[PreferenceMode, List[Tuple[str, float]]]:
+        """5つのPreferenceモードでのチームランキングを一度に返す"""
+        totals = self._row_components(self._candidate_rows[candidate_id]).combine_modes()
+        return {mode: self._ranking(self.team_ids, total[0], k) for mode, total in totals.items()}
+
+    def compare_modes_for_team(
+        self,
+        team_id: str,
+        k: Optional[int] = None
+    ) -> Dict[PreferenceMode, List[Tuple[str, float]]]:
+        """5つのPreferenceモードでの候補者ランキングを一度に返す"""
+        totals = self._col_components(self._team_cols[team_id]).combine_modes()
+        return {mode: self._ranking(self.candidate_ids, total[:, 0], k) for mode, total in totals.items()}
+
+    # ------------------------------------------------------------------
+    # 候補者の更新（行の再計算）
+    # ------------------------------------------------------------------
+
+    def update_candidate(self, candidate: CandidateProfile) -> None:
+        """候補者レコードの変更を反映（該当行のみ再計算）"""
+        row = self._candidate_rows[candidate.id]
+        batch = self._candidate_batch([candidate])
+        self._write_row(row, batch, self.engine.score_components(batch, self._team_arrays()))
+
+    def add_candidate(self, candidate: CandidateProfile) -> None:
+        """候補者を追加（追加行のみ計算）"""
+        if candidate.id in self._candidate_rows:
+            raise ValueError(f"候補者は登録済みです: {candidate.id}")
+        batch = self._candidate_batch([candidate])
+        components = self.engine.score_components(batch, self._team_arrays())
+
+        row = self._n_rows
+        self._reserve(row + 1, len(self._teams))
+        self._n_rows += 1
+        self._candidate_ids.append(candidate.id)
+        self._candidate_rows[candidate.id] = row
+        self._write_row(row, batch, components)
+
+    def remove_candidate(self, candidate_id: str) -> None:
+        """候補者を削除（末尾の行を削除行に移す）"""
+        row = self._candidate_rows.pop(candidate_id)
+        last = self._n_rows - 1
+        if row != last:
+            for name in _CANDIDATE_ARRAYS:
+                array = getattr(self._candidate_buffer, name)
+                array[row] = array[last]
+            for matrix in self._matrices.values():
+                matrix[row, :len(self._teams)] = matrix[last, :len(self._teams)]
+            moved = self._candidate_ids[last]
+            self._candidate_ids[row] = moved
+            self._candidate_rows[moved] = row
+        self._candidate_ids.pop()
+        self._n_rows -= 1
+
+    # ------------------------------------------------------------------
+    # チームの更新（列の再計算）
+    # ------------------------------------------------------------------
+
+    def update_team(self, team: TeamProfile) -> None:
+        """チームレコード（文化・稼働率・要求スキル等）の変更を反映（該当列のみ再計算）"""
+        col = self._team_cols[team.id]
+        self._teams[col] = team
+        self._write_col(col, self._score_team(team))
+
+    def add_team(self, team: TeamProfile) -> None:
+        """チームを追加（追加列のみ計算）"""
+        if team.id in self._team_cols:
+            raise ValueError(f"チームは登録済みです: {team.id}")
+        components = self._score_team(team)
+        col = len(self._teams)
+        self._reserve(self._n_rows, col + 1)
+        self._teams.append(team)
+        self._team_cols[team.id] = col
+        self._write_col(col, components)
+
+    def remove_team(self, team_id: str) -> None:
+        """チームを削除（末尾の列を削除列に移す）"""
+        col = self._team_cols.pop(team_id)
+        last = len(self._teams) - 1
+        if col != last:
+            for matrix in self._matrices.values():
+                matrix[:self._n_rows, col] = matrix[:self._n_rows, last]
+            self._teams[col] = self._teams[last]
+            self._team_cols[self._teams[col].id] = col
+        self._teams.pop()
+        self._team_batch = None
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    @property
+    def _candidates(self) -> CandidateBatch:
+        """有効な行だけの配列表現（バッファのビュー）"""
+        buffer = self._candidate_buffer
+        return CandidateBatch(
+            ids=self._candidate_ids,
+            skill_index=buffer.skill_index,
+            **{name: getattr(buffer, name)[:self._n_rows] for name in _CANDIDATE_ARRAYS}
+        )
+
+    def _matrix(self, name: str) -> np.ndarray:
+        return self._matrices[name][:self._n_rows, :len(self._teams)]
+
+    def _reserve(self, rows: int, cols: int) -> None:
+        """行・列の容量を確保（不足時は倍に拡張し、有効範囲だけコピー）"""
+        n_rows, n_cols = self._n_rows, len(self._teams)
+        row_capacity, col_capacity = self._matrices["total"].shape
+        if rows > row_capacity or cols > col_capacity:
+            shape = (
+                max(rows, 2 * row_capacity) if rows > row_capacity else row_capacity,
+                max(cols, 2 * col_capacity) if cols > col_capacity else col_capacity,
+            )
+            for name, matrix in self._matrices.items():
+                grown = np.zeros(shape, dtype=matrix.dtype)
+                grown[:n_rows, :n_cols] = matrix[:n_rows, :n_cols]
+                self._matrices[name] = grown
+
+        capacity = len(self._candidate_buffer.levels)
+        if rows > capacity:
+            capacity = max(rows, 2 * capacity)
+            for name in _CANDIDATE_ARRAYS:
+                array = getattr(self._candidate_buffer, name)
+                grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+                grown[:n_rows] = array[:n_rows]
+                setattr(self._candidate_buffer, name, grown)
+
+    def _write_row(self, row: int, batch: CandidateBatch, components: FitComponents) -> None:
+        """1人分の配列表現と構成スコアを row 行目に書き込む"""
+        for name in _CANDIDATE_ARRAYS:
+            getattr(self._candidate_buffer, name)[row] = getattr(batch, name)[0]
+        n_cols = len(self._teams)
+        for name in _MATRICES[:-1]:
+            self._matrices[name][row, :n_cols] = getattr(components, name)[0]
+        self._matrices["total"][row, :n_cols] = components.combine(self.engine.weights)[0]
+
+    def _write_col(self, col: int, components: FitComponents) -> None:
+        """1チーム分の構成スコアを col 列目に書き込む"""
+        for name in _MATRICES[:-1]:
+            self._matrices[name][:self._n_rows, col] = getattr(components, name)[:, 0]
+        self._matrices["total"][:self._n_rows, col] = components.combine(self.engine.weights)[:, 0]
+
+    def _row_components(self, row: int) -> FitComponents:
+        return FitComponents(
+            skill_match=self.skill_match[row:row + 1],
+            retention=self.retention[row:row + 1],
+            friction=self.friction[row:row + 1],
+            personality_similarity=self.personality_similarity[row:row + 1]
+        )
+
+    def _col_components(self, col: int) -> FitComponents:
+        return FitComponents(
+            skill_match=self.skill_match[:, col:col + 1],
+            retention=self.retention[:, col:col + 1],
+            friction=self.friction[:, col:col + 1],
+            personality_similarity=self.personality_similarity[:, col:col + 1]
+        )
+
+    @staticmethod
+    def _ranking(ids: List[str], scores: np.ndarray, k: Optional[int]) -> List[Tuple[str, float]]:
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(ids[i], float(scores[i])) for i in order]
+
+    def _score_team(self, team: TeamProfile) -> FitComponents:
+        """1チーム分の列を計算（チーム側配列表現は次回参照時に再構築）"""
+        self._team_batch = None
+        self._ensure_skills([req.skill_id for req in team.requirements])
+        return self.engine.score_components(
+            self._candidates, TeamBatch.from_profiles([team], self.skill_index)
+        )
+
+    def _candidate_batch(self, candidates: List[CandidateProfile]) -> CandidateBatch:
+        self._ensure_skills([s.skill_id for c in candidates for s in c.skills])
+        return CandidateBatch.from_profiles(candidates, self.skill_index)
+
+    def _team_arrays(self) -> TeamBatch:
+        if self._team_batch is None:
+            self._team_batch = TeamBatch.from_profiles(self._teams, self.skill_index)
+        return self._team_batch
+
+    def _ensure_skills(self, skill_ids: List[str]) -> None:
+        """未登録スキルがあれば索引を拡張し、候補者側の列を補う"""
+        extended = self.skill_index.extended(skill_ids)
+        if extended is self.skill_index:
+            return
+        self.skill_index = extended
+        self._candidate_buffer = self._candidate_buffer.with_skill_index(extended)
+        self._team_batch = None
+
+    def _reindex(self) -> None:
+        self._candidate_rows = {cid: i for i, cid in enumerate(self._candidate_ids)}
+        self._team_cols = {team.id: i for i, team in enumerate(self._teams)}
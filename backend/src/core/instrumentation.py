@@ -0,0 +1,316 @@
+"""
+Takei-prime Fitスコア計算の計測
+
+FitScoreEngine に Instrumentation を渡すと、ステージ（SkillMatch / Retention /
+Friction / 信頼度 / breakdown 作成、一括計算では配列化と各行列計算）ごとの
+呼び出し回数と所要時間を集計する。
+
+    instrumentation = Instrumentation()
+    engine = FitScoreEngine(instrumentation=instrumentation)
+    ...
+    print(instrumentation.prometheus_text())
+
+    with profile_run("sampling") as report:
+        engine.score_matrix(candidates, teams)
+    print(report.text())
+
+ステージの計時は FitScoreEngine 自身が行い（FitScoreEngine._stage）、
+Instrumentation は記録された時間の集計と出力だけを受け持つ。計測しない場合
+（instrumentation=None、既定）の各ステージは何もしないコンテキストマネージャになる。
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .fit_score_calculator import FitScoreEngine
+
+METRIC_PREFIX = "takei_fit"
+
+# ステージ名（表示・エクスポート順）
+STAGES = (
+    "skill_match",
+    "retention",
+    "friction",
+    "confidence",
+    "breakdown",
+    "pack",
+    "skill_match_matrix",
+    "retention_matrix",
+    "friction_matrix",
+)
+
+
+@dataclass
+class StageStats:
+    """ステージごとの集計"""
+    calls: int = 0
+    items: int = 0              # 一括計算では計算したペア数、単体計算では呼び出し回数
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class Instrumentation:
+    """
+    ステージ別のカウンタ・タイマー
+
+    複数スレッドから同じエンジンを使う場合（スコアリングサーバー等）でも
+    集計できるようにロックで保護する。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._stages: Dict[str, StageStats] = {}
+        self._counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 記録
+    # ------------------------------------------------------------------
+
+    def record(self, stage: str, seconds: float, items: int = 1) -> None:
+        """ステージの所要時間を1回分加算"""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.calls += 1
+            stats.items += items
+            stats.total_seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """任意のカウンタを加算（結果件数など）"""
+        with self._lock:
+            self._counters[name] += value
+
+    @contextmanager
+    def stage(self, name: str, items: int = 1) -> Iterator[None]:
+        """with ブロックの所要時間をステージとして記録"""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, self._clock() - start, items)
+
+    def timed(self, name: str, func: Callable, *args, items: int = 1):
+        """func(*args) を実行し、所要時間をステージとして記録"""
+        start = self._clock()
+        try:
+            return func(*args)
+        finally:
+            self.record(name, self._clock() - start, items)
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """集計のコピー {"stages": {名前: {...}}, "counters": {...}}"""
+        with self._lock:
+            return {
+                "stages": {
+                    name: {
+                        "calls": stats.calls,
+                        "items": stats.items,
+                        "total_seconds": stats.total_seconds,
+                        "mean_seconds": stats.mean_seconds,
+                        "max_seconds": stats.max_seconds
+                    }
+                    for name, stats in self._ordered_stages()
+                },
+                "counters": dict(self._counters)
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def report(self) -> str:
+        """ステージ別の所要時間の表（合計時間の多い順）"""
+        stages = self.snapshot()["stages"]
+        grand_total = sum(s["total_seconds"] for s in stages.values()) or 1.0
+        lines = [f"{'stage':<20}{'calls':>10}{'total_ms':>12}{'mean_us':>12}{'max_us':>12}{'share':>8}"]
+        for name, s in sorted(stages.items(), key=lambda item: -item[1]["total_seconds"]):
+            lines.append(
+                f"{name:<20}{s['calls']:>10}{s['total_seconds'] * 1e3:>12.2f}"
+                f"{s['mean_seconds'] * 1e6:>12.1f}{s['max_seconds'] * 1e6:>12.1f}"
+                f"{s['total_seconds'] / grand_total:>8.1%}"
+            )
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------
+    # エクスポート
+    # ------------------------------------------------------------------
+
+    def prometheus_text(self, prefix: str = METRIC_PREFIX) -> str:
+        """Prometheus のテキスト形式（exposition format）で出力"""
+        snapshot = self.snapshot()
+        stages = snapshot["stages"]
+        metrics = (
+            ("stage_calls_total", "counter", "ステージの呼び出し回数", "calls"),
+            ("stage_items_total", "counter", "ステージで計算した件数", "items"),
+            ("stage_seconds_total", "counter", "ステージの累積所要時間（秒）", "total_seconds"),
+            ("stage_seconds_max", "gauge", "ステージの最大所要時間（秒）", "max_seconds"),
+        )
+        lines: List[str] = []
+        for suffix, kind, help_text, field_name in metrics:
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage, s in stages.items():
+                lines.append(f'{name}{{stage="{stage}"}} {s[field_name]!r}')
+        for counter, value in sorted(snapshot["counters"].items()):
+            name = f"{prefix}_{counter}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path, prefix: str = METRIC_PREFIX) -> None:
+        """node_exporter の textfile collector 向けに書き出す（置き換えは原子的）"""
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.prometheus_text(prefix), encoding="utf-8")
+        tmp.replace(path)
+
+    def _ordered_stages(self) -> List[Tuple[str, StageStats]]:
+        known = [(name, self._stages[name]) for name in STAGES if name in self._stages]
+        extra = sorted((name, s) for name, s in self._stages.items() if name not in STAGES)
+        return known + extra
+
+
+@contextmanager
+def instrument(engine: FitScoreEngine, instrumentation: Optional[Instrumentation] = None) -> Iterator[Instrumentation]:
+    """with ブロックの間だけ engine を計測する"""
+    instrumentation = instrumentation or Instrumentation()
+    previous = engine.instrumentation
+    engine.instrumentation = instrumentation
+    try:
+        yield instrumentation
+    finally:
+        engine.instrumentation = previous
+
+
+# ----------------------------------------------------------------------
+# プロファイル
+# ----------------------------------------------------------------------
+
+class ProfileReport:
+    """profile_run の結果（with ブロックを抜けた時点で確定）"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.elapsed_seconds = 0.0
+        self.stats: Optional[pstats.Stats] = None          # cprofile
+        self.samples: Counter = Counter()                    # sampling: 関数 → 最内フレームのサンプル数
+        self.cumulative_samples: Counter = Counter()         # sampling: 関数 → スタック上にあったサンプル数
+        self.sample_count = 0
+
+    def text(self, limit: int = 30, sort: str = "cumulative") -> str:
+        """上位の関数の一覧"""
+        if self.mode == "cprofile":
+            if self.stats is None:
+                return ""
+            stream = io.StringIO()
+            self.stats.stream = stream
+            self.stats.sort_stats(sort).print_stats(limit)
+            return stream.getvalue()
+
+        total = self.sample_count or 1
+        counts = self.cumulative_samples if sort == "cumulative" else self.samples
+        lines = [f"{self.sample_count} samples in {self.elapsed_seconds:.3f}s"]
+        lines.append(f"{'self':>8}{'cumulative':>12}  function")
+        for func, count in counts.most_common(limit):
+            lines.append(
+                f"{self.samples[func] / total:>8.1%}{self.cumulative_samples[func] / total:>12.1%}  {func}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: Path) -> None:
+        """cprofile の結果を pstats 形式で保存（snakeviz 等で参照）"""
+        if self.stats is None:
+            raise ValueError("cprofile モードの結果のみ保存できます")
+        self.stats.dump_stats(str(path))
+
+
+class _Sampler(threading.Thread):
+    """対象スレッドのスタックを一定間隔で採取する"""
+
+    def __init__(self, target_thread_id: int, interval: float, report: ProfileReport):
+        super().__init__(name="fit-score-sampler", daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.report = report
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            self.report.sample_count += 1
+            self.report.samples[_frame_label(frame)] += 1
+            seen = set()
+            while frame is not None:
+                label = _frame_label(frame)
+                if label not in seen:
+                    seen.add(label)
+                    self.report.cumulative_samples[label] += 1
+                frame = frame.f_back
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+@contextmanager
+def profile_run(mode: str = "cprofile", interval: float = 0.001) -> Iterator[ProfileReport]:
+    """
+    with ブロックの実行をプロファイル
+
+    Args:
+        mode: "cprofile"（全関数呼び出しを記録、オーバーヘッド大）または
+              "sampling"（呼び出しスレッドのスタックを interval 秒ごとに採取、オーバーヘッド小）
+        interval: sampling の採取間隔（秒）
+    """
+    if mode not in ("cprofile", "sampling"):
+        raise ValueError(f"不明なプロファイルモードです: {mode}")
+    report = ProfileReport(mode)
+    start = time.perf_counter()
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            report.elapsed_seconds = time.perf_counter() - start
+            report.stats = pstats.Stats(profiler)
+        return
+
+    sampler = _Sampler(threading.get_ident(), interval, report)
+    sampler.start()
+    try:
+        yield report
+    finally:
+        sampler.stop()
+        report.elapsed_seconds = time.perf_counter() - start
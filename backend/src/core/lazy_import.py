@@ -0,0 +1,55 @@
+"""
+Takei-prime 重い依存の遅延import
+
+    np = lazy_import("numpy")
+
+np の属性に初めてアクセスした時点で numpy を import する。単一ペアの
+calculate_fit_score は純Pythonで完結するため、CLI・短命なワーカーでは
+numpy の読み込み（数十ミリ秒）を避けられる。型注釈は
+`from __future__ import annotations` で文字列のまま保持すること。
+"""
+
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """属性アクセス時に実体を import して置き換わるモジュール代理"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._load(), attr)
+        # 2回目以降は通常の属性参照で返す
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """import 済みなら実体を、未 import なら LazyModule を返す"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """モジュールが実際に import 済みか"""
+    return name in sys.modules
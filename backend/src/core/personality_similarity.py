@@ -0,0 +1,84 @@
+"""
+Takei-prime 性格類似度（Big Five コサイン類似度）
+
+- 単一ペア: cosine_similarity_score（純Python、配列確保なし）
+- 全ペア: normalize_vectors で候補者・チームを一度だけ正規化し、
+  similarity_matrix で全ペアをまとめて計算（次元ごとの外積を順に加算し、
+  単一ペアと同じ加算順序にしてビット単位で同じ値を返す）
+
+いずれも 0-100 のスコアを返す（コサイン類似度 -1〜1 を線形変換）。
+ゼロベクトルとの類似度は 0（スコア50）とする。
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Sequence
+
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_import("numpy")
+
+
+def cosine_similarity_score(a: Sequence[float], b: Sequence[float]) -> float:
+    """
+    2ベクトルのコサイン類似度を 0-100 スケールで計算
+
+    similarity_matrix と同じく正規化後の内積として計算する。
+    """
+    norm_a = math.sqrt(sum(x * x for x in a)) or 1.0
+    norm_b = math.sqrt(sum(y * y for y in b)) or 1.0
+    similarity = sum((x / norm_a) * (y / norm_b) for x, y in zip(a, b))
+    return (similarity + 1) * 50
+
+
+def normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+    """各行を単位ベクトルに正規化（ゼロベクトルはそのまま）"""
+    vectors = np.asarray(vectors, dtype=np.float64)
+    norms = np.sqrt(_sum_columns(vectors * vectors))[:, None]
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def similarity_matrix(
+    candidate_units: np.ndarray,
+    team_units: np.ndarray
+) -> np.ndarray:
+    """
+    正規化済みベクトル同士の全ペア類似度
+
+    Args:
+        candidate_units: (候補者数, 5) normalize_vectors の結果
+        team_units: (チーム数, 5) normalize_vectors の結果
+
+    Returns:
+        (候補者数, チーム数) の 0-100 スコア行列
+    """
+    similarity = np.zeros((len(candidate_units), len(team_units)), dtype=np.float64)
+    product = np.empty_like(similarity)
+    for dim in range(candidate_units.shape[1]):
+        np.multiply(candidate_units[:, dim, None], team_units[None, :, dim], out=product)
+        similarity += product
+    similarity += 1
+    similarity *= 50
+    return similarity
+
+
+def similarity_pairs(candidate_units: np.ndarray, team_units: np.ndarray) -> np.ndarray:
+    """行ごとのペア (candidate_units[i], team_units[i]) の類似度 0-100"""
+    return (_sum_columns(candidate_units * team_units) + 1) * 50
+
+
+def _sum_columns(values: np.ndarray) -> np.ndarray:
+    """
+    各行の要素を先頭の次元から順に足す
+
+    行列積や np.linalg.norm は加算順序（FMA・ペアワイズ和）が異なり、
+    cosine_similarity_score と最下位ビットがずれるため使わない。
+    """
+    total = np.zeros(len(values), dtype=np.float64)
+    for dim in range(values.shape[1]):
+        total += values[:, dim]
+    return total
@@ -0,0 +1,199 @@
+"""
+Takei-prime Top-K レコメンド
+
+必須スキルの転置インデックスで SkillMatch が 0 になるペア（必須スキル不足）を
+スコア計算前に除外し、残ったペアだけを一括計算して上位K件を返す。
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .fit_score_calculator import (
+    PREFERENCE_WEIGHTS,
+    CandidateBatch,
+    CandidateProfile,
+    FitScoreEngine,
+    PreferenceMode,
+    RequirementVector,
+    SkillIndex,
+    SkillVector,
+    TeamBatch,
+    TeamProfile,
+    pack_profiles,
+    round_score,
+)
+
+
+@dataclass
+class Recommendation:
+    """レコメンド結果1件"""
+    id: str
+    total_score: float
+    skill_match_score: float
+    retention_score: float
+    friction_score: float
+
+
+class MandatorySkillIndex:
+    """
+    必須スキルの転置インデックス
+
+    - 候補者側: スキル列 → (保有レベル降順の候補者行, レベル)
+    - チーム側: スキル列 → (必須要求を持つチーム, 要求レベル)
+    """
+
+    def __init__(self, candidates: CandidateBatch, teams: TeamBatch):
+        # 候補者側ポスティング
+        self._candidate_rows: List[np.ndarray] = []
+        self._candidate_levels: List[np.ndarray] = []
+        for col in range(len(candidates.skill_index)):
+            levels = candidates.levels[:, col]
+            rows = np.flatnonzero(levels > 0)
+            order = np.argsort(-levels[rows], kind="stable")
+            self._candidate_rows.append(rows[order])
+            self._candidate_levels.append(levels[rows][order].astype(np.int64))
+        self._n_candidates = len(candidates)
+
+        # チーム側ポスティング
+        mandatory = np.flatnonzero(teams.req_mandatory)
+        req_team = np.repeat(np.arange(len(teams)), teams.req_counts)
+        self._team_postings: Dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        for col in np.unique(teams.req_columns[mandatory]):
+            reqs = mandatory[teams.req_columns[mandatory] == col]
+            self._team_postings[int(col)] = (
+                req_team[reqs], teams.req_levels[reqs].astype(np.int64)
+            )
+        self._mandatory_counts = np.bincount(
+            req_team[mandatory], minlength=len(teams)
+        )
+
+    def eligible_candidates(self, requirements: RequirementVector) -> np.ndarray:
+        """必須スキルを全て満たす候補者行（昇順）"""
+        mandatory = np.flatnonzero(requirements.mandatory)
+        if len(mandatory) == 0:
+            return np.arange(self._n_candidates)
+
+        postings = []
+        for i in mandatory:
+            col = int(requirements.columns[i])
+            levels = self._candidate_levels[col]
+            # レベル降順なので要求レベル以上は先頭からの連続区間
+            count = int(np.searchsorted(-levels, -int(requirements.levels[i]), side="right"))
+            postings.append(self._candidate_rows[col][:count])
+
+        postings.sort(key=len)
+        eligible = np.sort(postings[0])
+        for rows in postings[1:]:
+            if len(eligible) == 0:
+                break
+            eligible = np.intersect1d(eligible, rows, assume_unique=True)
+        return eligible
+
+    def eligible_teams(self, skill_vector: SkillVector) -> np.ndarray:
+        """候補者が必須スキルを全て満たすチーム（昇順）"""
+        satisfied = np.zeros(len(self._mandatory_counts), dtype=np.int64)
+        for col in np.flatnonzero(skill_vector.levels):
+            posting = self._team_postings.get(int(col))
+            if posting is None:
+                continue
+            teams, levels = posting
+            np.add.at(satisfied, teams[levels <= skill_vector.levels[col]], 1)
+        return np.flatnonzero(satisfied == self._mandatory_counts)
+
+
+class FitRecommender:
+    """
+    候補者→チーム / チーム→候補者 の Top-K レコメンド
+
+    必須スキル不足のペアは SkillMatch が 0 となり配置対象にならないため、
+    レコメンド対象外としてスコア計算前に除外する。
+    """
+
+    def __init__(self, candidates: CandidateBatch, teams: TeamBatch):
+        self.candidates = candidates
+        self.teams = teams
+        self.index = MandatorySkillIndex(candidates, teams)
+        self._candidate_rows = {cid: i for i, cid in enumerate(candidates.ids)}
+        self._team_rows = {tid: i for i, tid in enumerate(teams.ids)}
+
+    @classmethod
+    def from_profiles(
+        cls,
+        candidates: List[CandidateProfile],
+        teams: List[TeamProfile],
+        skill_index: Optional[SkillIndex] = None
+    ) -> "FitRecommender":
+        return cls(*pack_profiles(candidates, teams, skill_index))
+
+    def recommend_teams(
+        self,
+        candidate_id: str,
+        k: int = 10,
+        mode: PreferenceMode = PreferenceMode.STABILITY
+    ) -> List[Recommendation]:
+        """候補者に対するFitスコア上位K件のチーム"""
+        row = self._candidate_rows[candidate_id]
+        team_rows = self.index.eligible_teams(self.candidates.skill_vector(row))
+        if len(team_rows) == 0:
+            return []
+
+        components = FitScoreEngine(mode).score_components(
+            self.candidates.take([row]), self.teams.take(team_rows)
+        )
+        return self._top_k(
+            [self.teams.ids[t] for t in team_rows],
+            components.combine(PREFERENCE_WEIGHTS[mode])[0],
+            components.skill_match[0],
+            components.retention[0],
+            components.friction[0],
+            k
+        )
+
+    def recommend_candidates(
+        self,
+        team_id: str,
+        k: int = 10,
+        mode: PreferenceMode = PreferenceMode.STABILITY
+    ) -> List[Recommendation]:
+        """チームに対するFitスコア上位K件の候補者"""
+        col = self._team_rows[team_id]
+        candidate_rows = self.index.eligible_candidates(self.teams.requirement_vector(col))
+        if len(candidate_rows) == 0:
+            return []
+
+        components = FitScoreEngine(mode).score_components(
+            self.candidates.take(candidate_rows), self.teams.take([col])
+        )
+        return self._top_k(
+            [self.candidates.ids[c] for c in candidate_rows],
+            components.combine(PREFERENCE_WEIGHTS[mode])[:, 0],
+            components.skill_match[:, 0],
+            components.retention[:, 0],
+            components.friction[:, 0],
+            k
+        )
+
+    @staticmethod
+    def _top_k(
+        ids: List[str],
+        total: np.ndarray,
+        skill_match: np.ndarray,
+        retention: np.ndarray,
+        friction: np.ndarray,
+        k: int
+    ) -> List[Recommendation]:
+        """サイズKのヒープで上位を抽出（同点は元の並び順を優先）"""
+        best = heapq.nlargest(k, range(len(ids)), key=lambda i: (total[i], -i))
+        return [
+            Recommendation(
+                id=ids[i],
+                total_score=float(total[i]),
+                skill_match_score=round_score(float(skill_match[i])),
+                retention_score=round_score(float(retention[i])),
+                friction_score=round_score(float(friction[i]))
+            )
+            for i in best
+        ]
@@ -0,0 +1,257 @@
+"""
+Takei-prime 職種・レベル別パーティションインデックス
+
+候補者の target_role / レベルと、チームの recruiting_positions（職種・レベル・
+枠数）を (職種, レベル) ごとのパーティションに分け、適合する
+（候補者, 募集チーム）の組だけを Fit 計算の対象にする。
+
+- 募集の開始・終了、候補者の追加・削除は該当パーティションの辞書を
+  更新するだけ（O(1)）で、全体の再分割は不要
+- score_partitioned はパーティションごとに 候補者×チーム の小行列を
+  一括計算する（全候補者×全チームの行列は作らない）
+
+職種が None の募集・候補者は全職種に適合する（batch_assignment と同じ扱い）。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .fit_score_calculator import (
+    CandidateBatch,
+    FitScoreEngine,
+    PreferenceMode,
+    TeamBatch,
+)
+
+LEVELS = ("junior", "mid", "senior", "lead")
+LEVEL_RANK = {level: rank for rank, level in enumerate(LEVELS)}
+
+# 経験年数からレベルを推定する閾値（未満なら該当レベル）
+EXPERIENCE_LEVELS = ((3.0, "junior"), (7.0, "mid"), (12.0, "senior"))
+
+PartitionKey = Tuple[Optional[str], Optional[str]]  # (職種, レベル)
+
+
+def candidate_level(record: Dict) -> Optional[str]:
+    """
+    候補者・従業員のレベル
+
+    level があればそれを、なければ years_of_experience（従業員は tenure）から推定する。
+    """
+    level = record.get("level")
+    if level is not None:
+        return level
+    years = record.get("years_of_experience", record.get("tenure"))
+    if years is None:
+        return None
+    for limit, name in EXPERIENCE_LEVELS:
+        if years < limit:
+            return name
+    return "lead"
+
+
+@dataclass
+class PartitionScores:
+    """1パーティション分のFitスコア"""
+    role: Optional[str]
+    level: Optional[str]
+    candidate_ids: List[str]
+    team_ids: List[str]
+    total: np.ndarray  # (候補者数, チーム数)
+
+
+class RoleIndex:
+    """
+    (職種, レベル) パーティションによる候補者・募集の索引
+
+    level_tolerance=1 とすると隣接レベル（mid 候補者に junior / senior の募集）
+    も適合とする。
+    """
+
+    def __init__(self, level_tolerance: int = 0):
+        self.level_tolerance = level_tolerance
+        # パーティション → {チームID: 枠数}
+        self._positions: Dict[PartitionKey, Dict[str, int]] = {}
+        # パーティション → 候補者ID集合
+        self._candidates: Dict[PartitionKey, Set[str]] = {}
+        self._candidate_keys: Dict[str, PartitionKey] = {}
+
+    @classmethod
+    def from_records(
+        cls,
+        candidate_records: Iterable[Dict],
+        team_records: Iterable[Dict],
+        level_tolerance: int = 0
+    ) -> "RoleIndex":
+        """candidates.json / teams.json のレコードから作成（募集中の枠のみ）"""
+        index = cls(level_tolerance)
+        for team in team_records:
+            for position in team.get("recruiting_positions", []):
+                if position.get("status", "open") == "open":
+                    index.open_position(
+                        team["id"], position.get("role"), position.get("level"), position.get("count", 1)
+                    )
+        for record in candidate_records:
+            index.add_candidate(record["id"], record.get("target_role"), candidate_level(record))
+        return index
+
+    # ------------------------------------------------------------------
+    # 更新（O(1)）
+    # ------------------------------------------------------------------
+
+    def open_position(self, team_id: str, role: Optional[str], level: Optional[str], count: int = 1) -> None:
+        """募集枠を追加"""
+        self._check_level(level)
+        teams = self._positions.setdefault((role, level), {})
+        teams[team_id] = teams.get(team_id, 0) + count
+
+    def close_position(
+        self,
+        team_id: str,
+        role: Optional[str],
+        level: Optional[str],
+        count: Optional[int] = None
+    ) -> None:
+        """募集枠を減らす（count=None で該当枠を全て閉じる）"""
+        teams = self._positions.get((role, level), {})
+        if team_id not in teams:
+            raise KeyError(f"募集枠が見つかりません: {team_id} ({role}, {level})")
+        remaining = 0 if count is None else teams[team_id] - count
+        if remaining > 0:
+            teams[team_id] = remaining
+            return
+        del teams[team_id]
+        if not teams:
+            del self._positions[(role, level)]
+
+    def add_candidate(self, candidate_id: str, role: Optional[str], level: Optional[str]) -> None:
+        if candidate_id in self._candidate_keys:
+            raise ValueError(f"候補者は登録済みです: {candidate_id}")
+        self._check_level(level)
+        key = (role, level)
+        self._candidates.setdefault(key, set()).add(candidate_id)
+        self._candidate_keys[candidate_id] = key
+
+    def remove_candidate(self, candidate_id: str) -> None:
+        key = self._candidate_key(candidate_id)
+        members = self._candidates[key]
+        members.discard(candidate_id)
+        if not members:
+            del self._candidates[key]
+        del self._candidate_keys[candidate_id]
+
+    def update_candidate(self, candidate_id: str, role: Optional[str], level: Optional[str]) -> None:
+        self.remove_candidate(candidate_id)
+        self.add_candidate(candidate_id, role, level)
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    @property
+    def partitions(self) -> List[PartitionKey]:
+        """募集中の枠があるパーティション"""
+        return list(self._positions)
+
+    def capacity(self, team_id: str, role: Optional[str], level: Optional[str]) -> int:
+        return self._positions.get((role, level), {}).get(team_id, 0)
+
+    def teams_for(self, candidate_id: str) -> List[str]:
+        """候補者に適合する募集のあるチーム（重複なし、登録順）"""
+        key = self._candidate_key(candidate_id)
+        teams: Dict[str, None] = {}
+        for position_key, positions in self._positions.items():
+            if self._compatible(key, position_key):
+                teams.update(dict.fromkeys(positions))
+        return list(teams)
+
+    def candidates_for(self, team_id: str) -> List[str]:
+        """チームの募集に適合する候補者（重複なし、ID順）"""
+        position_keys = [key for key, positions in self._positions.items() if team_id in positions]
+        return sorted({
+            candidate_id
+            for candidate_key, members in self._candidates.items()
+            if any(self._compatible(candidate_key, key) for key in position_keys)
+            for candidate_id in members
+        })
+
+    def partition_members(self, role: Optional[str], level: Optional[str]) -> Tuple[List[str], List[str]]:
+        """募集パーティションに適合する (候補者ID, チームID)（いずれもID順）"""
+        key = (role, level)
+        candidates = sorted(
+            candidate_id
+            for candidate_key, members in self._candidates.items()
+            if self._compatible(candidate_key, key)
+            for candidate_id in members
+        )
+        return candidates, sorted(self._positions.get(key, {}))
+
+    def pair_mask(self, candidate_ids: List[str], team_ids: List[str]) -> np.ndarray:
+        """(候補者数, チーム数) の適合マスク（Recommender・一括配置の allowed 等に使う）"""
+        rows = {cid: i for i, cid in enumerate(candidate_ids)}
+        cols = {tid: j for j, tid in enumerate(team_ids)}
+        mask = np.zeros((len(candidate_ids), len(team_ids)), dtype=bool)
+        for key in self._positions:
+            candidates, teams = self.partition_members(*key)
+            r = [rows[c] for c in candidates if c in rows]
+            c = [cols[t] for t in teams if t in cols]
+            if r and c:
+                mask[np.ix_(r, c)] = True
+        return mask
+
+    def pair_count(self) -> int:
+        """適合する（候補者, チーム）の組の数"""
+        return sum(len(self.teams_for(candidate_id)) for candidate_id in self._candidate_keys)
+
+    def _compatible(self, candidate_key: PartitionKey, position_key: PartitionKey) -> bool:
+        candidate_role, candidate_level_ = candidate_key
+        role, level = position_key
+        if role is not None and candidate_role is not None and role != candidate_role:
+            return False
+        if level is None or candidate_level_ is None:
+            return True
+        return abs(LEVEL_RANK[level] - LEVEL_RANK[candidate_level_]) <= self.level_tolerance
+
+    def _candidate_key(self, candidate_id: str) -> PartitionKey:
+        try:
+            return self._candidate_keys[candidate_id]
+        except KeyError:
+            raise KeyError(f"候補者が見つかりません: {candidate_id}") from None
+
+    @staticmethod
+    def _check_level(level: Optional[str]) -> None:
+        if level is not None and level not in LEVEL_RANK:
+            raise ValueError(f"不明なレベルです: {level}（{', '.join(LEVELS)} のいずれか）")
+
+
+def score_partitioned(
+    index: RoleIndex,
+    candidates: CandidateBatch,
+    teams: TeamBatch,
+    preference: PreferenceMode | Dict[str, float] = PreferenceMode.STABILITY
+) -> List[PartitionScores]:
+    """
+    パーティションごとに適合する 候補者×チーム だけをスコアリング
+
+    候補者・チームの配列表現は全体分を渡し、各パーティションの行・列を
+    take で取り出して計算する。索引にあって配列にないIDは無視する。
+    """
+    engine = FitScoreEngine(preference) if isinstance(preference, PreferenceMode) else FitScoreEngine(weights=preference)
+    candidate_rows = {cid: i for i, cid in enumerate(candidates.ids)}
+    team_cols = {tid: j for j, tid in enumerate(teams.ids)}
+
+    results = []
+    for role, level in index.partitions:
+        candidate_ids, team_ids = index.partition_members(role, level)
+        candidate_ids = [cid for cid in candidate_ids if cid in candidate_rows]
+        team_ids = [tid for tid in team_ids if tid in team_cols]
+        if not candidate_ids or not team_ids:
+            continue
+        total = engine.score_matrix(
+            candidates.take([candidate_rows[cid] for cid in candidate_ids]),
+            teams.take([team_cols[tid] for tid in team_ids])
+        )
+        results.append(PartitionScores(role, level, candidate_ids, team_ids, total))
+    return results
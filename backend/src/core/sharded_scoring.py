@@ -0,0 +1,261 @@
+"""
+Takei-prime 分散スコアリング（全社一括スコア計算用）
+
+全従業員×全チームの総合Fitスコアを、候補者側を行方向のシャードに分けて
+プロセスプールで並列計算する。
+
+- チーム側・候補者側の配列表現は共有メモリに1度だけ置き、ワーカーは
+  起動時に名前で参照する（タスクごとの pickle 転送なし）
+- 出力行列も共有メモリ上に事前確保し、各ワーカーは担当行へ直接書き込む
+- タスクとして渡すのは行範囲 (start, stop) のみ
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .fit_score_calculator import (
+    CandidateBatch,
+    FitComponents,
+    FitScoreEngine,
+    PreferenceMode,
+    SkillIndex,
+    TeamBatch,
+    resolve_weights,
+)
+
+# 共有メモリに置く配列表現のフィールド（ids / skill_index 以外）
+CANDIDATE_ARRAYS = (
+    "levels", "years", "personality", "personality_units",
+    "recent_move", "move_count", "handover_load", "manager_change",
+)
+TEAM_ARRAYS = (
+    "req_columns", "req_levels", "req_mandatory", "req_weights", "req_offsets",
+    "membership", "req_counts", "culture", "culture_units",
+    "workload_rate", "manager_similarity",
+)
+COMPONENT_ARRAYS = ("skill_match", "retention", "friction", "personality_similarity")
+
+# 1タスクあたりの候補者数
+DEFAULT_SHARD_SIZE = 4096
+
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedArrays:
+    """
+    numpy 配列を共有メモリに置き、他プロセスから名前で参照できるようにする
+
+    specs（キー → (共有メモリ名, 形状, dtype)）をワーカーに渡し、
+    ワーカー側は attach で同じ配列をコピーなしで参照する。
+    作成したプロセスが close() で解放する。
+    """
+
+    def __init__(self):
+        self.specs: Dict[str, ArraySpec] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        """配列を共有メモリにコピー"""
+        shared = self.empty(key, array.shape, array.dtype)
+        shared[...] = array
+        return shared
+
+    def empty(self, key: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """共有メモリ上に配列を確保（ゼロ初期化）"""
+        dtype = np.dtype(dtype)
+        nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        block = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._blocks.append(block)
+        self.specs[key] = (block.name, tuple(shape), dtype.str)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.fill(0)
+        return array
+
+    @staticmethod
+    def attach(specs: Dict[str, ArraySpec]) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+        """
+        specs の配列を参照（ワーカー側）
+
+        Returns:
+            (キー → 配列, 共有メモリブロック) ブロックは配列を使う間保持すること
+        """
+        arrays = {}
+        blocks = []
+        for key, (name, shape, dtype) in specs.items():
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        return arrays, blocks
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+        self.specs = {}
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def shard_ranges(n_rows: int, shard_size: int) -> List[Tuple[int, int]]:
+    """行数を shard_size ごとの (start, stop) に分割"""
+    return [(start, min(start + shard_size, n_rows)) for start in range(0, n_rows, shard_size)]
+
+
+def _score_into(
+    candidates: CandidateBatch,
+    teams: TeamBatch,
+    weights: Dict[str, float],
+    outputs: Dict[str, np.ndarray],
+    start: int,
+    stop: int
+) -> int:
+    """start:stop 行を計算して outputs の同じ行に書き込む"""
+    components = FitScoreEngine().score_components(_rows(candidates, start, stop), teams)
+    outputs["total"][start:stop] = components.combine(weights)
+    for key in COMPONENT_ARRAYS:
+        if key in outputs:
+            outputs[key][start:stop] = getattr(components, key)
+    return stop - start
+
+
+def _rows(candidates: CandidateBatch, start: int, stop: int) -> CandidateBatch:
+    """行範囲のビュー（配列コピーなし）"""
+    return CandidateBatch(
+        ids=candidates.ids[start:stop],
+        skill_index=candidates.skill_index,
+        **{key: getattr(candidates, key)[start:stop] for key in CANDIDATE_ARRAYS}
+    )
+
+
+# ----------------------------------------------------------------------
+# ワーカー側
+# ----------------------------------------------------------------------
+
+_worker_state: Dict = {}
+
+
+def _init_worker(
+    specs: Dict[str, ArraySpec],
+    team_ids: List[str],
+    skill_index: SkillIndex,
+    weights: Dict[str, float]
+) -> None:
+    """ワーカー起動時に共有メモリを参照し、配列表現を組み立てる"""
+    arrays, blocks = SharedArrays.attach(specs)
+    n_candidates = len(arrays["candidate.levels"])
+    _worker_state.update(
+        blocks=blocks,
+        weights=weights,
+        # 候補者IDは親プロセスで保持し、ワーカー側は行番号だけを使う
+        candidates=CandidateBatch(
+            ids=range(n_candidates),
+            skill_index=skill_index,
+            **{key: arrays[f"candidate.{key}"] for key in CANDIDATE_ARRAYS}
+        ),
+        teams=TeamBatch(
+            ids=team_ids,
+            skill_index=skill_index,
+            **{key: arrays[f"team.{key}"] for key in TEAM_ARRAYS}
+        ),
+        outputs={
+            key.split(".", 1)[1]: array for key, array in arrays.items() if key.startswith("out.")
+        }
+    )
+
+
+def _score_shard(shard: Tuple[int, int]) -> int:
+    state = _worker_state
+    return _score_into(state["candidates"], state["teams"], state["weights"], state["outputs"], *shard)
+
+
+# ----------------------------------------------------------------------
+# 親プロセス側
+# ----------------------------------------------------------------------
+
+def score_matrix_sharded(
+    candidates: CandidateBatch,
+    teams: TeamBatch,
+    preference: PreferenceMode | Dict[str, float] = PreferenceMode.STABILITY,
+    workers: Optional[int] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    with_components: bool = False,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray | Tuple[np.ndarray, FitComponents]:
+    """
+    全ペアの総合Fitスコアをプロセスプールで計算
+
+    FitScoreEngine.score_matrix と同じ値を返す。workers が1以下、
+    またはシャードが1つだけの場合はプロセスを起動せずに計算する。
+
+    Args:
+        candidates: 候補者の配列表現（teams と同じスキル索引）
+        teams: チームの配列表現
+        preference: Preferenceモードまたは α/β/γ 辞書
+        workers: プロセス数（既定は CPU 数）
+        shard_size: 1タスクあたりの候補者数
+        with_components: True の場合は構成スコア行列も返す
+        out: 結果を書き込む (候補者数, チーム数) float64 配列（np.memmap も可）
+
+    Returns:
+        総合スコア行列。with_components=True の場合は (総合スコア行列, FitComponents)
+    """
+    if candidates.skill_index is not teams.skill_index:
+        raise ValueError("候補者とチームは同じスキル索引で配列化してください")
+    weights = resolve_weights(preference)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    shape = (len(candidates), len(teams))
+    shards = shard_ranges(shape[0], shard_size)
+    output_keys = ("total",) + (COMPONENT_ARRAYS if with_components else ())
+
+    if workers <= 1 or len(shards) <= 1:
+        outputs = {key: np.zeros(shape, dtype=np.float64) for key in output_keys}
+        if out is not None:
+            outputs["total"] = out
+        for start, stop in shards:
+            _score_into(candidates, teams, weights, outputs, start, stop)
+        return _collect(outputs, with_components)
+
+    with SharedArrays() as shared:
+        for key in CANDIDATE_ARRAYS:
+            shared.put(f"candidate.{key}", getattr(candidates, key))
+        for key in TEAM_ARRAYS:
+            shared.put(f"team.{key}", getattr(teams, key))
+        outputs = {key: shared.empty(f"out.{key}", shape, np.float64) for key in output_keys}
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            initializer=_init_worker,
+            initargs=(shared.specs, teams.ids, teams.skill_index, weights)
+        ) as executor:
+            scored = sum(executor.map(_score_shard, shards))
+        if scored != shape[0]:
+            raise RuntimeError(f"計算済みの行数が一致しません: {scored} / {shape[0]}")
+
+        # 共有メモリは解放するため、呼び出し側の配列へ移してから返す
+        if out is not None:
+            out[...] = outputs["total"]
+        outputs = {
+            key: out if key == "total" and out is not None else np.array(array)
+            for key, array in outputs.items()
+        }
+        return _collect(outputs, with_components)
+
+
+def _collect(
+    outputs: Dict[str, np.ndarray],
+    with_components: bool
+) -> np.ndarray | Tuple[np.ndarray, FitComponents]:
+    total = outputs["total"]
+    if not with_components:
+        return total
+    return total, FitComponents(**{key: outputs[key] for key in COMPONENT_ARRAYS})
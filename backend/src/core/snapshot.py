@@ -0,0 +1,421 @@
+"""
+Takei-prime 列指向スナップショット
+
+candidates.json / employees.json / teams.json / skills_master.json を、
+スコア計算に使う項目だけの数値配列（.npy）と文字列表（manifest.json）に
+変換して保存し、memory-map で読み込む。起動のたびに JSON を解析して
+1件ずつオブジェクト化する代わりに、配列を直接参照して計算を始められる。
+
+ディレクトリ構成:
+
+    manifest.json                   形式バージョン・元ファイルのハッシュ・文字列表・配列一覧
+    data-XXXX/candidates/*.npy      候補者（スキルCSR・性格）
+    data-XXXX/employees/*.npy       従業員（同上）
+    data-XXXX/teams/*.npy           チーム（要求スキル・文化・稼働率）
+
+配列はコンパイルのたびに新しい data-XXXX ディレクトリへ書き、それを参照する
+manifest.json を最後に置き換える。既存の配列ファイルは上書きしないため、
+書き込み途中のスナップショットは読まれない。古い manifest を読んだ直後の
+読み手のため、直前の世代は次のコンパイルまで残す。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .columnar import PersonalityMatrix, SkillTable, build_candidate_batch
+from .fit_score_calculator import (
+    BIG_FIVE_DIMENSIONS,
+    CandidateBatch,
+    CandidateProfile,
+    PersonalityProfile,
+    Skill,
+    SkillIndex,
+    SkillMatchCalculator,
+    TeamBatch,
+    TeamProfile,
+    TeamRequirement,
+)
+from .personality_similarity import normalize_vectors
+
+SNAPSHOT_FORMAT = "takei-prime-snapshot"
+SNAPSHOT_VERSION = 2  # 2: 経験年数・性格を float64 で保存
+MANIFEST_FILE = "manifest.json"
+GENERATION_PREFIX = "data-"
+
+# セクション名 → (元ファイル, レコード配列のキー)
+SOURCE_FILES = {
+    "candidates": ("candidates.json", "candidates"),
+    "employees": ("employees.json", "employees"),
+    "teams": ("teams.json", "teams"),
+    "skills": ("skills_master.json", "skills"),
+}
+PEOPLE_SECTIONS = ("candidates", "employees")
+
+# 行ごとに文字列表のコードで保持する項目（欠損は -1）
+PEOPLE_STRING_FIELDS = ("team_id", "department", "target_role")
+TEAM_STRING_FIELDS = ("department",)
+
+
+class SnapshotError(Exception):
+    """スナップショットの形式・内容が不正"""
+
+
+# ----------------------------------------------------------------------
+# コンパイル
+# ----------------------------------------------------------------------
+
+def source_digests(data_dir: Path) -> Dict[str, str]:
+    """元JSONファイルの SHA-256"""
+    data_dir = Path(data_dir)
+    return {
+        filename: hashlib.sha256((data_dir / filename).read_bytes()).hexdigest()
+        for filename, _ in SOURCE_FILES.values()
+        if (data_dir / filename).exists()
+    }
+
+
+def compile_snapshot(data_dir: Path, output_dir: Path) -> Dict:
+    """
+    デモ/本番データのJSONをスナップショットに変換
+
+    employees.json など存在しないファイルのセクションは省略する。
+
+    Returns:
+        書き出した manifest
+    """
+    data_dir = Path(data_dir)
+    output_dir = Path(output_dir)
+    records = {}
+    for section, (filename, key) in SOURCE_FILES.items():
+        path = data_dir / filename
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                records[section] = json.load(f)[key]
+    if "skills" not in records:
+        raise FileNotFoundError(data_dir / SOURCE_FILES["skills"][0])
+
+    skill_index = SkillIndex.from_master(records["skills"]).extended(
+        [s["skill_id"] for section in PEOPLE_SECTIONS for r in records.get(section, []) for s in r["skills"]] +
+        [req["skill_id"] for t in records.get("teams", []) for req in t["requirements"]]
+    )
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = _manifest_generations(output_dir)
+    generation = Path(tempfile.mkdtemp(prefix=GENERATION_PREFIX, dir=output_dir))
+    os.chmod(generation, 0o755)
+    sections = {}
+    for section in PEOPLE_SECTIONS:
+        if section in records:
+            sections[section] = _write_people(
+                output_dir, f"{generation.name}/{section}", records[section], skill_index
+            )
+    if "teams" in records:
+        sections["teams"] = _write_teams(output_dir, f"{generation.name}/teams", records["teams"], skill_index)
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "sources": source_digests(data_dir),
+        "skill_ids": skill_index.skill_ids,
+        "sections": sections,
+    }
+    tmp = output_dir / (MANIFEST_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp, output_dir / MANIFEST_FILE)
+    _remove_generations(output_dir, keep=previous | {generation.name})
+    return manifest
+
+
+def _manifest_generations(output_dir: Path) -> Set[str]:
+    """現在の manifest が参照しているディレクトリ名（manifest がなければ空）"""
+    try:
+        with open(output_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    return {
+        entry["file"].split("/", 1)[0]
+        for info in manifest.get("sections", {}).values()
+        for entry in info.get("arrays", {}).values()
+    }
+
+
+def _remove_generations(output_dir: Path, keep: Set[str]) -> None:
+    """keep 以外の配列ディレクトリ（古い世代・中断したコンパイル）を削除"""
+    for child in output_dir.iterdir():
+        if child.name in keep or not child.is_dir():
+            continue
+        if child.name.startswith(GENERATION_PREFIX) or child.name in SOURCE_FILES:
+            shutil.rmtree(child, ignore_errors=True)
+
+
+def _write_people(root: Path, directory: str, records: List[Dict], skill_index: SkillIndex) -> Dict:
+    table = SkillTable.from_records(records, skill_index)
+    arrays = {
+        "skill_offsets": table.offsets,
+        "skill_columns": table.columns,
+        "skill_levels": table.levels,
+        "skill_years": table.years,
+        "personality": PersonalityMatrix.from_records(records).values,
+    }
+    strings = {}
+    for name in PEOPLE_STRING_FIELDS:
+        arrays[name], strings[name] = _encode_strings([r.get(name) for r in records])
+    return {
+        "count": len(records),
+        "ids": [r["id"] for r in records],
+        "names": [r.get("name") for r in records],
+        "strings": strings,
+        "arrays": _save_arrays(root, directory, arrays),
+    }
+
+
+def _write_teams(root: Path, directory: str, records: List[Dict], skill_index: SkillIndex) -> Dict:
+    requirements = [req for t in records for req in t["requirements"]]
+    arrays = {
+        "req_offsets": np.concatenate(
+            [[0], np.cumsum([len(t["requirements"]) for t in records])]
+        ).astype(np.int64),
+        "req_columns": np.array([skill_index.columns[r["skill_id"]] for r in requirements], dtype=np.int32),
+        "req_levels": np.array([r["required_level"] for r in requirements], dtype=np.int8),
+        "req_mandatory": np.array([r["is_mandatory"] for r in requirements], dtype=bool),
+        "req_priority": np.array([r["priority"] for r in requirements], dtype=np.int8),
+        "culture": np.array(
+            [[t["culture_profile"][dim] for dim in BIG_FIVE_DIMENSIONS] for t in records], dtype=np.float64
+        ).reshape(len(records), len(BIG_FIVE_DIMENSIONS)),
+        "workload_rate": np.array([t.get("workload_average", 70.0) for t in records], dtype=np.float64),
+        "manager_similarity": np.array(
+            [np.nan if t.get("manager_similarity") is None else t["manager_similarity"] for t in records],
+            dtype=np.float64
+        ),
+    }
+    strings = {}
+    for name in TEAM_STRING_FIELDS:
+        arrays[name], strings[name] = _encode_strings([t.get(name) for t in records])
+    return {
+        "count": len(records),
+        "ids": [t["id"] for t in records],
+        "names": [t.get("name") for t in records],
+        "strings": strings,
+        "arrays": _save_arrays(root, directory, arrays),
+    }
+
+
+def _encode_strings(values: List[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """文字列列を (コード配列 int32, 文字列表) に変換（None は -1）"""
+    table: Dict[str, int] = {}
+    codes = np.array(
+        [-1 if v is None else table.setdefault(v, len(table)) for v in values], dtype=np.int32
+    )
+    return codes, list(table)
+
+
+def _save_arrays(root: Path, directory: str, arrays: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+    """root/directory に配列を保存（manifest には root からの相対パスを記録）"""
+    (root / directory).mkdir(parents=True, exist_ok=True)
+    entries = {}
+    for name, array in arrays.items():
+        filename = f"{directory}/{name}.npy"
+        np.save(root / filename, np.ascontiguousarray(array))
+        entries[name] = {
+            "file": filename,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+    return entries
+
+
+# ----------------------------------------------------------------------
+# 読み込み
+# ----------------------------------------------------------------------
+
+class Snapshot:
+    """
+    memory-map したスナップショット
+
+    配列は読み取り専用の np.memmap で、実際のページ読み込みは参照時に行われる。
+    """
+
+    def __init__(self, path: Path, manifest: Dict, arrays: Dict[str, Dict[str, np.ndarray]]):
+        self.path = Path(path)
+        self.manifest = manifest
+        self.skill_index = SkillIndex(manifest["skill_ids"])
+        self._arrays = arrays
+
+    @classmethod
+    def open(cls, path: Path, mmap: bool = True) -> "Snapshot":
+        """スナップショットを開く（mmap=False の場合はメモリに読み込む）"""
+        path = Path(path)
+        with open(path / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise SnapshotError(f"スナップショットではありません: {path}")
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"未対応のスナップショット形式です: version {manifest.get('version')}"
+            )
+
+        arrays = {}
+        for section, info in manifest["sections"].items():
+            arrays[section] = {}
+            for name, entry in info["arrays"].items():
+                array = np.load(path / entry["file"], mmap_mode="r" if mmap else None)
+                if array.dtype.str != entry["dtype"] or list(array.shape) != entry["shape"]:
+                    raise SnapshotError(f"配列が manifest と一致しません: {entry['file']}")
+                arrays[section][name] = array
+        return cls(path, manifest, arrays)
+
+    def is_current(self, data_dir: Path) -> bool:
+        """元JSONから変更がないか（ハッシュで判定）"""
+        return self.manifest["sources"] == source_digests(data_dir)
+
+    @property
+    def sections(self) -> List[str]:
+        return list(self.manifest["sections"])
+
+    def ids(self, section: str) -> List[str]:
+        return self._section(section)["ids"]
+
+    def names(self, section: str) -> List[Optional[str]]:
+        return self._section(section)["names"]
+
+    def array(self, section: str, name: str) -> np.ndarray:
+        self._section(section)
+        return self._arrays[section][name]
+
+    def strings(self, section: str, name: str) -> Tuple[np.ndarray, List[str]]:
+        """文字列項目の (コード配列, 文字列表)。コード -1 は欠損"""
+        return self.array(section, name), self._section(section)["strings"][name]
+
+    def string_values(self, section: str, name: str) -> List[Optional[str]]:
+        """文字列項目を行ごとの値に展開"""
+        codes, table = self.strings(section, name)
+        return [None if code < 0 else table[code] for code in codes.tolist()]
+
+    # ------------------------------------------------------------------
+    # 候補者・従業員
+    # ------------------------------------------------------------------
+
+    def skill_table(self, section: str) -> SkillTable:
+        arrays = self._arrays[section]
+        return SkillTable(
+            self.skill_index,
+            offsets=arrays["skill_offsets"],
+            columns=arrays["skill_columns"],
+            levels=arrays["skill_levels"],
+            years=arrays["skill_years"]
+        )
+
+    def personality(self, section: str) -> PersonalityMatrix:
+        return PersonalityMatrix(self.array(section, "personality"))
+
+    def candidate_batch(self, section: str = "candidates") -> CandidateBatch:
+        """候補者・従業員の配列表現（スコア行列の計算用）"""
+        return build_candidate_batch(self.ids(section), self.skill_table(section), self.personality(section))
+
+    def candidate_profiles(self, section: str = "candidates") -> List[CandidateProfile]:
+        """単一ペアAPI用のプロファイル"""
+        table = self.skill_table(section)
+        personality = self.array(section, "personality").tolist()
+        offsets = table.offsets.tolist()
+        columns = table.columns.tolist()
+        levels = table.levels.tolist()
+        years = table.years.tolist()
+        skill_ids = self.skill_index.skill_ids
+        return [
+            CandidateProfile(
+                id=cid,
+                skills=[
+                    Skill(skill_ids[columns[k]], levels[k], years[k])
+                    for k in range(offsets[i], offsets[i + 1])
+                ],
+                personality=PersonalityProfile(*personality[i])
+            )
+            for i, cid in enumerate(self.ids(section))
+        ]
+
+    # ------------------------------------------------------------------
+    # チーム
+    # ------------------------------------------------------------------
+
+    def team_batch(self) -> TeamBatch:
+        """チームの配列表現（スコア行列の計算用）"""
+        arrays = self._arrays["teams"]
+        offsets = np.asarray(arrays["req_offsets"])
+        req_counts = np.diff(offsets)
+        n_teams = len(req_counts)
+        membership = np.zeros((int(offsets[-1]), n_teams), dtype=np.float64)
+        membership[np.arange(offsets[-1]), np.repeat(np.arange(n_teams), req_counts)] = 1.0
+        manager_similarity = np.asarray(arrays["manager_similarity"])
+        culture = np.asarray(arrays["culture"])
+
+        return TeamBatch(
+            ids=self.ids("teams"),
+            skill_index=self.skill_index,
+            req_columns=arrays["req_columns"],
+            req_levels=arrays["req_levels"],
+            req_mandatory=arrays["req_mandatory"],
+            req_weights=self._priority_weights(arrays["req_priority"]),
+            req_offsets=offsets,
+            membership=membership,
+            req_counts=req_counts,
+            culture=culture,
+            culture_units=normalize_vectors(culture),
+            workload_rate=arrays["workload_rate"],
+            manager_similarity=np.where(np.isnan(manager_similarity), 50.0, manager_similarity)
+        )
+
+    def team_profiles(self) -> List[TeamProfile]:
+        """単一ペアAPI用のプロファイル"""
+        arrays = self._arrays["teams"]
+        offsets = arrays["req_offsets"].tolist()
+        columns = arrays["req_columns"].tolist()
+        levels = arrays["req_levels"].tolist()
+        mandatory = arrays["req_mandatory"].tolist()
+        priority = arrays["req_priority"].tolist()
+        culture = arrays["culture"].tolist()
+        workload = arrays["workload_rate"].tolist()
+        manager_similarity = arrays["manager_similarity"].tolist()
+        skill_ids = self.skill_index.skill_ids
+        return [
+            TeamProfile(
+                id=tid,
+                requirements=[
+                    TeamRequirement(skill_ids[columns[k]], levels[k], mandatory[k], priority[k])
+                    for k in range(offsets[t], offsets[t + 1])
+                ],
+                culture=PersonalityProfile(*culture[t]),
+                workload_rate=workload[t],
+                manager_similarity=None if np.isnan(manager_similarity[t]) else manager_similarity[t]
+            )
+            for t, tid in enumerate(self.ids("teams"))
+        ]
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    def _section(self, section: str) -> Dict:
+        try:
+            return self.manifest["sections"][section]
+        except KeyError:
+            raise KeyError(f"スナップショットにセクションがありません: {section}") from None
+
+    @staticmethod
+    def _priority_weights(priority: np.ndarray) -> np.ndarray:
+        """優先度 → 重み（値の種類ごとに SkillMatchCalculator._get_priority_weight を適用）"""
+        values, inverse = np.unique(priority, return_inverse=True)
+        weights = np.array(
+            [SkillMatchCalculator._get_priority_weight(int(v)) for v in values], dtype=np.float64
+        )
+        return weights[inverse].reshape(len(priority))
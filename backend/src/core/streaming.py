@@ -0,0 +1,231 @@
+"""
+Takei-prime ストリーミング取り込み
+
+candidates.json / employees.json のような {"candidates": [...]} 形式の大きな
+JSONファイルを、配列の要素ごとに読み込んで配列表現に変換する。
+ファイル全体を json.load せず、一定件数ごとの CandidateBatch として
+スコア計算まで流すため、メモリ使用量は入力サイズによらずチャンク分に収まる。
+
+    teams = TeamBatch.from_profiles(team_profiles, skill_index)
+    for ids, scores in score_stream("employees.json", "employees", teams):
+        ...
+"""
+
+import json
+import re
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .fit_score_calculator import (
+    BIG_FIVE_DIMENSIONS,
+    CandidateBatch,
+    FitScoreEngine,
+    PreferenceMode,
+    SkillIndex,
+    TeamBatch,
+)
+from .personality_similarity import normalize_vectors
+
+# ファイルから一度に読む文字数
+READ_SIZE = 1 << 20
+
+# 1チャンクあたりの候補者数
+DEFAULT_CHUNK_SIZE = 4096
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# 値の後に続く区切り文字
+_DELIMITERS = frozenset(" \t\n\r,]}")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _JSONStream:
+    """テキストファイルを必要な分だけ読み足しながら JSON 値を順に取り出す"""
+
+    def __init__(self, f, read_size: int = READ_SIZE):
+        self._f = f
+        self._read_size = read_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """読み足す（消費済みの先頭は捨てる）。EOF なら False"""
+        if self._eof:
+            return False
+        chunk = self._f.read(self._read_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """空白を読み飛ばして次の1文字を返す（EOF は空文字）"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSONの形式が不正です: '{char}' が必要ですが '{found}' でした")
+        self._pos += 1
+
+    def value(self):
+        """次の JSON 値を1つ読み込む"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 数値はバッファの境界で途切れていても先頭部分（1.5e3 の 1.5 など）が
+            # 解析できてしまうため、区切り文字が続くまで読み足して再解析する
+            if _is_number(value) and not self._delimited(end) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _delimited(self, end: int) -> bool:
+        return end < len(self._buffer) and self._buffer[end] in _DELIMITERS
+
+
+def iter_records(path, key: str, read_size: int = READ_SIZE) -> Iterator[Dict]:
+    """
+    トップレベルのオブジェクトの key 配列を1要素ずつ返す
+
+    key より前にある値（metadata 等）は読み飛ばす。
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JSONStream(f, read_size)
+        stream.expect("{")
+        while stream.peek() != "}":
+            name = stream.value()
+            stream.expect(":")
+            if name != key:
+                stream.value()
+            else:
+                stream.expect("[")
+                while stream.peek() != "]":
+                    yield stream.value()
+                    if stream.peek() == ",":
+                        stream.expect(",")
+                return
+            if stream.peek() == ",":
+                stream.expect(",")
+    raise KeyError(f"{path} に '{key}' 配列がありません")
+
+
+class CandidateChunkBuilder:
+    """
+    レコードを1件ずつ CandidateBatch 用の配列に書き込む
+
+    スキル列は skill_index に固定し、索引にないスキルは無視する
+    （チームの要求にないスキルはスコアに影響しない）。
+    """
+
+    def __init__(self, skill_index: SkillIndex, capacity: int):
+        self.skill_index = skill_index
+        self.capacity = capacity
+        self._reset()
+
+    def _reset(self) -> None:
+        self.ids: List[str] = []
+        self._keys: List[int] = []       # 行 * スキル列数 + 列
+        self._levels: List[int] = []
+        self._years: List[float] = []
+        self._personality: List[List[float]] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def full(self) -> bool:
+        return len(self.ids) >= self.capacity
+
+    def add(self, record: Dict) -> None:
+        base = len(self.ids) * len(self.skill_index)
+        columns = self.skill_index.columns
+        for skill in record["skills"]:
+            col = columns.get(skill["skill_id"])
+            if col is None:
+                continue
+            self._keys.append(base + col)
+            # Skill.from_dict と同じく required_level キーも保有レベルとして扱う
+            self._levels.append(skill.get("proficiency_level", skill.get("required_level", 0)))
+            self._years.append(skill["years_of_experience"])
+        profile = record["personality_profile"]
+        self._personality.append([profile[dim] for dim in BIG_FIVE_DIMENSIONS])
+        self.ids.append(record["id"])
+
+    def build(self) -> CandidateBatch:
+        """これまでの行を CandidateBatch にして内容をリセット"""
+        n = len(self.ids)
+        levels = np.zeros((n, len(self.skill_index)), dtype=np.int8)
+        years = np.zeros((n, len(self.skill_index)), dtype=np.float64)
+        # 同一スキルが複数ある場合は先頭を採用（CandidateBatch.from_profiles と同じ）
+        keys, first = np.unique(np.array(self._keys, dtype=np.int64), return_index=True)
+        levels.flat[keys] = np.array(self._levels, dtype=np.int8)[first]
+        years.flat[keys] = np.array(self._years, dtype=np.float64)[first]
+        personality = np.array(self._personality, dtype=np.float64).reshape(n, len(BIG_FIVE_DIMENSIONS))
+
+        batch = CandidateBatch(
+            ids=self.ids,
+            skill_index=self.skill_index,
+            levels=levels,
+            years=years,
+            personality=personality,
+            personality_units=normalize_vectors(personality),
+            recent_move=np.zeros(n, dtype=bool),
+            move_count=np.zeros(n, dtype=np.int64),
+            handover_load=np.zeros(n, dtype=np.float64),
+            manager_change=np.zeros(n, dtype=bool)
+        )
+        self._reset()
+        return batch
+
+
+def iter_candidate_batches(
+    path,
+    key: str,
+    skill_index: SkillIndex,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[CandidateBatch]:
+    """JSONファイルの key 配列を chunk_size 件ずつの CandidateBatch として返す"""
+    builder = CandidateChunkBuilder(skill_index, chunk_size)
+    for record in iter_records(path, key):
+        builder.add(record)
+        if builder.full:
+            yield builder.build()
+    if len(builder):
+        yield builder.build()
+
+
+def score_stream(
+    path,
+    key: str,
+    teams: TeamBatch,
+    preference: PreferenceMode | Dict[str, float] = PreferenceMode.STABILITY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """
+    JSONファイルの候補者・従業員を chunk_size 件ずつ全チームとスコア計算
+
+    Yields:
+        (候補者IDリスト, (チャンク件数, チーム数) の総合スコア行列)
+    """
+    engine = FitScoreEngine()
+    for batch in iter_candidate_batches(path, key, teams.skill_index, chunk_size):
+        yield batch.ids, engine.score_components(batch, teams).combine(preference)
@@ -0,0 +1,331 @@
+"""
+Takei-prime 重み感度分析（α/β/γ スイープ）
+
+構成スコア行列（FitComponents、FitScoreIndex.components など）を使い、
+α/β/γ を単体（α + β + γ = 1）上で動かしたときのランキングの変化を調べる。
+FitScoreEngine で再スコアリングはせず、重みと構成スコアの線形結合だけで計算する。
+
+- sweep: 格子点・経路上の各点で行ごと（候補者ごとのチーム順位、または
+  チームごとの候補者順位）の上位K件を求め、基準点・直前の点から上位K件が
+  変わった行数を数える。直前の点の順位がそのまま成り立つ行は並べ替えない
+- thresholds: 重みの経路（折れ線）上で、上位K件が入れ替わる重み（しきい値）を
+  解析的に求める。総合スコアは線分上で t の1次式になるため、上位K件の境界に
+  ある2件の直線の交点が入れ替わり
+
+順位は丸め・クリップ前の総合スコア（α·S + β·R − γ·F）で比較する。
+0/100 のクリップや小数2桁の丸めで生じる同点は区別しない。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .fit_score_calculator import (
+    PREFERENCE_WEIGHTS,
+    FitComponents,
+    PreferenceMode,
+    resolve_weights,
+    round_score,
+)
+from .fit_score_index import FitScoreIndex
+
+WEIGHT_KEYS = ("alpha", "beta", "gamma")
+
+
+def weight_vector(preference: PreferenceMode | Dict[str, float] | Sequence[float]) -> np.ndarray:
+    """Preferenceモード・重み辞書・(α, β, γ) を (3,) 配列に変換"""
+    if isinstance(preference, (PreferenceMode, dict)):
+        weights = resolve_weights(preference)
+        return np.array([weights[key] for key in WEIGHT_KEYS], dtype=np.float64)
+    vector = np.asarray(preference, dtype=np.float64)
+    if vector.shape != (3,):
+        raise ValueError(f"重みは (α, β, γ) の3要素で指定してください: {vector.shape}")
+    return vector
+
+
+def simplex_grid(steps: int = 10) -> np.ndarray:
+    """α + β + γ = 1 の格子点 (P, 3)。刻みは 1 / steps"""
+    if steps < 1:
+        raise ValueError("steps は1以上にしてください")
+    points = [
+        (a / steps, b / steps, (steps - a - b) / steps)
+        for a in range(steps + 1)
+        for b in range(steps + 1 - a)
+    ]
+    return np.array(points, dtype=np.float64)
+
+
+def preset_path(
+    modes: Optional[Sequence[PreferenceMode]] = None,
+    points_per_segment: int = 50
+) -> np.ndarray:
+    """Preferenceプリセットを順に結ぶ折れ線上の点 (P, 3)（各プリセットを含む）"""
+    modes = list(PreferenceMode) if modes is None else list(modes)
+    presets = np.array([weight_vector(PREFERENCE_WEIGHTS[m]) for m in modes])
+    if len(presets) == 1:
+        return presets
+    t = np.linspace(0.0, 1.0, points_per_segment, endpoint=False)[:, None]
+    segments = [start + t * (end - start) for start, end in zip(presets[:-1], presets[1:])]
+    return np.vstack(segments + [presets[-1:]])
+
+
+@dataclass
+class RankFlip:
+    """上位K件の入れ替わり1件"""
+    row_id: str                 # 順位が変わる行（候補者またはチーム）
+    segment: int                # 経路の何番目の線分か
+    t: float                    # 線分上の位置（0: 始点、1: 終点）
+    weights: Dict[str, float]   # 入れ替わる点の α/β/γ
+    entering: str               # 上位K件に入るID
+    leaving: str                # 上位K件から外れるID
+
+
+@dataclass
+class SweepResult:
+    """スイープ結果"""
+    weights: np.ndarray              # (P, 3) α/β/γ
+    k: int
+    rows: int                        # 行数
+    changed_vs_reference: np.ndarray  # (P,) 基準点と上位K件（集合）が異なる行数
+    changed_vs_previous: np.ndarray   # (P,) 直前の点と上位K件（集合）が異なる行数
+    reordered_vs_reference: np.ndarray  # (P,) 基準点と上位K件の並びが異なる行数
+
+    @property
+    def stable_fraction(self) -> np.ndarray:
+        """(P,) 基準点と上位K件が同じ行の割合"""
+        return 1.0 - self.changed_vs_reference / max(1, self.rows)
+
+
+class WeightSweep:
+    """
+    構成スコア行列に対する重みスイープ
+
+    by="candidate" は候補者ごとにチームを順位付けし、by="team" は
+    チームごとに候補者を順位付けする。
+    """
+
+    def __init__(
+        self,
+        components: FitComponents,
+        candidate_ids: List[str],
+        team_ids: List[str],
+        by: str = "candidate"
+    ):
+        if by not in ("candidate", "team"):
+            raise ValueError(f"by は candidate または team を指定してください: {by}")
+        stacked = np.stack([components.skill_match, components.retention, -components.friction])
+        if by == "team":
+            stacked = stacked.transpose(0, 2, 1)
+            candidate_ids, team_ids = team_ids, candidate_ids
+        # (3, 行数, 列数)。総合スコア = weights @ stacked
+        self._stacked = np.ascontiguousarray(stacked, dtype=np.float64)
+        self.by = by
+        self.row_ids = list(candidate_ids)
+        self.col_ids = list(team_ids)
+
+    @classmethod
+    def from_index(cls, index: FitScoreIndex, by: str = "candidate") -> "WeightSweep":
+        """FitScoreIndex が保持する構成スコア行列から作成"""
+        return cls(index.components, index.candidate_ids, index.team_ids, by=by)
+
+    def scores(self, preference: PreferenceMode | Dict[str, float] | Sequence[float]) -> np.ndarray:
+        """(行数, 列数) クリップ・丸め前の総合スコア"""
+        return np.tensordot(weight_vector(preference), self._stacked, axes=1)
+
+    def ranking(
+        self,
+        row_id: str,
+        preference: PreferenceMode | Dict[str, float] | Sequence[float],
+        k: Optional[int] = None
+    ) -> List[tuple]:
+        """1行の順位 [(ID, 総合スコア)]（スコアは calculate_fit_score と同じく丸め・クリップ済み）"""
+        row = self.row_ids.index(row_id)
+        alpha, beta, gamma = weight_vector(preference)
+        skill_match, retention, negative_friction = self._stacked[:, row, :]
+        # FitComponents.combine と同じ演算順（行列積は丸め前の値が1ulp ずれることがある）
+        scores = alpha * skill_match + beta * retention + gamma * negative_friction
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(self.col_ids[c], float(round_score(np.clip(scores[c], 0, 100)))) for c in order]
+
+    # ------------------------------------------------------------------
+    # 格子・経路スイープ
+    # ------------------------------------------------------------------
+
+    def sweep(
+        self,
+        points: np.ndarray | Sequence,
+        k: int = 10,
+        reference: Optional[PreferenceMode | Dict[str, float] | Sequence[float]] = None
+    ) -> SweepResult:
+        """
+        各重み点での上位K件の変化を集計
+
+        Args:
+            points: (P, 3) の α/β/γ（simplex_grid / preset_path など）
+            k: 上位件数
+            reference: 比較の基準（既定は最初の点）
+        """
+        points = np.asarray([weight_vector(p) for p in points], dtype=np.float64)
+        n_rows, n_cols = self._stacked.shape[1:]
+        k = min(k, n_cols)
+        reference = weight_vector(reference) if reference is not None else points[0]
+        reference_top = self._top_k(reference, k)
+        reference_set = np.sort(reference_top, axis=1)
+
+        changed_ref = np.zeros(len(points), dtype=np.int64)
+        changed_prev = np.zeros(len(points), dtype=np.int64)
+        reordered_ref = np.zeros(len(points), dtype=np.int64)
+        top = None
+        for p, weights in enumerate(points):
+            if top is None:
+                top = self._top_k(weights, k)
+                differs = (np.sort(top, axis=1) != reference_set).any(axis=1)
+                reordered = (top != reference_top).any(axis=1)
+            else:
+                # 順位が変わった行だけ集計を更新する
+                previous = top
+                top, stale = self._update_top_k(weights, previous)
+                if len(stale):
+                    stale_sets = np.sort(top[stale], axis=1)
+                    changed_prev[p] = np.count_nonzero(
+                        (stale_sets != np.sort(previous[stale], axis=1)).any(axis=1)
+                    )
+                    differs[stale] = (stale_sets != reference_set[stale]).any(axis=1)
+                    reordered[stale] = (top[stale] != reference_top[stale]).any(axis=1)
+            changed_ref[p] = np.count_nonzero(differs)
+            reordered_ref[p] = np.count_nonzero(reordered)
+
+        return SweepResult(
+            weights=points,
+            k=k,
+            rows=n_rows,
+            changed_vs_reference=changed_ref,
+            changed_vs_previous=changed_prev,
+            reordered_vs_reference=reordered_ref
+        )
+
+    def _top_k(self, weights: np.ndarray, k: int) -> np.ndarray:
+        """(行数, k) 各行の上位k列（スコア降順、同点は列番号順）"""
+        scores = np.tensordot(weights, self._stacked, axes=1)
+        return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+    def _update_top_k(self, weights: np.ndarray, previous: np.ndarray) -> tuple:
+        """
+        直前の点の上位k列 previous から、この点の上位k列を求める
+
+        previous の順位がこの点でも成り立つ（上位k件のスコアが狭義の降順で、
+        k 番目以上のスコアの列がちょうど k 件）行は並べ替えを省き、成り立たない
+        行だけを並べ替える。近い点を順に処理する場合、並べ替える行はわずかになる。
+
+        Returns:
+            ((行数, k) 上位k列, 並べ替えた行の番号)
+        """
+        k = previous.shape[1]
+        scores = np.tensordot(weights, self._stacked, axes=1)  # (行数, 列数)
+        top_scores = np.take_along_axis(scores, previous, axis=1)
+        valid = (top_scores[:, :-1] > top_scores[:, 1:]).all(axis=1)
+        valid &= np.count_nonzero(scores >= top_scores[:, -1:], axis=1) == k
+        stale = np.flatnonzero(~valid)
+        if len(stale) == 0:
+            return previous, stale
+        top = previous.copy()
+        top[stale] = np.argsort(-scores[stale], axis=1, kind="stable")[:, :k]
+        return top, stale
+
+    # ------------------------------------------------------------------
+    # しきい値（解析解）
+    # ------------------------------------------------------------------
+
+    def thresholds(
+        self,
+        path: Sequence,
+        k: int = 1,
+        row_ids: Optional[Sequence[str]] = None
+    ) -> List[RankFlip]:
+        """
+        経路（重み点の列）上で上位K件が入れ替わる点を解析的に求める
+
+        隣り合う点を結ぶ線分ごとに、総合スコアの直線同士の交点のうち
+        上位K件の境界で起きるものを返す（線分番号・t の順）。経路の点
+        ちょうどで同点になる場合（t = 0, 1）は入れ替わりに含めない。
+
+        Args:
+            path: 2点以上の α/β/γ（preset_path(points_per_segment=1) でプリセット間）
+            k: 上位件数
+            row_ids: 対象の行（既定は全行）
+        """
+        path = np.asarray([weight_vector(p) for p in path], dtype=np.float64)
+        if len(path) < 2:
+            raise ValueError("経路は2点以上で指定してください")
+        rows = range(len(self.row_ids)) if row_ids is None else [self.row_ids.index(r) for r in row_ids]
+        flips: List[RankFlip] = []
+        for segment, (start, end) in enumerate(zip(path[:-1], path[1:])):
+            for row in rows:
+                values = self._stacked[:, row, :]
+                intercept = start @ values
+                slope = (end - start) @ values
+                for t, entering, leaving in _boundary_crossings(intercept, slope, k):
+                    weights = start + t * (end - start)
+                    flips.append(RankFlip(
+                        row_id=self.row_ids[row],
+                        segment=segment,
+                        t=t,
+                        weights=dict(zip(WEIGHT_KEYS, weights.tolist())),
+                        entering=self.col_ids[entering],
+                        leaving=self.col_ids[leaving]
+                    ))
+        flips.sort(key=lambda f: (f.segment, f.t))
+        return flips
+
+
+def _boundary_crossings(intercept: np.ndarray, slope: np.ndarray, k: int) -> List[tuple]:
+    """
+    直線 intercept + t·slope（t ∈ (0, 1)）の上位k件の入れ替わり [(t, 入る列, 外れる列)]
+
+    線分上で一度も上位k件に入り得ない列（最大値が k 番目の最小値未満）を除外し、
+    残りの全ペアの交点のうち境界付近（交点より上が k-1 件以下で、交点の高さ
+    以上が k 件以上）のものを候補とする。3本以上が1点で交わる場合や同一直線が
+    あっても誤検出しないよう、候補の前後（隣り合う候補の中点）の上位k件を
+    比べて実際に変わった点だけを返す（同点は列番号順）。
+    """
+    n = len(intercept)
+    if k >= n:
+        return []
+    end = intercept + slope
+    low, high = np.minimum(intercept, end), np.maximum(intercept, end)
+    kth_low = np.partition(low, n - k)[n - k]
+    cols = np.flatnonzero(high >= kth_low)
+    a, b = intercept[cols], slope[cols]
+
+    i, j = np.triu_indices(len(cols), k=1)
+    db = b[i] - b[j]
+    moving = np.abs(db) > 1e-12 * max(1.0, float(np.abs(b).max()))
+    i, j, db = i[moving], j[moving], db[moving]
+    t = (a[j] - a[i]) / db
+    inside = (t > 1e-9) & (t < 1 - 1e-9)
+    i, t = i[inside], t[inside]
+    if len(t) == 0:
+        return []
+
+    level = a[i] + t * b[i]
+    heights = a[None, :] + t[:, None] * b[None, :]
+    tolerance = (1e-9 * np.maximum(1.0, np.abs(level)))[:, None]
+    above = np.count_nonzero(heights > level[:, None] + tolerance, axis=1)
+    at_least = np.count_nonzero(heights >= level[:, None] - tolerance, axis=1)
+    events = np.unique(t[(above <= k - 1) & (at_least >= k)])
+    if len(events) == 0:
+        return []
+
+    # 各候補の前後で上位k件（集合）を比べる
+    probes = np.concatenate([[0.0], events, [1.0]])
+    probes = (probes[:-1] + probes[1:]) / 2
+    scores = a[None, :] + probes[:, None] * b[None, :]
+    order = np.lexsort((np.broadcast_to(np.arange(len(cols)), scores.shape), -scores), axis=1)
+    tops = [set(row[:k].tolist()) for row in order]
+
+    result = []
+    for event, before, after in zip(events, tops[:-1], tops[1:]):
+        for entering, leaving in zip(sorted(after - before), sorted(before - after)):
+            result.append((float(event), int(cols[entering]), int(cols[leaving])))
+    return result
@@ -0,0 +1,257 @@
+"""
+Takei-prime 一括配置ソルバー
+
+複数候補者を募集ポジション（recruiting_positions）の枠数を上限として配置し、
+Fitスコアの合計を最大化する。フロントエンドの simulateBatchAssignment
+（貪欲法）をバックエンドで置き換えるためのもの。
+
+枠を展開した矩形割当問題をハンガリアン法で解く。候補者・枠の少ない側に
+「未配置」列（Fit 0）を用意するため、枠不足や職種不一致があっても解が存在する。
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..core.fit_score_calculator import (
+    CandidateProfile,
+    FitScoreEngine,
+    PreferenceMode,
+    SkillIndex,
+    TeamProfile,
+    pack_profiles,
+)
+
+
+@dataclass
+class PositionSlot:
+    """配置先の枠グループ（チーム×職種）"""
+    team_id: str
+    role: Optional[str]
+    capacity: int
+
+
+@dataclass
+class Assignment:
+    """配置1件"""
+    candidate_id: str
+    team_id: str
+    role: Optional[str]
+    fit_score: float
+
+
+@dataclass
+class BatchAssignmentResult:
+    """一括配置結果"""
+    assignments: List[Assignment] = field(default_factory=list)
+    unassigned: List[str] = field(default_factory=list)
+
+    @property
+    def total_fit(self) -> float:
+        return round(sum(a.fit_score for a in self.assignments), 2)
+
+    @property
+    def average_fit(self) -> float:
+        if not self.assignments:
+            return 0.0
+        return round(self.total_fit / len(self.assignments), 2)
+
+
+def open_position_slots(team_records: List[Dict]) -> List[PositionSlot]:
+    """teams.json の recruiting_positions から募集中の枠を集計（チーム×職種単位）"""
+    slots: Dict[tuple, PositionSlot] = {}
+    for team in team_records:
+        for position in team.get("recruiting_positions", []):
+            if position.get("status", "open") != "open":
+                continue
+            key = (team["id"], position.get("role"))
+            if key not in slots:
+                slots[key] = PositionSlot(team["id"], position.get("role"), 0)
+            slots[key].capacity += position.get("count", 1)
+    return list(slots.values())
+
+
+def solve_assignment(
+    fit: np.ndarray,
+    capacities: np.ndarray,
+    allowed: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    枠数制約付きの最適割当（Fit合計最大）
+
+    Args:
+        fit: (候補者数, 枠グループ数) のFitスコア行列
+        capacities: (枠グループ数,) 各グループの枠数
+        allowed: (候補者数, 枠グループ数) 配置可否。None は全て可
+
+    Returns:
+        (候補者数,) 各候補者の枠グループ番号。未配置は -1
+    """
+    n_candidates, n_groups = fit.shape
+    capacities = np.asarray(capacities, dtype=np.int64)
+    if allowed is None:
+        allowed = np.ones(fit.shape, dtype=bool)
+
+    # 枠を展開し、禁止ペアは未配置より不利なコストにする
+    slot_groups = np.repeat(np.arange(n_groups), capacities)
+    n_slots = len(slot_groups)
+    forbidden_cost = float(np.abs(fit).max(initial=0.0)) * 2 + 1.0
+    cost = np.where(allowed[:, slot_groups], -fit[:, slot_groups], forbidden_cost)
+
+    # 少ない側を行にし、行ごとに未配置列（コスト0）を追加して常に解を持たせる
+    slot_of_candidate = np.full(n_candidates, -1, dtype=np.int64)
+    if n_candidates <= n_slots:
+        cols = _hungarian(np.hstack([cost, np.zeros((n_candidates, n_candidates))]))
+        assigned = cols < n_slots
+        slot_of_candidate[assigned] = cols[assigned]
+    else:
+        cols = _hungarian(np.hstack([cost.T, np.zeros((n_slots, n_slots))]))
+        assigned = cols < n_candidates
+        slot_of_candidate[cols[assigned]] = np.flatnonzero(assigned)
+
+    result = np.full(n_candidates, -1, dtype=np.int64)
+    for row, slot in enumerate(slot_of_candidate):
+        if slot >= 0 and allowed[row, slot_groups[slot]]:
+            result[row] = slot_groups[slot]
+    return result
+
+
+def greedy_assignment(
+    fit: np.ndarray,
+    capacities: np.ndarray,
+    allowed: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    貪欲法による割当（simulateBatchAssignment 相当のベースライン）
+
+    候補者を順に、空き枠のあるグループのうち最高Fitのものへ配置する。
+    """
+    remaining = np.array(capacities, dtype=np.int64)
+    if allowed is None:
+        allowed = np.ones(fit.shape, dtype=bool)
+
+    result = np.full(fit.shape[0], -1, dtype=np.int64)
+    for row in range(fit.shape[0]):
+        open_groups = allowed[row] & (remaining > 0)
+        if not open_groups.any():
+            continue
+        group = int(np.argmax(np.where(open_groups, fit[row], -np.inf)))
+        result[row] = group
+        remaining[group] -= 1
+    return result
+
+
+def assign_candidates(
+    candidate_records: List[Dict],
+    team_records: List[Dict],
+    mode: PreferenceMode = PreferenceMode.STABILITY,
+    method: str = "optimal",
+    match_roles: bool = True,
+    skill_index: Optional[SkillIndex] = None
+) -> BatchAssignmentResult:
+    """
+    候補者を募集ポジションへ一括配置
+
+    Args:
+        candidate_records: candidates.json の候補者レコード
+        team_records: teams.json のチームレコード（recruiting_positions を使用）
+        method: "optimal"（ハンガリアン法）または "greedy"
+        match_roles: 候補者の target_role と募集職種が一致する枠のみに配置する
+    """
+    slots = open_position_slots(team_records)
+    team_by_id = {t["id"]: t for t in team_records}
+    slot_teams = [TeamProfile.from_dict(team_by_id[slot.team_id]) for slot in slots]
+    candidates = [CandidateProfile.from_dict(c) for c in candidate_records]
+
+    fit = FitScoreEngine(mode).score_matrix(*pack_profiles(candidates, slot_teams, skill_index))
+
+    allowed = np.ones(fit.shape, dtype=bool)
+    if match_roles:
+        for row, record in enumerate(candidate_records):
+            target_role = record.get("target_role")
+            if target_role is None:
+                continue
+            allowed[row] = [slot.role in (None, target_role) for slot in slots]
+
+    capacities = np.array([slot.capacity for slot in slots], dtype=np.int64)
+    if method == "optimal":
+        groups = solve_assignment(fit, capacities, allowed)
+    elif method == "greedy":
+        groups = greedy_assignment(fit, capacities, allowed)
+    else:
+        raise ValueError(f"未対応の割当方式です: {method}")
+
+    result = BatchAssignmentResult()
+    for row, group in enumerate(groups):
+        if group < 0:
+            result.unassigned.append(candidates[row].id)
+            continue
+        result.assignments.append(Assignment(
+            candidate_id=candidates[row].id,
+            team_id=slots[group].team_id,
+            role=slots[group].role,
+            fit_score=float(fit[row, group])
+        ))
+    return result
+
+
+def _hungarian(cost: np.ndarray) -> np.ndarray:
+    """
+    矩形ハンガリアン法（行数 <= 列数、コスト最小化）
+
+    ポテンシャル付き最短増加路を行ごとに探索する O(n^2·m) 実装。
+    列方向の更新は NumPy でまとめて行う。
+
+    Returns:
+        (行数,) 各行に割り当てた列番号
+    """
+    n_rows, n_cols = cost.shape
+    if n_rows > n_cols:
+        raise ValueError("行数は列数以下である必要があります")
+
+    # 1始まりの添字（0番は番兵）
+    u = np.zeros(n_rows + 1)
+    v = np.zeros(n_cols + 1)
+    row_of_col = np.zeros(n_cols + 1, dtype=np.int64)
+    way = np.zeros(n_cols + 1, dtype=np.int64)
+
+    for row in range(1, n_rows + 1):
+        row_of_col[0] = row
+        col0 = 0
+        min_reduced = np.full(n_cols + 1, np.inf)
+        used = np.zeros(n_cols + 1, dtype=bool)
+
+        while True:
+            used[col0] = True
+            row0 = row_of_col[col0]
+            free = ~used
+            free[0] = False
+
+            reduced = cost[row0 - 1] - u[row0] - v[1:]
+            improve = free[1:] & (reduced < min_reduced[1:])
+            min_reduced[1:][improve] = reduced[improve]
+            way[1:][improve] = col0
+
+            candidates = np.where(free, min_reduced, np.inf)
+            col1 = int(np.argmin(candidates))
+            delta = candidates[col1]
+
+            u[row_of_col[used]] += delta
+            v[used] -= delta
+            min_reduced[free] -= delta
+
+            col0 = col1
+            if row_of_col[col0] == 0:
+                break
+
+        while col0:
+            col1 = way[col0]
+            row_of_col[col0] = row_of_col[col1]
+            col0 = col1
+
+    col_of_row = np.zeros(n_rows, dtype=np.int64)
+    for col in range(1, n_cols + 1):
+        if row_of_col[col]:
+            col_of_row[row_of_col[col] - 1] = col - 1
+    return col_of_row
@@ -0,0 +1,330 @@
+"""
+Takei-prime シナリオ評価エンジン
+
+複数の異動案（(従業員, 異動元, 異動先) の組）を、共通の基準組織に対する
+差分として評価し、組織全体・部署別・チーム別の Fit の変化を比較できる形で返す。
+フロントエンドの calculateOrganizationImpact（案ごとにブラウザで計算、
+部署別はダミー値）を置き換えるためのもの。
+
+- 基準組織（OrganizationFit: 従業員×チームの SkillMatch、チーム文化の集計、
+  各従業員の現在のFit、チーム・部署別の合計）は1回だけ作成し、変更しない
+- 各案は基準組織への差分（異動者の所属と、異動元・異動先チームの文化・稼働率）
+  として評価する。再計算するのは影響チームのメンバーのみで、組織全体は複製しない
+- evaluate_plans は既定では逐次評価する（案1件は1ms未満で、プロセス起動の方が
+  高くつく）。workers を指定し、案が PARALLEL_MIN_PLANS 件以上の場合だけ
+  プロセスプールで並列評価する。プールは close() まで使い回す。fork が使える
+  環境ではワーカーは fork で基準組織を引き継ぐため、案ごとに送受信するのは
+  異動リストと結果だけ
+"""
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..core.fit_score_calculator import (
+    CandidateProfile,
+    PreferenceMode,
+    TeamProfile,
+    pack_profiles,
+)
+from .team_simulation import TeamCompositionState
+from .transfer_search import OrganizationFit
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data" / "demo"
+
+# これより少ない案はプロセスプールを使わない（1件0.5ms程度のため、起動と送受信の方が高くつく）
+PARALLEL_MIN_PLANS = 1024
+
+
+@dataclass
+class PlannedMove:
+    """異動案の異動1件"""
+    employee_id: str
+    from_team: str
+    to_team: str
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PlannedMove":
+        return cls(data["employee_id"], data["from_team"], data["to_team"])
+
+
+@dataclass
+class ScenarioPlan:
+    """異動案（異動は記載順に実施する。同じ従業員の複数回の異動も可）"""
+    name: str
+    moves: List[PlannedMove]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScenarioPlan":
+        return cls(data["name"], [PlannedMove.from_dict(m) for m in data.get("moves", [])])
+
+
+@dataclass
+class TeamImpact:
+    """チーム別の影響"""
+    team_id: str
+    department: Optional[str]
+    headcount_before: int
+    headcount_after: int
+    fit_before: float   # メンバーの平均Fit
+    fit_after: float
+
+
+@dataclass
+class DepartmentImpact:
+    """部署別の影響"""
+    department: Optional[str]
+    headcount_before: int
+    headcount_after: int
+    fit_before: float
+    fit_after: float
+
+
+@dataclass
+class ScenarioImpact:
+    """異動案の評価結果"""
+    name: str
+    moved: int = 0                       # 最終的に所属が変わった人数
+    overall_fit_before: float = 0.0      # 全従業員の平均Fit
+    overall_fit_after: float = 0.0
+    fit_improvement: float = 0.0
+    total_fit_delta: float = 0.0         # 全従業員のFit合計の変化
+    departments_affected: List[DepartmentImpact] = field(default_factory=list)
+    teams_affected: List[TeamImpact] = field(default_factory=list)
+    error: Optional[str] = None          # 案が不正な場合の理由（他の値は未設定）
+
+
+def _mean(total: float, count: int) -> float:
+    return round(total / count, 2) if count else 0.0
+
+
+class ScenarioEngine:
+    """基準組織に対する異動案の評価"""
+
+    def __init__(self, base: OrganizationFit, departments: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            base: 基準組織（評価では変更しない）
+            departments: チームID → 部署
+        """
+        self.base = base
+        departments = departments or {}
+        self._team_cols = {tid: col for col, tid in enumerate(base.team_ids)}
+        self._department_names = sorted({departments.get(tid) for tid in base.team_ids}, key=str)
+        dept_col = {name: i for i, name in enumerate(self._department_names)}
+        self._team_department = np.array(
+            [dept_col[departments.get(tid)] for tid in base.team_ids], dtype=np.int64
+        )
+
+        n_teams = len(base.team_ids)
+        assignment = base.assignment_cols
+        self._team_counts = np.bincount(assignment, minlength=n_teams)
+        self._team_totals = np.bincount(assignment, weights=base.fits, minlength=n_teams)
+        self._total = float(base.fits.sum())
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_workers = 0
+
+    @classmethod
+    def from_records(
+        cls,
+        employee_records: List[Dict],
+        team_records: List[Dict],
+        preference: PreferenceMode | Dict[str, float] = PreferenceMode.STABILITY,
+        scale_workload: bool = False
+    ) -> "ScenarioEngine":
+        """employees.json / teams.json のレコードから基準組織を作成"""
+        state = TeamCompositionState.from_records(employee_records, team_records)
+        team_ids = set(state.team_ids)
+        placed = [e for e in employee_records if e.get("team_id") in team_ids]
+        employees, teams = pack_profiles(
+            [CandidateProfile.from_dict(e) for e in placed],
+            [TeamProfile.from_dict(t) for t in team_records]
+        )
+        base = OrganizationFit(employees, teams, state, preference, scale_workload=scale_workload)
+        return cls(base, {t["id"]: t.get("department") for t in team_records})
+
+    @classmethod
+    def from_files(
+        cls,
+        data_dir: Path = DATA_DIR,
+        preference: PreferenceMode | Dict[str, float] = PreferenceMode.STABILITY,
+        scale_workload: bool = False
+    ) -> "ScenarioEngine":
+        with open(Path(data_dir) / "employees.json", "r", encoding="utf-8") as f:
+            employees = json.load(f)["employees"]
+        with open(Path(data_dir) / "teams.json", "r", encoding="utf-8") as f:
+            teams = json.load(f)["teams"]
+        return cls.from_records(employees, teams, preference, scale_workload)
+
+    # ------------------------------------------------------------------
+    # 評価
+    # ------------------------------------------------------------------
+
+    def evaluate(self, plan: ScenarioPlan) -> ScenarioImpact:
+        """
+        1案を評価（基準組織は変更しない）
+
+        Raises:
+            KeyError: 従業員・チームが存在しない
+            ValueError: 異動元が異動時点の所属と一致しない
+        """
+        base = self.base
+        n_employees = len(base.employees)
+        rows, cols, fits = base.evaluate(self._net_moves(plan))
+
+        # チーム別の合計を差分で更新（影響チームのみ）
+        before_cols = base.assignment_cols[rows]
+        touched = np.unique(np.concatenate([before_cols, cols]))
+        counts = self._team_counts.astype(np.float64).copy()
+        totals = self._team_totals.copy()
+        np.subtract.at(counts, before_cols, 1)
+        np.subtract.at(totals, before_cols, base.fits[rows])
+        np.add.at(counts, cols, 1)
+        np.add.at(totals, cols, fits)
+
+        total_after = self._total - float(base.fits[rows].sum()) + float(fits.sum())
+        impact = ScenarioImpact(
+            name=plan.name,
+            moved=int(np.count_nonzero(before_cols != cols)),
+            overall_fit_before=_mean(self._total, n_employees),
+            overall_fit_after=_mean(total_after, n_employees),
+            total_fit_delta=round(total_after - self._total, 2)
+        )
+        impact.fit_improvement = round(impact.overall_fit_after - impact.overall_fit_before, 2)
+
+        for col in touched:
+            impact.teams_affected.append(TeamImpact(
+                team_id=base.team_ids[col],
+                department=self._department_names[self._team_department[col]],
+                headcount_before=int(self._team_counts[col]),
+                headcount_after=int(counts[col]),
+                fit_before=_mean(self._team_totals[col], self._team_counts[col]),
+                fit_after=_mean(totals[col], int(counts[col]))
+            ))
+
+        # 部署別（影響チームを含む部署のみ）
+        departments = self._team_department
+        for dept in np.unique(departments[touched]):
+            in_dept = departments == dept
+            count_before = int(self._team_counts[in_dept].sum())
+            count_after = int(counts[in_dept].sum())
+            impact.departments_affected.append(DepartmentImpact(
+                department=self._department_names[dept],
+                headcount_before=count_before,
+                headcount_after=count_after,
+                fit_before=_mean(self._team_totals[in_dept].sum(), count_before),
+                fit_after=_mean(totals[in_dept].sum(), count_after)
+            ))
+        return impact
+
+    def evaluate_plans(
+        self,
+        plans: Sequence[ScenarioPlan],
+        workers: Optional[int] = None
+    ) -> List[ScenarioImpact]:
+        """
+        複数案を評価（結果は plans と同じ順）
+
+        不正な案は例外にせず error を設定した結果を返す。workers が2以上で、
+        案が PARALLEL_MIN_PLANS 件以上の場合だけプロセスプールで評価する
+        （それ以外はプロセスを起動せずに評価する）。
+        """
+        plans = list(plans)
+        if workers is None or workers <= 1 or len(plans) < PARALLEL_MIN_PLANS:
+            return [self._evaluate_safely(plan) for plan in plans]
+
+        executor = self._pool(workers)
+        return list(executor.map(_evaluate_plan, plans, chunksize=max(1, len(plans) // (workers * 4))))
+
+    def close(self) -> None:
+        """並列評価用のプロセスプールを終了"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_workers = 0
+
+    def __enter__(self) -> "ScenarioEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict:
+        # spawn でワーカーへ送る場合、プールは送らない
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["_executor_workers"] = 0
+        return state
+
+    @staticmethod
+    def rank(impacts: Sequence[ScenarioImpact]) -> List[ScenarioImpact]:
+        """有効な案を Fit 合計の改善が大きい順に並べる"""
+        return sorted((i for i in impacts if i.error is None), key=lambda i: -i.total_fit_delta)
+
+    def _pool(self, workers: int) -> ProcessPoolExecutor:
+        """workers 個のワーカーを持つプール（同じワーカー数なら前回のものを使い回す）"""
+        if self._executor is not None and self._executor_workers != workers:
+            self.close()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=_process_context(),
+                initializer=_init_worker,
+                initargs=(self,)
+            )
+            self._executor_workers = workers
+        return self._executor
+
+    def _evaluate_safely(self, plan: ScenarioPlan) -> ScenarioImpact:
+        try:
+            return self.evaluate(plan)
+        except (KeyError, ValueError) as e:
+            return ScenarioImpact(name=plan.name, error=str(e.args[0]) if e.args else str(e))
+
+    def _net_moves(self, plan: ScenarioPlan) -> List[tuple]:
+        """記載順の異動を実施した後の、所属が変わる従業員の (行, 異動先列)"""
+        base = self.base
+        current: Dict[int, int] = {}
+        for move in plan.moves:
+            row = base.row_of(move.employee_id)
+            team = current.get(row, base.assignment_cols[row])
+            if base.team_ids[team] != move.from_team:
+                raise ValueError(
+                    f"異動元が所属と一致しません: {move.employee_id} は {base.team_ids[team]} に所属"
+                    f"（指定: {move.from_team}）"
+                )
+            current[row] = self._team_col(move.to_team)
+        return [(row, col) for row, col in current.items() if col != base.assignment_cols[row]]
+
+    def _team_col(self, team_id: str) -> int:
+        try:
+            return self._team_cols[team_id]
+        except KeyError:
+            raise KeyError(f"チームが見つかりません: {team_id}") from None
+
+
+# ----------------------------------------------------------------------
+# ワーカー側
+# ----------------------------------------------------------------------
+
+_worker_engine: Dict = {}
+
+
+def _process_context():
+    """fork が使える環境では fork（基準組織を pickle せずにワーカーへ引き継ぐ）"""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def _init_worker(engine: ScenarioEngine) -> None:
+    _worker_engine["engine"] = engine
+
+
+def _evaluate_plan(plan: ScenarioPlan) -> ScenarioImpact:
+    return _worker_engine["engine"]._evaluate_safely(plan)
@@ -0,0 +1,385 @@
+"""
+Takei-prime スキルギャップ集計
+
+SkillMatchCalculator.calculate の breakdown（スキルごとの candidate_level と
+required_level）を組織全体でまとめて集計する。チームごと・スキル（レベル）ごとの
+メンバー人数（ヒストグラム）を保持し、ギャップ行列はすべてこの配列の縮約で求める。
+
+- チーム×スキル: 要求レベル、チーム内の最高レベル、要求レベル以上の人数、
+  不足レベル（要求レベル − チーム内最高レベル）、メンバーごとの不足レベルの合計
+- 部署別（organization_structure.json の hierarchy）、スキルのカテゴリ・
+  サブカテゴリ別（skills_master.json）は、行・列をグループ化する行列積で集計
+- メンバーの追加・削除・異動はヒストグラムの該当チーム行を更新するだけ
+  （O(スキル数)）で、従業員一覧を走査し直さない
+
+集計値はいずれも「要求のあるチーム×スキルの組」についての合計。
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.fit_score_calculator import (
+    CandidateProfile,
+    Skill,
+    SkillIndex,
+    TeamProfile,
+    build_skill_index,
+)
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data" / "demo"
+
+MAX_LEVEL = 5
+SKILL_GROUPINGS = ("skill", "category", "subcategory")
+TEAM_GROUPINGS = ("team", "department")
+
+
+@dataclass
+class GapMatrix:
+    """
+    ギャップ行列（行: チームまたは部署、列: スキル・カテゴリ・サブカテゴリ）
+
+    各値は要求のある（チーム, スキル）の組についての合計。
+    """
+    row_ids: List[Optional[str]]
+    col_ids: List[Optional[str]]
+    headcount: np.ndarray         # (行,) 人数
+    requiring: np.ndarray         # (行, 列) 要求のある組の数
+    short: np.ndarray             # (行, 列) 要求レベルに届くメンバーがいない組の数
+    shortfall: np.ndarray         # (行, 列) 不足レベル（要求 − チーム内最高）の合計
+    member_shortfall: np.ndarray  # (行, 列) メンバーごとの不足レベルの合計
+    meeting: np.ndarray           # (行, 列) 要求レベル以上のメンバー数
+    demand: np.ndarray            # (行, 列) 要求のあるチームの人数の合計
+
+    @property
+    def coverage(self) -> np.ndarray:
+        """(行, 列) 要求レベル以上のメンバーの割合（要求がない・人数0は NaN）"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.demand > 0, self.meeting / self.demand, np.nan)
+
+    def group_rows(self, keys: Sequence[Optional[str]]) -> "GapMatrix":
+        """行を keys（行ごとのグループ名）でまとめる"""
+        names, groups = _grouping(keys)
+        return GapMatrix(
+            row_ids=names,
+            col_ids=self.col_ids,
+            headcount=groups @ self.headcount,
+            requiring=groups @ self.requiring,
+            short=groups @ self.short,
+            shortfall=groups @ self.shortfall,
+            member_shortfall=groups @ self.member_shortfall,
+            meeting=groups @ self.meeting,
+            demand=groups @ self.demand
+        )
+
+    def group_cols(self, keys: Sequence[Optional[str]]) -> "GapMatrix":
+        """列を keys（列ごとのグループ名）でまとめる"""
+        names, groups = _grouping(keys)
+        groups = groups.T
+        return GapMatrix(
+            row_ids=self.row_ids,
+            col_ids=names,
+            headcount=self.headcount,
+            requiring=self.requiring @ groups,
+            short=self.short @ groups,
+            shortfall=self.shortfall @ groups,
+            member_shortfall=self.member_shortfall @ groups,
+            meeting=self.meeting @ groups,
+            demand=self.demand @ groups
+        )
+
+    def top_shortfalls(self, n: int = 10) -> List[Tuple[Optional[str], Optional[str], float]]:
+        """不足レベルの合計が大きい (行, 列, 不足) の組"""
+        flat = self.shortfall.ravel()
+        order = np.argsort(-flat, kind="stable")[:n]
+        n_cols = self.shortfall.shape[1]
+        return [
+            (self.row_ids[i // n_cols], self.col_ids[i % n_cols], float(flat[i]))
+            for i in order if flat[i] > 0
+        ]
+
+
+@dataclass
+class SkillGap:
+    """1チーム・1要求スキルのギャップ"""
+    skill_id: str
+    required_level: int
+    is_mandatory: bool
+    best_level: int         # チーム内の最高レベル
+    meeting: int            # 要求レベル以上のメンバー数
+    headcount: int
+    shortfall: int          # max(0, 要求レベル − 最高レベル)
+    member_shortfall: int   # メンバーごとの不足レベルの合計
+
+
+def _grouping(keys: Sequence[Optional[str]]) -> Tuple[List[Optional[str]], np.ndarray]:
+    """グループ名の一覧（出現順）と (グループ数, 要素数) の所属行列"""
+    names = list(dict.fromkeys(keys))
+    index = {name: i for i, name in enumerate(names)}
+    groups = np.zeros((len(names), len(keys)), dtype=np.float64)
+    groups[[index[key] for key in keys], np.arange(len(keys))] = 1.0
+    return names, groups
+
+
+class SkillGapState:
+    """
+    全チームのスキル保有状況（チーム×スキル×レベルの人数）
+
+    levels 0 はスキル未保有。要求レベルは teams.json の requirements で、
+    要求のないスキルは 0。
+    """
+
+    def __init__(
+        self,
+        team_ids: List[str],
+        skill_index: SkillIndex,
+        required_levels: np.ndarray,
+        mandatory: np.ndarray,
+        departments: Optional[Dict[str, Optional[str]]] = None,
+        skill_groups: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None
+    ):
+        """
+        Args:
+            team_ids: チームID
+            skill_index: スキル列の索引
+            required_levels: (チーム数, スキル数) 要求レベル（要求なしは 0）
+            mandatory: (チーム数, スキル数) 必須スキルか
+            departments: チームID → 部署名
+            skill_groups: スキルID → (カテゴリ, サブカテゴリ)
+        """
+        self.team_ids = list(team_ids)
+        self._team_cols = {tid: i for i, tid in enumerate(self.team_ids)}
+        self.skill_index = skill_index
+        self.required_levels = np.asarray(required_levels, dtype=np.int64)  # (T, S)
+        self.mandatory = np.asarray(mandatory, dtype=bool)                   # (T, S)
+        departments = departments or {}
+        skill_groups = skill_groups or {}
+        self.departments = [departments.get(tid) for tid in self.team_ids]
+        self.categories = [skill_groups.get(sid, (None, None))[0] for sid in skill_index.skill_ids]
+        self.subcategories = [skill_groups.get(sid, (None, None))[1] for sid in skill_index.skill_ids]
+
+        n_teams, n_skills = len(self.team_ids), len(skill_index)
+        # (T, S, MAX_LEVEL + 1) チーム・スキル・レベルごとの人数
+        self.level_counts = np.zeros((n_teams, n_skills, MAX_LEVEL + 1), dtype=np.int64)
+        self.counts = np.zeros(n_teams, dtype=np.int64)
+        # 従業員ID → (チーム列, スキルレベル (S,))
+        self._members: Dict[str, Tuple[int, np.ndarray]] = {}
+
+    @classmethod
+    def from_records(
+        cls,
+        employee_records: List[Dict],
+        team_records: List[Dict],
+        skill_records: Optional[List[Dict]] = None,
+        organization: Optional[Dict] = None
+    ) -> "SkillGapState":
+        """
+        employees.json / teams.json / skills_master.json / organization_structure.json の
+        レコードから作成
+
+        部署は organization の hierarchy（各部署の teams）から引き、そこにない
+        チームは teams.json の department を使う。
+        """
+        skill_records = skill_records or []
+        teams = [TeamProfile.from_dict(t) for t in team_records]
+        skill_index = build_skill_index(
+            [CandidateProfile.from_dict(e) for e in employee_records],
+            teams,
+            SkillIndex.from_master(skill_records)
+        )
+        required = np.zeros((len(teams), len(skill_index)), dtype=np.int64)
+        mandatory = np.zeros((len(teams), len(skill_index)), dtype=bool)
+        for row, team in enumerate(teams):
+            for req in team.requirements:
+                col = skill_index.column(req.skill_id)
+                required[row, col] = max(required[row, col], req.required_level)
+                mandatory[row, col] |= req.is_mandatory
+
+        departments = {t["id"]: t.get("department") for t in team_records}
+        for unit in (organization or {}).get("hierarchy", []):
+            for team_id in unit.get("teams", []):
+                departments[team_id] = unit["name"]
+
+        state = cls(
+            team_ids=[t.id for t in teams],
+            skill_index=skill_index,
+            required_levels=required,
+            mandatory=mandatory,
+            departments=departments,
+            skill_groups={s["id"]: (s.get("category"), s.get("subcategory")) for s in skill_records}
+        )
+        for employee in employee_records:
+            if employee.get("team_id") in state._team_cols:
+                state.add_member(
+                    employee["id"],
+                    employee["team_id"],
+                    [Skill.from_dict(s) for s in employee.get("skills", [])]
+                )
+        return state
+
+    @classmethod
+    def from_files(cls, data_dir: Path = DATA_DIR) -> "SkillGapState":
+        data_dir = Path(data_dir)
+        with open(data_dir / "employees.json", "r", encoding="utf-8") as f:
+            employees = json.load(f)["employees"]
+        with open(data_dir / "teams.json", "r", encoding="utf-8") as f:
+            teams = json.load(f)["teams"]
+        with open(data_dir / "skills_master.json", "r", encoding="utf-8") as f:
+            skills = json.load(f)["skills"]
+        with open(data_dir / "organization_structure.json", "r", encoding="utf-8") as f:
+            organization = json.load(f)["organization"]
+        return cls.from_records(employees, teams, skills, organization)
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    def team_col(self, team_id: str) -> int:
+        try:
+            return self._team_cols[team_id]
+        except KeyError:
+            raise KeyError(f"チームが見つかりません: {team_id}") from None
+
+    def team_of(self, employee_id: str) -> str:
+        return self.team_ids[self._member(employee_id)[0]]
+
+    def gaps(
+        self,
+        by: str = "team",
+        skills: str = "skill",
+        mandatory_only: bool = False
+    ) -> GapMatrix:
+        """
+        ギャップ行列
+
+        Args:
+            by: 行の単位（team / department）
+            skills: 列の単位（skill / category / subcategory）
+            mandatory_only: 必須スキルの要求だけを集計
+        """
+        if by not in TEAM_GROUPINGS:
+            raise ValueError(f"by は {' / '.join(TEAM_GROUPINGS)} のいずれかです: {by}")
+        if skills not in SKILL_GROUPINGS:
+            raise ValueError(f"skills は {' / '.join(SKILL_GROUPINGS)} のいずれかです: {skills}")
+        matrix = self._team_matrix(mandatory_only)
+        if by == "department":
+            matrix = matrix.group_rows(self.departments)
+        if skills == "category":
+            matrix = matrix.group_cols(self.categories)
+        elif skills == "subcategory":
+            matrix = matrix.group_cols(self.subcategories)
+        return matrix
+
+    def team_report(self, team_id: str) -> List[SkillGap]:
+        """チームの要求スキルごとのギャップ（不足の大きい順）"""
+        col = self.team_col(team_id)
+        counts = self.level_counts[col:col + 1]
+        required = self.required_levels[col:col + 1]
+        best, meeting, member_shortfall = self._reduce(counts, self.counts[col:col + 1], required)
+        gaps = [
+            SkillGap(
+                skill_id=self.skill_index.skill_ids[s],
+                required_level=int(required[0, s]),
+                is_mandatory=bool(self.mandatory[col, s]),
+                best_level=int(best[0, s]),
+                meeting=int(meeting[0, s]),
+                headcount=int(self.counts[col]),
+                shortfall=int(max(0, required[0, s] - best[0, s])),
+                member_shortfall=int(member_shortfall[0, s])
+            )
+            for s in np.flatnonzero(required[0] > 0)
+        ]
+        return sorted(gaps, key=lambda g: (-g.shortfall, -g.member_shortfall))
+
+    # ------------------------------------------------------------------
+    # 更新（O(スキル数)）
+    # ------------------------------------------------------------------
+
+    def add_member(self, employee_id: str, team_id: str, skills: Iterable[Skill]) -> None:
+        """
+        メンバーを追加
+
+        索引にないスキルはどのチームにも要求されないため無視する。
+        同じスキルが複数ある場合は最初のものを使う（CandidateBatch と同じ）。
+        """
+        if employee_id in self._members:
+            raise ValueError(f"従業員は配置済みです: {employee_id}")
+        col = self.team_col(team_id)
+        levels = np.zeros(len(self.skill_index), dtype=np.int64)
+        for skill in skills:
+            s = self.skill_index.column(skill.skill_id)
+            if s is None or levels[s] > 0:
+                continue
+            if not 0 <= skill.proficiency_level <= MAX_LEVEL:
+                raise ValueError(
+                    f"スキルレベルは0〜{MAX_LEVEL}です: {employee_id} {skill.skill_id}={skill.proficiency_level}"
+                )
+            levels[s] = skill.proficiency_level
+        self._members[employee_id] = (col, levels)
+        self._update(col, levels, 1)
+
+    def remove_member(self, employee_id: str) -> None:
+        col, levels = self._member(employee_id)
+        del self._members[employee_id]
+        self._update(col, levels, -1)
+
+    def move_member(self, employee_id: str, team_id: str) -> None:
+        col, levels = self._member(employee_id)
+        new_col = self.team_col(team_id)
+        self._update(col, levels, -1)
+        self._update(new_col, levels, 1)
+        self._members[employee_id] = (new_col, levels)
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    def _member(self, employee_id: str) -> Tuple[int, np.ndarray]:
+        try:
+            return self._members[employee_id]
+        except KeyError:
+            raise KeyError(f"従業員が見つかりません: {employee_id}") from None
+
+    def _update(self, col: int, levels: np.ndarray, sign: int) -> None:
+        self.level_counts[col, np.arange(len(levels)), levels] += sign
+        self.counts[col] += sign
+
+    def _team_matrix(self, mandatory_only: bool) -> GapMatrix:
+        required = self.required_levels
+        mask = required > 0
+        if mandatory_only:
+            mask &= self.mandatory
+        best, meeting, member_shortfall = self._reduce(self.level_counts, self.counts, required)
+        shortfall = np.maximum(required - best, 0)
+        return GapMatrix(
+            row_ids=list(self.team_ids),
+            col_ids=list(self.skill_index.skill_ids),
+            headcount=self.counts.astype(np.float64),
+            requiring=mask.astype(np.float64),
+            short=(mask & (shortfall > 0)).astype(np.float64),
+            shortfall=np.where(mask, shortfall, 0).astype(np.float64),
+            member_shortfall=np.where(mask, member_shortfall, 0).astype(np.float64),
+            meeting=np.where(mask, meeting, 0).astype(np.float64),
+            demand=np.where(mask, self.counts[:, None], 0).astype(np.float64)
+        )
+
+    @staticmethod
+    def _reduce(level_counts: np.ndarray, counts: np.ndarray, required: np.ndarray) -> tuple:
+        """
+        ヒストグラムから (チーム内最高レベル, 要求レベル以上の人数, メンバーごとの不足の合計)
+
+        いずれも (チーム数, スキル数)。
+        """
+        levels = np.arange(MAX_LEVEL + 1)
+        # レベル l 以上の人数
+        at_least = np.cumsum(level_counts[..., ::-1], axis=-1)[..., ::-1]
+        meeting = np.take_along_axis(at_least, required[..., None], axis=-1)[..., 0]
+        held = level_counts > 0
+        best = np.where(counts[:, None] > 0, MAX_LEVEL - np.argmax(held[..., ::-1], axis=-1), 0)
+        member_shortfall = np.einsum(
+            "tsl,tsl->ts", level_counts, np.maximum(required[..., None] - levels, 0)
+        )
+        return best, meeting, member_shortfall
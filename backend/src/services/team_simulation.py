@@ -0,0 +1,401 @@
+"""
+Takei-prime チーム構成シミュレーション
+
+チームごとに「人数・Big Five の合計・二乗和」を保持し、メンバーの追加・削除・
+異動を O(1) で反映する。フロントエンドの simulateTeamWithCandidate が
+what-if のたびにチーム平均とバランス指数を計算し直していた処理を置き換える。
+
+- チーム文化（平均）= 合計 / 人数
+- ばらつき（標準偏差）= sqrt(二乗和 / 人数 − 平均²)
+- バランス指数は simulation.ts の calculateBalanceIndex と同じ判定を
+  5次元の標準偏差の平均に適用する（teams.json の *_variance は標準偏差相当）
+
+仮想的な異動は状態を変えずに評価でき、配列でまとめて渡せば数千件を一括で
+評価できる。変化後のチーム文化は RetentionCalculator に渡してリテンションを再計算する。
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.fit_score_calculator import (
+    BIG_FIVE_DIMENSIONS,
+    PersonalityProfile,
+    RetentionCalculator,
+)
+from ..core.personality_similarity import normalize_vectors
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data" / "demo"
+
+N_DIMS = len(BIG_FIVE_DIMENSIONS)
+
+
+@dataclass
+class TeamCulture:
+    """チーム文化の状態"""
+    team_id: str
+    member_count: int
+    culture: PersonalityProfile
+    spread: Tuple[float, ...]  # 次元ごとの標準偏差
+    balance_index: float
+
+
+@dataclass
+class MoveImpact:
+    """異動1件の影響"""
+    employee_id: str
+    from_team: Optional[str]
+    to_team: str
+    from_before: Optional[TeamCulture]
+    from_after: Optional[TeamCulture]
+    to_before: TeamCulture
+    to_after: TeamCulture
+    retention_before: Optional[float]  # 異動元チームでのリテンション
+    retention_after: float             # 異動先（異動後の文化）でのリテンション
+
+
+def balance_index(spread: np.ndarray) -> np.ndarray:
+    """
+    次元ごとの標準偏差 (..., 5) からバランス指数 (...,) を計算
+
+    適度なばらつき（10-18）を高く、画一的・バラバラを低く評価する。
+    """
+    avg = np.asarray(spread, dtype=np.float64).mean(axis=-1)
+    balance = np.where(
+        avg < 10,
+        50 + avg * 3,
+        np.where(avg <= 18, 70 + (18 - np.abs(avg - 15)) * 2, 80 - (avg - 18) * 2)
+    )
+    return np.clip(balance, 0, 100)
+
+
+class TeamCompositionState:
+    """
+    全チームの構成状態（人数・合計・二乗和）
+
+    メンバーのいないチームの文化は teams.json の culture_profile を用いる。
+    """
+
+    def __init__(
+        self,
+        team_ids: List[str],
+        base_culture: np.ndarray,
+        base_spread: np.ndarray,
+        workload_rate: np.ndarray,
+        manager_similarity: np.ndarray
+    ):
+        self.team_ids = list(team_ids)
+        self._team_cols = {tid: i for i, tid in enumerate(self.team_ids)}
+        n_teams = len(self.team_ids)
+        self.base_culture = np.asarray(base_culture, dtype=np.float64)   # (T, 5)
+        self.base_spread = np.asarray(base_spread, dtype=np.float64)     # (T, 5)
+        self.workload_rate = np.asarray(workload_rate, dtype=np.float64)  # (T,)
+        self.manager_similarity = np.asarray(manager_similarity, dtype=np.float64)  # (T,)
+        self.counts = np.zeros(n_teams, dtype=np.int64)
+        self.sums = np.zeros((n_teams, N_DIMS), dtype=np.float64)
+        self.sumsq = np.zeros((n_teams, N_DIMS), dtype=np.float64)
+        # 従業員ID → (チーム列, Big Five)
+        self._members: Dict[str, Tuple[int, np.ndarray]] = {}
+
+    @classmethod
+    def from_records(cls, employee_records: List[Dict], team_records: List[Dict]) -> "TeamCompositionState":
+        """employees.json / teams.json のレコードから作成（従業員は team_id でチームに集計）"""
+        state = cls(
+            team_ids=[t["id"] for t in team_records],
+            base_culture=[[t["culture_profile"][dim] for dim in BIG_FIVE_DIMENSIONS] for t in team_records],
+            base_spread=[
+                [t["culture_profile"].get(f"{dim}_variance", 0.0) for dim in BIG_FIVE_DIMENSIONS]
+                for t in team_records
+            ],
+            workload_rate=[t.get("workload_average", 70.0) for t in team_records],
+            manager_similarity=[
+                50.0 if t.get("manager_similarity") is None else t["manager_similarity"] for t in team_records
+            ]
+        )
+        for employee in employee_records:
+            if employee.get("team_id") in state._team_cols:
+                profile = employee["personality_profile"]
+                state.add_member(
+                    employee["id"], employee["team_id"], [profile[dim] for dim in BIG_FIVE_DIMENSIONS]
+                )
+        return state
+
+    @classmethod
+    def from_files(cls, data_dir: Path = DATA_DIR) -> "TeamCompositionState":
+        with open(Path(data_dir) / "employees.json", "r", encoding="utf-8") as f:
+            employees = json.load(f)["employees"]
+        with open(Path(data_dir) / "teams.json", "r", encoding="utf-8") as f:
+            teams = json.load(f)["teams"]
+        return cls.from_records(employees, teams)
+
+    def copy(self) -> "TeamCompositionState":
+        """独立に更新できる複製"""
+        clone = TeamCompositionState.__new__(TeamCompositionState)
+        clone.team_ids = self.team_ids
+        clone._team_cols = self._team_cols
+        clone.base_culture = self.base_culture
+        clone.base_spread = self.base_spread
+        clone.workload_rate = self.workload_rate
+        clone.manager_similarity = self.manager_similarity
+        clone.counts = self.counts.copy()
+        clone.sums = self.sums.copy()
+        clone.sumsq = self.sumsq.copy()
+        clone._members = dict(self._members)
+        return clone
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    def team_col(self, team_id: str) -> int:
+        try:
+            return self._team_cols[team_id]
+        except KeyError:
+            raise KeyError(f"チームが見つかりません: {team_id}") from None
+
+    def team_of(self, employee_id: str) -> str:
+        return self.team_ids[self._member(employee_id)[0]]
+
+    def personality_of(self, employee_id: str) -> np.ndarray:
+        return self._member(employee_id)[1]
+
+    def members(self, team_id: str) -> List[str]:
+        col = self.team_col(team_id)
+        return [eid for eid, (c, _) in self._members.items() if c == col]
+
+    def culture_matrix(self) -> np.ndarray:
+        """全チームの文化（平均）(T, 5)"""
+        return self._mean(self.counts, self.sums, self.base_culture)
+
+    def spread_matrix(self) -> np.ndarray:
+        """全チームの標準偏差 (T, 5)"""
+        return self._spread(self.counts, self.sums, self.sumsq, self.base_spread)
+
+    def team_culture(self, team_id: str) -> TeamCulture:
+        col = self.team_col(team_id)
+        return self._team_culture(col, self.counts[col], self.sums[col], self.sumsq[col])
+
+    def culture_profile(self, team_id: str) -> PersonalityProfile:
+        """RetentionCalculator 等に渡すチーム文化"""
+        return self.team_culture(team_id).culture
+
+    # ------------------------------------------------------------------
+    # 更新（O(1)）
+    # ------------------------------------------------------------------
+
+    def add_member(self, employee_id: str, team_id: str, personality: Sequence[float]) -> None:
+        if employee_id in self._members:
+            raise ValueError(f"従業員は配置済みです: {employee_id}")
+        col = self.team_col(team_id)
+        vector = np.asarray(personality, dtype=np.float64)
+        self._members[employee_id] = (col, vector)
+        self.counts[col] += 1
+        self.sums[col] += vector
+        self.sumsq[col] += vector * vector
+
+    def remove_member(self, employee_id: str) -> None:
+        col, vector = self._member(employee_id)
+        del self._members[employee_id]
+        self.counts[col] -= 1
+        self.sums[col] -= vector
+        self.sumsq[col] -= vector * vector
+
+    def move_member(self, employee_id: str, team_id: str) -> None:
+        vector = self.personality_of(employee_id)
+        self.remove_member(employee_id)
+        self.add_member(employee_id, team_id, vector)
+
+    # ------------------------------------------------------------------
+    # 仮想評価（状態は変更しない）
+    # ------------------------------------------------------------------
+
+    def simulate_addition(self, team_id: str, personality: Sequence[float]) -> TeamCulture:
+        """候補者を追加した場合のチーム文化"""
+        col = self.team_col(team_id)
+        vector = np.asarray(personality, dtype=np.float64)
+        return self._team_culture(
+            col, self.counts[col] + 1, self.sums[col] + vector, self.sumsq[col] + vector * vector
+        )
+
+    def simulate_removal(self, employee_id: str) -> TeamCulture:
+        """従業員が抜けた場合の所属チームの文化"""
+        col, vector = self._member(employee_id)
+        return self._team_culture(
+            col, self.counts[col] - 1, self.sums[col] - vector, self.sumsq[col] - vector * vector
+        )
+
+    def simulate_move(
+        self,
+        employee_id: str,
+        team_id: str,
+        recent_move: bool = False
+    ) -> MoveImpact:
+        """
+        従業員を team_id に異動した場合の両チームの文化とリテンション
+
+        recent_move=True の場合、異動先のリテンションに異動直後リスクを含める。
+        """
+        col, vector = self._member(employee_id)
+        to_col = self.team_col(team_id)
+        from_team = self.team_ids[col]
+        from_before = self.team_culture(from_team)
+        to_before = self.team_culture(team_id)
+        if col == to_col:
+            from_after, to_after = from_before, to_before
+        else:
+            from_after = self.simulate_removal(employee_id)
+            to_after = self.simulate_addition(team_id, vector)
+
+        personality = PersonalityProfile(*vector.tolist())
+        retention_before, _ = RetentionCalculator.score(
+            personality, from_before.culture,
+            manager_similarity=self.manager_similarity[col],
+            workload_rate=self.workload_rate[col]
+        )
+        retention_after, _ = RetentionCalculator.score(
+            personality, to_after.culture,
+            manager_similarity=self.manager_similarity[to_col],
+            workload_rate=self.workload_rate[to_col],
+            recent_move=recent_move
+        )
+        return MoveImpact(
+            employee_id=employee_id,
+            from_team=from_team,
+            to_team=team_id,
+            from_before=from_before,
+            from_after=from_after,
+            to_before=to_before,
+            to_after=to_after,
+            retention_before=retention_before,
+            retention_after=retention_after
+        )
+
+    def evaluate_additions(
+        self,
+        personalities: np.ndarray,
+        team_ids: Sequence[str],
+        recent_move: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        (人, 追加先チーム) の組ごとの追加後の文化とリテンションを一括計算
+
+        Args:
+            personalities: (M, 5) Big Five
+            team_ids: 長さ M の追加先チームID
+            recent_move: (M,) 異動直後リスクを含めるか（既定は含めない）
+
+        Returns:
+            culture (M, 5) / spread (M, 5) / balance_index (M,) /
+            retention (M,) / personality_similarity (M,)
+        """
+        personalities = np.asarray(personalities, dtype=np.float64).reshape(-1, N_DIMS)
+        cols = np.array([self.team_col(tid) for tid in team_ids], dtype=np.int64)
+        counts = self.counts[cols] + 1
+        sums = self.sums[cols] + personalities
+        sumsq = self.sumsq[cols] + personalities * personalities
+        return self._evaluate(personalities, cols, counts, sums, sumsq, recent_move)
+
+    def evaluate_moves(
+        self,
+        employee_ids: Sequence[str],
+        team_ids: Sequence[str],
+        recent_move: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        (従業員, 異動先チーム) の組ごとの異動後の異動先文化とリテンションを一括計算
+
+        各組は独立に評価する（他の組の異動は反映しない）。
+        異動先が現所属の場合は現在の文化で評価する。
+        """
+        members = [self._member(eid) for eid in employee_ids]
+        personalities = np.array([v for _, v in members], dtype=np.float64).reshape(-1, N_DIMS)
+        from_cols = np.array([c for c, _ in members], dtype=np.int64)
+        cols = np.array([self.team_col(tid) for tid in team_ids], dtype=np.int64)
+        moving = (from_cols != cols)[:, None]
+        counts = self.counts[cols] + moving[:, 0]
+        sums = self.sums[cols] + np.where(moving, personalities, 0.0)
+        sumsq = self.sumsq[cols] + np.where(moving, personalities * personalities, 0.0)
+        return self._evaluate(personalities, cols, counts, sums, sumsq, recent_move)
+
+    def retention(
+        self,
+        personality: PersonalityProfile,
+        team_id: str,
+        recent_move: bool = False
+    ) -> float:
+        """現在のチーム文化でのリテンションスコア"""
+        col = self.team_col(team_id)
+        retention, _ = RetentionCalculator.score(
+            personality, self.culture_profile(team_id),
+            manager_similarity=self.manager_similarity[col],
+            workload_rate=self.workload_rate[col],
+            recent_move=recent_move
+        )
+        return retention
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    def _member(self, employee_id: str) -> Tuple[int, np.ndarray]:
+        try:
+            return self._members[employee_id]
+        except KeyError:
+            raise KeyError(f"従業員が見つかりません: {employee_id}") from None
+
+    def _evaluate(
+        self,
+        personalities: np.ndarray,
+        cols: np.ndarray,
+        counts: np.ndarray,
+        sums: np.ndarray,
+        sumsq: np.ndarray,
+        recent_move: Optional[np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        culture = self._mean(counts, sums, self.base_culture[cols])
+        spread = self._spread(counts, sums, sumsq, self.base_spread[cols])
+        if recent_move is None:
+            recent_move = np.zeros(len(cols), dtype=bool)
+        retention, personality_sim = RetentionCalculator.calculate_pairs(
+            normalize_vectors(personalities),
+            normalize_vectors(culture),
+            self.manager_similarity[cols],
+            self.workload_rate[cols],
+            np.asarray(recent_move, dtype=bool)
+        )
+        return {
+            "culture": culture,
+            "spread": spread,
+            "balance_index": balance_index(spread),
+            "retention": retention,
+            "personality_similarity": personality_sim,
+        }
+
+    def _team_culture(self, col: int, count: int, sums: np.ndarray, sumsq: np.ndarray) -> TeamCulture:
+        count = np.asarray([count])
+        culture = self._mean(count, sums[None, :], self.base_culture[col][None, :])[0]
+        spread = self._spread(count, sums[None, :], sumsq[None, :], self.base_spread[col][None, :])[0]
+        return TeamCulture(
+            team_id=self.team_ids[col],
+            member_count=int(count[0]),
+            culture=PersonalityProfile(*culture.tolist()),
+            spread=tuple(spread.tolist()),
+            balance_index=float(balance_index(spread))
+        )
+
+    @staticmethod
+    def _mean(counts: np.ndarray, sums: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+        n = counts[:, None]
+        return np.where(n > 0, sums / np.maximum(n, 1), fallback)
+
+    @staticmethod
+    def _spread(counts: np.ndarray, sums: np.ndarray, sumsq: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+        n = counts[:, None]
+        safe = np.maximum(n, 1)
+        mean = sums / safe
+        # 差の累積による微小な負値は 0 に丸める
+        variance = np.maximum(sumsq / safe - mean * mean, 0.0)
+        return np.where(n > 0, np.sqrt(variance), fallback)
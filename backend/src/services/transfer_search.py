@@ -0,0 +1,466 @@
+"""
+Takei-prime 異動（玉突き）探索エンジン
+
+フロントエンドの findBestTransfer は配置先チームの全メンバー × 同部署の全チームを
+毎回フルスコアリングしていた。ここでは組織全体の Fit 合計（各従業員の所属チームでの
+Fitスコアの和）を目的関数とし、異動による差分だけを計算して局所探索する。
+
+- SkillMatch はチーム文化に依存しないため、従業員×チームの行列を最初に1回だけ計算
+- Retention / Friction の性格類似度項は異動でチーム文化が変わるため、
+  TeamCompositionState（人数・合計・二乗和）から変化後の文化を O(1) で求め、
+  影響を受けるチーム（異動元・異動先）のメンバーだけ再計算する
+- 近傍: 単独異動（定員に空きがある場合）、2者の入れ替え（swap）、
+  3チーム間の玉突き（A→B, B→C, C→A）
+- 改善する近傍を見つけたら適用する山登り法を、制限時間内で繰り返す
+
+差分評価部分（OrganizationFit）はシナリオ評価（scenario_engine.py）でも使う。
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.fit_score_calculator import (
+    CandidateBatch,
+    FitComponents,
+    FrictionCalculator,
+    PreferenceMode,
+    RetentionCalculator,
+    SkillMatchCalculator,
+    TeamBatch,
+)
+from ..core.personality_similarity import normalize_vectors
+from .batch_assignment import open_position_slots
+from .team_simulation import TeamCompositionState
+
+# (従業員行, 異動先チーム列) の並び
+Moves = List[Tuple[int, int]]
+
+
+@dataclass
+class Transfer:
+    """異動1件"""
+    employee_id: str
+    from_team: str
+    to_team: str
+
+
+@dataclass
+class TransferChain:
+    """同時に実施する異動の組（単独異動・入れ替え・玉突き）"""
+    kind: str                    # "relocate" / "swap" / "cycle"
+    transfers: List[Transfer]
+    fit_delta: float             # 組織全体の Fit 合計の変化
+
+
+@dataclass
+class TransferSearchResult:
+    """探索結果"""
+    chains: List[TransferChain] = field(default_factory=list)  # 改善幅の大きい順（上位N件）
+    plan: List[TransferChain] = field(default_factory=list)    # 適用順の全異動案
+    initial_total_fit: float = 0.0
+    final_total_fit: float = 0.0
+    evaluated: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def improvement(self) -> float:
+        return round(self.final_total_fit - self.initial_total_fit, 2)
+
+
+def capacity_from_positions(state: TeamCompositionState, team_records: List[Dict]) -> Dict[str, int]:
+    """現在の人数 + recruiting_positions の募集枠をチームの定員とする"""
+    capacity = {tid: int(state.counts[state.team_col(tid)]) for tid in state.team_ids}
+    for slot in open_position_slots(team_records):
+        if slot.team_id in capacity:
+            capacity[slot.team_id] += slot.capacity
+    return capacity
+
+
+class OrganizationFit:
+    """
+    組織全体の Fit 状態と異動の差分評価
+
+    employees は state に配置済みの従業員のみを含むこと。従業員の異動歴などの
+    付随情報（move_count 等）は employees の値をそのまま使う。
+    """
+
+    def __init__(
+        self,
+        employees: CandidateBatch,
+        teams: TeamBatch,
+        state: TeamCompositionState,
+        preference: PreferenceMode | Dict[str, float] = PreferenceMode.STABILITY,
+        scale_workload: bool = False
+    ):
+        """
+        Args:
+            employees: 従業員の配列表現
+            teams: チームの配列表現（state の全チームを含む）
+            state: チーム構成の状態（異動の適用で更新するため複製して保持）
+            preference: Preferenceモードまたは α/β/γ
+            scale_workload: True の場合、チームの業務量は一定として稼働率を
+                人数比（作成時の人数 / 異動後の人数）で補正する
+        """
+        self.employees = employees
+        self.state = state.copy()
+        self.preference = preference
+        self.scale_workload = scale_workload
+        self._team_ids = self.state.team_ids
+        self.teams = teams.take([teams.ids.index(tid) for tid in self._team_ids])
+        self._base_counts = self.state.counts.copy()
+
+        self._skill_match = SkillMatchCalculator.calculate_matrix(self.employees, self.teams)
+        self._assignment = np.array(
+            [self.state.team_col(self.state.team_of(eid)) for eid in self.employees.ids], dtype=np.int64
+        )
+        self._members: List[List[int]] = [[] for _ in self._team_ids]
+        for row, col in enumerate(self._assignment):
+            self._members[col].append(row)
+        self._rows = {eid: row for row, eid in enumerate(self.employees.ids)}
+        self._fit = self._fits(
+            np.arange(len(self.employees)), self._assignment, self.state.culture_matrix(), self._workload()
+        )
+        self.evaluated = 0
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+
+    @property
+    def team_ids(self) -> List[str]:
+        return self._team_ids
+
+    @property
+    def total_fit(self) -> float:
+        return float(self._fit.sum())
+
+    @property
+    def fits(self) -> np.ndarray:
+        """(従業員数,) 各従業員の現在の所属チームでのFitスコア（読み取り専用）"""
+        view = self._fit.view()
+        view.setflags(write=False)
+        return view
+
+    @property
+    def assignment_cols(self) -> np.ndarray:
+        """(従業員数,) 各従業員の所属チーム列（読み取り専用）"""
+        view = self._assignment.view()
+        view.setflags(write=False)
+        return view
+
+    def row_of(self, employee_id: str) -> int:
+        try:
+            return self._rows[employee_id]
+        except KeyError:
+            raise KeyError(f"従業員が見つかりません: {employee_id}") from None
+
+    def fit_of(self, employee_id: str) -> float:
+        return float(self._fit[self.row_of(employee_id)])
+
+    def assignment(self) -> Dict[str, str]:
+        """従業員ID → 現在の所属チームID"""
+        return {eid: self._team_ids[c] for eid, c in zip(self.employees.ids, self._assignment)}
+
+    # ------------------------------------------------------------------
+    # 差分評価
+    # ------------------------------------------------------------------
+
+    def move_delta(self, employee_id: str, team_id: str) -> float:
+        """従業員を team_id に単独異動した場合の組織 Fit 合計の変化"""
+        return self._delta([(self.row_of(employee_id), self.state.team_col(team_id))])
+
+    def swap_delta(self, employee_a: str, employee_b: str) -> float:
+        """2人の所属を入れ替えた場合の組織 Fit 合計の変化"""
+        a, b = self.row_of(employee_a), self.row_of(employee_b)
+        return self._delta([(a, self._assignment[b]), (b, self._assignment[a])])
+
+    def evaluate(self, moves: Moves) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        moves を同時に実施した場合の (影響を受ける従業員行, 異動後の所属列, 異動後のFit)
+
+        状態は変更しない。各従業員は moves に1回だけ含めること。
+        """
+        self.evaluated += 1
+        rows, cols, culture, workload = self._after(moves)
+        return rows, cols, self._fits(rows, cols, culture, workload)
+
+    def _delta(self, moves: Moves) -> float:
+        """moves を同時に実施した場合の Fit 合計の変化（状態は変更しない）"""
+        rows, _, fits = self.evaluate(moves)
+        return float(fits.sum() - self._fit[rows].sum())
+
+    def _after(self, moves: Moves) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        影響を受ける従業員行・異動後の所属列・異動後のチーム文化と稼働率（影響チームのみ更新）
+
+        影響を受けるのは異動元・異動先チームのメンバー（異動者を含む）のみ。
+        """
+        new_team = dict(moves)
+        touched = sorted({self._assignment[row] for row in new_team} | set(new_team.values()))
+        counts = self.state.counts[touched].copy()
+        sums = self.state.sums[touched].copy()
+        position = {col: i for i, col in enumerate(touched)}
+        for row, to in moves:
+            vector = self.employees.personality[row]
+            frm = position[self._assignment[row]]
+            counts[frm] -= 1
+            sums[frm] -= vector
+            counts[position[to]] += 1
+            sums[position[to]] += vector
+
+        culture = self.state.culture_matrix()
+        culture[touched] = np.where(
+            counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], self.state.base_culture[touched]
+        )
+        workload = self._workload()
+        if self.scale_workload:
+            workload[touched] = self._scaled_workload(touched, counts)
+        rows = np.array([r for col in touched for r in self._members[col]], dtype=np.int64)
+        cols = np.array([new_team.get(r, self._assignment[r]) for r in rows], dtype=np.int64)
+        return rows, cols, culture, workload
+
+    def _workload(self) -> np.ndarray:
+        """全チームの現在の稼働率"""
+        if not self.scale_workload:
+            return self.teams.workload_rate
+        cols = np.arange(len(self._team_ids))
+        return self._scaled_workload(cols, self.state.counts)
+
+    def _scaled_workload(self, cols, counts: np.ndarray) -> np.ndarray:
+        base = self._base_counts[cols]
+        rate = self.teams.workload_rate[cols]
+        return np.where((base > 0) & (counts > 0), rate * base / np.maximum(counts, 1), rate)
+
+    def _fits(
+        self,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        culture: np.ndarray,
+        workload: np.ndarray
+    ) -> np.ndarray:
+        """(従業員行, 所属列) の組ごとの総合Fitスコア（culture・workload は全チーム分）"""
+        retention, personality_sim = RetentionCalculator.calculate_pairs(
+            self.employees.personality_units[rows],
+            normalize_vectors(culture[cols]),
+            self.teams.manager_similarity[cols],
+            workload[cols],
+            self.employees.recent_move[rows]
+        )
+        friction = FrictionCalculator.calculate_pairs(
+            self.employees.move_count[rows],
+            self.employees.handover_load[rows],
+            self.employees.manager_change[rows],
+            personality_sim
+        )
+        return FitComponents(
+            skill_match=self._skill_match[rows, cols],
+            retention=retention,
+            friction=friction,
+            personality_similarity=personality_sim
+        ).combine(self.preference)
+
+    # ------------------------------------------------------------------
+    # 適用
+    # ------------------------------------------------------------------
+
+    def apply(self, moves: Moves) -> None:
+        """moves を実施して状態を更新"""
+        rows, cols, culture, workload = self._after(moves)
+        for row, to in moves:
+            frm = self._assignment[row]
+            self._members[frm].remove(row)
+            self._members[to].append(row)
+            self._assignment[row] = to
+            self.state.move_member(self.employees.ids[row], self._team_ids[to])
+        self._fit[rows] = self._fits(rows, cols, culture, workload)
+
+
+class TransferSearch(OrganizationFit):
+    """組織全体の異動探索（改善する異動を山登り法で適用）"""
+
+    def __init__(
+        self,
+        employees: CandidateBatch,
+        teams: TeamBatch,
+        state: TeamCompositionState,
+        preference: PreferenceMode | Dict[str, float] = PreferenceMode.STABILITY,
+        departments: Optional[Dict[str, str]] = None,
+        capacity: Optional[Dict[str, int]] = None,
+        min_team_size: int = 1
+    ):
+        """
+        Args:
+            employees: 従業員の配列表現
+            teams: チームの配列表現（state の全チームを含む）
+            state: チーム構成の状態（探索中に更新するため複製して保持）
+            preference: Preferenceモードまたは α/β/γ
+            departments: チームID → 部署。指定時は同一部署内の異動のみ探索
+            capacity: チームID → 定員。未指定のチームは現在の人数（単独異動の受け入れ不可）
+            min_team_size: 単独異動で異動元に残す最少人数
+        """
+        super().__init__(employees, teams, state, preference)
+        self.min_team_size = min_team_size
+
+        capacity = capacity or {}
+        self._capacity = np.array(
+            [capacity.get(tid, int(self.state.counts[c])) for c, tid in enumerate(self._team_ids)],
+            dtype=np.int64
+        )
+        departments = departments or {}
+        dept = [departments.get(tid) for tid in self._team_ids]
+        # チーム列 → 異動先候補のチーム列
+        self._neighbors = [
+            np.array(
+                [b for b in range(len(dept)) if b != a and (not departments or dept[b] == dept[a])],
+                dtype=np.int64
+            )
+            for a in range(len(dept))
+        ]
+
+    # ------------------------------------------------------------------
+    # 局所探索
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        time_budget: float = 1.0,
+        top_n: int = 10,
+        min_improvement: float = 0.01,
+        cycle_samples: int = 20,
+        seed: int = 0
+    ) -> TransferSearchResult:
+        """
+        制限時間内で改善する異動を繰り返し適用
+
+        従業員をランダム順に見て、その従業員を含む近傍（単独異動・入れ替え・
+        玉突きのサンプル）のうち最も改善するものを適用する。1周して改善が
+        なければ局所最適として終了する。
+
+        Args:
+            time_budget: 制限時間（秒）
+            top_n: 結果に含める異動案の件数（改善幅順）
+            min_improvement: 適用する最小の改善幅
+            cycle_samples: 従業員1人あたりに評価する玉突きの候補数
+            seed: 乱数シード
+        """
+        rng = random.Random(seed)
+        start = time.perf_counter()
+        deadline = start + time_budget
+        evaluated = self.evaluated
+        result = TransferSearchResult(initial_total_fit=round(self.total_fit, 2))
+
+        rows = list(range(len(self.employees)))
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            rng.shuffle(rows)
+            for row in rows:
+                if time.perf_counter() >= deadline:
+                    break
+                best = self._best_move_for(row, rng, cycle_samples, min_improvement)
+                if best is None:
+                    continue
+                kind, moves, delta = best
+                result.plan.append(self._chain(kind, moves, delta))
+                self.apply(moves)
+                improved = True
+
+        result.chains = sorted(result.plan, key=lambda c: -c.fit_delta)[:top_n]
+        result.final_total_fit = round(self.total_fit, 2)
+        result.evaluated = self.evaluated - evaluated
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+    def _best_move_for(
+        self,
+        row: int,
+        rng: random.Random,
+        cycle_samples: int,
+        min_improvement: float
+    ) -> Optional[Tuple[str, Moves, float]]:
+        a = self._assignment[row]
+        best: Optional[Tuple[str, Moves, float]] = None
+
+        def consider(kind: str, moves: Moves) -> None:
+            nonlocal best
+            delta = self._delta(moves)
+            if delta >= min_improvement and (best is None or delta > best[2]):
+                best = (kind, moves, delta)
+
+        can_leave = len(self._members[a]) > self.min_team_size
+        for b in self._neighbors[a]:
+            # 単独異動（異動先に空きがあり、異動元が最少人数を下回らない場合）
+            if can_leave and self.state.counts[b] < self._capacity[b]:
+                consider("relocate", [(row, b)])
+            # 入れ替え
+            for other in self._members[b]:
+                consider("swap", [(row, b), (other, a)])
+
+        # 玉突き: row が A→B、B のメンバーが B→C、C のメンバーが C→A
+        for _ in range(cycle_samples):
+            if len(self._neighbors[a]) == 0:
+                break
+            b = int(rng.choice(self._neighbors[a]))
+            c_options = [c for c in self._neighbors[b] if c != a and a in self._neighbors[c]]
+            if not c_options or not self._members[b]:
+                continue
+            c = rng.choice(c_options)
+            if not self._members[c]:
+                continue
+            second = rng.choice(self._members[b])
+            third = rng.choice(self._members[c])
+            consider("cycle", [(row, b), (second, c), (third, a)])
+        return best
+
+    def _chain(self, kind: str, moves: Moves, delta: float) -> TransferChain:
+        return TransferChain(
+            kind=kind,
+            transfers=[
+                Transfer(
+                    employee_id=self.employees.ids[row],
+                    from_team=self._team_ids[self._assignment[row]],
+                    to_team=self._team_ids[to]
+                )
+                for row, to in moves
+            ],
+            fit_delta=round(delta, 2)
+        )
+
+
+def search_transfers(
+    employee_records: List[Dict],
+    team_records: List[Dict],
+    preference: PreferenceMode | Dict[str, float] = PreferenceMode.STABILITY,
+    time_budget: float = 1.0,
+    top_n: int = 10,
+    same_department: bool = True,
+    use_recruiting_capacity: bool = True,
+    seed: int = 0
+) -> TransferSearchResult:
+    """
+    employees.json / teams.json のレコードから異動案を探索
+
+    same_department=True の場合は findBestTransfer と同じく同一部署内に限定する。
+    use_recruiting_capacity=True の場合は募集枠の分だけ単独異動を受け入れる。
+    """
+    from ..core.fit_score_calculator import CandidateProfile, TeamProfile, pack_profiles
+
+    state = TeamCompositionState.from_records(employee_records, team_records)
+    placed = [e for e in employee_records if e.get("team_id") in set(state.team_ids)]
+    employees, teams = pack_profiles(
+        [CandidateProfile.from_dict(e) for e in placed],
+        [TeamProfile.from_dict(t) for t in team_records]
+    )
+    search = TransferSearch(
+        employees,
+        teams,
+        state,
+        preference=preference,
+        departments={t["id"]: t.get("department") for t in team_records} if same_department else None,
+        capacity=capacity_from_positions(state, team_records) if use_recruiting_capacity else None
+    )
+    return search.search(time_budget=time_budget, top_n=top_n, seed=seed)
@@ -0,0 +1,106 @@
+"""行列計算（score_matrix）が calculate_fit_score と同じ総合スコアを返すこと"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.fit_score_calculator import (
+    CandidateProfile,
+    FitScoreEngine,
+    PersonalityProfile,
+    PreferenceMode,
+    RequirementVector,
+    Skill,
+    SkillIndex,
+    SkillMatchCalculator,
+    SkillVector,
+    TeamProfile,
+    TeamRequirement,
+)
+
+SKILL_IDS = [f"skill_{i:02d}" for i in range(30)]
+
+
+def _personality(rng: random.Random) -> PersonalityProfile:
+    return PersonalityProfile(*(rng.randint(1, 10) / 2 for _ in range(5)))
+
+
+def _population(seed: int, n_candidates: int, n_teams: int):
+    """入力は実データと同じく離散値（丸め前の総合スコアが .xx5 ちょうどになりやすい）"""
+    rng = random.Random(seed)
+    candidates = [
+        CandidateProfile(
+            id=f"cand_{i}",
+            skills=[
+                Skill(skill_id, rng.randint(1, 5), rng.randint(0, 150) / 10)
+                for skill_id in rng.sample(SKILL_IDS, rng.randint(1, 8))
+            ],
+            personality=_personality(rng),
+            recent_move=rng.random() < 0.2,
+            move_count_last_year=rng.randint(0, 3),
+            handover_load=rng.randint(0, 100),
+            manager_change=rng.random() < 0.2
+        )
+        for i in range(n_candidates)
+    ]
+    teams = [
+        TeamProfile(
+            id=f"team_{t}",
+            requirements=[
+                TeamRequirement(skill_id, rng.randint(1, 5), rng.random() < 0.2, rng.randint(1, 3))
+                for skill_id in rng.sample(SKILL_IDS, rng.randint(1, 6))
+            ],
+            culture=_personality(rng),
+            workload_rate=rng.randint(40, 120),
+            manager_similarity=rng.choice([None, rng.randint(0, 100)])
+        )
+        for t in range(n_teams)
+    ]
+    return candidates, teams
+
+
+@pytest.fixture(scope="module")
+def population():
+    return _population(seed=7, n_candidates=300, n_teams=20)
+
+
+@pytest.mark.parametrize("mode", list(PreferenceMode))
+def test_score_matrix_matches_calculate_fit_score(population, mode):
+    candidates, teams = population
+    engine = FitScoreEngine(mode)
+    matrix = engine.score_matrix(candidates, teams)
+    for i, candidate in enumerate(candidates):
+        for j, team in enumerate(teams):
+            result = engine.calculate_fit_score(
+                candidate.skills, team.requirements, candidate.personality, team.culture,
+                manager_similarity=team.manager_similarity,
+                workload_rate=team.workload_rate,
+                recent_move=candidate.recent_move,
+                move_count_last_year=candidate.move_count_last_year,
+                handover_load=candidate.handover_load,
+                manager_change=candidate.manager_change,
+                include_breakdown=False
+            )
+            assert matrix[i, j] == result.total_score, (candidate.id, team.id)
+
+
+@pytest.mark.parametrize("mode", list(PreferenceMode))
+def test_combine_modes_matches_combine(population, mode):
+    candidates, teams = population
+    components = FitScoreEngine().score_components(candidates, teams)
+    assert (components.combine_modes()[mode] == components.combine(mode)).all()
+
+
+def test_calculate_vector_matches_calculate(population):
+    candidates, teams = population
+    skill_index = SkillIndex(SKILL_IDS)
+    for team in teams:
+        requirements = RequirementVector.from_requirements(team.requirements, skill_index)
+        for candidate in candidates[:50]:
+            expected = SkillMatchCalculator.calculate(candidate.skills, team.requirements)
+            vector = SkillVector.from_skills(candidate.skills, skill_index)
+            assert SkillMatchCalculator.calculate_vector(vector, requirements) == expected
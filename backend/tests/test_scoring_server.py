@@ -0,0 +1,63 @@
+"""スコアリングAPIの入力検証と、応答のスコアが calculate_fit_score と一致すること"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.api.scoring_server import ScoringServer, ScoringService
+from src.core.fit_score_calculator import FitScoreEngine, PreferenceMode
+
+CALCULATE = "/api/v1/matching/calculate"
+
+
+@pytest.fixture(scope="module")
+def server():
+    return ScoringServer(ScoringService.from_json())
+
+
+def _post(server, path, payload):
+    return asyncio.run(server._dispatch("POST", path, json.dumps(payload).encode("utf-8")))
+
+
+@pytest.mark.parametrize("payload", [
+    {"candidate_id": ["cand_001"], "team_id": "team_001"},
+    {"candidate_id": "cand_001", "team_id": {"id": "team_001"}},
+    {"candidate_id": "cand_001", "team_id": "team_001", "options": [1]},
+    {"candidate_id": "cand_001", "team_id": "team_001", "options": "yes"},
+    {"candidate_id": "cand_001", "team_id": "team_001", "options": {"include_explanation": "false"}},
+])
+def test_calculate_rejects_invalid_fields(server, payload):
+    status, body = _post(server, CALCULATE, payload)
+    assert status == 400, body
+
+
+@pytest.mark.parametrize("mode", list(PreferenceMode))
+def test_calculate_matches_scalar_engine(server, mode):
+    service = server.service
+    engine = FitScoreEngine(mode)
+    for candidate in service._candidate_profiles[::7]:
+        for team in service._team_profiles:
+            status, body = _post(server, CALCULATE, {
+                "candidate_id": candidate.id, "team_id": team.id, "mode": mode.value,
+            })
+            assert status == 200, body
+            expected = engine.calculate_fit_score(
+                candidate.skills, team.requirements, candidate.personality, team.culture,
+                manager_similarity=team.manager_similarity,
+                workload_rate=team.workload_rate,
+                recent_move=candidate.recent_move,
+                move_count_last_year=candidate.move_count_last_year,
+                handover_load=candidate.handover_load,
+                manager_change=candidate.manager_change,
+                include_breakdown=False
+            )
+            assert body["total_score"] == expected.total_score
+            assert body["skill_match_score"] == expected.skill_match_score
+            assert body["retention_score"] == expected.retention_score
+            assert body["friction_score"] == expected.friction_score
+            assert body["confidence"] == expected.confidence
@@ -0,0 +1,45 @@
+"""ストリーミング取り込み（iter_records）が json.load と同じレコードを返すこと"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.streaming import iter_records
+
+DOCUMENT = {
+    "n": 1.5e3,
+    "metadata": {"version": -0.25, "total": 12345678, "ratio": 1e-7, "ok": True, "note": None},
+    "counts": [10, 200, 3.0e2, -4],
+    "candidates": [
+        {"id": "cand_001", "score": 1.5e3, "years": 12.75, "tags": [1, 22, 333], "flag": False},
+        {"id": "cand_002", "score": -0.001, "years": 0, "tags": [], "flag": None},
+        {"id": "cand_003", "score": 2e10, "years": 7.125, "tags": [4.5e-3], "flag": True},
+    ],
+    "after": 99.5,
+}
+
+
+@pytest.fixture(params=["compact", "indented"])
+def document_path(request, tmp_path):
+    path = tmp_path / "candidates.json"
+    indent = None if request.param == "compact" else 2
+    # 1.5e3 のような指数表記を残すため数値は手で書き出す
+    text = json.dumps(DOCUMENT, indent=indent).replace("1500.0", "1.5e3")
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 4, 5, 8, 10, 64, 1 << 20])
+def test_iter_records_matches_json_load(document_path, read_size):
+    with open(document_path, "r", encoding="utf-8") as f:
+        expected = json.load(f)["candidates"]
+    assert list(iter_records(document_path, "candidates", read_size=read_size)) == expected
+
+
+def test_iter_records_missing_key(document_path):
+    with pytest.raises(KeyError):
+        list(iter_records(document_path, "employees", read_size=4))
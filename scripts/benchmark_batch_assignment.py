@@ -0,0 +1,91 @@
+"""
+一括配置ソルバーのベンチマーク
+
+デモ候補者を複製・揺らぎを加えて N 人に増やし、貪欲法（simulateBatchAssignment 相当）と
+ハンガリアン法の実行時間・Fit合計を比較します。
+
+    python scripts/benchmark_batch_assignment.py --sizes 50 100 300 500
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from src.core.fit_score_calculator import SkillIndex
+from src.services.batch_assignment import assign_candidates
+
+
+def load_demo_data():
+    """デモデータをロード"""
+    data_dir = project_root / "data" / "demo"
+
+    with open(data_dir / "candidates.json", "r", encoding="utf-8") as f:
+        candidates = json.load(f)["candidates"]
+
+    with open(data_dir / "teams.json", "r", encoding="utf-8") as f:
+        teams = json.load(f)["teams"]
+
+    return candidates, teams, SkillIndex.from_master_file(data_dir / "skills_master.json")
+
+
+def scale_candidates(candidates, size, seed=42):
+    """デモ候補者を複製し、性格・スキルレベルに揺らぎを加えて size 人にする"""
+    rng = random.Random(seed)
+    scaled = []
+    for i in range(size):
+        candidate = copy.deepcopy(candidates[i % len(candidates)])
+        candidate["id"] = f"cand_bench_{i:05d}"
+        for dim, value in candidate["personality_profile"].items():
+            candidate["personality_profile"][dim] = max(0, min(100, value + rng.randint(-10, 10)))
+        for skill in candidate["skills"]:
+            level = skill.get("proficiency_level", skill.get("required_level", 3))
+            skill["proficiency_level"] = max(1, min(5, level + rng.choice([-1, 0, 0, 1])))
+        scaled.append(candidate)
+    return scaled
+
+
+def scale_teams(teams, factor):
+    """募集枠数を factor 倍にする"""
+    scaled = copy.deepcopy(teams)
+    for team in scaled:
+        for position in team.get("recruiting_positions", []):
+            position["count"] *= factor
+    return scaled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="一括配置ソルバーのベンチマーク")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 300, 500])
+    parser.add_argument("--slot-factor", type=int, default=3, help="募集枠数の倍率")
+    args = parser.parse_args()
+
+    candidates, teams, skill_index = load_demo_data()
+    teams = scale_teams(teams, args.slot_factor)
+    total_slots = sum(p["count"] for t in teams for p in t.get("recruiting_positions", []))
+
+    print(f"チーム: {len(teams)}、募集枠: {total_slots}")
+    print(f"{'候補者':>8} | {'方式':>8} | {'時間(ms)':>10} | {'配置数':>6} | {'Fit合計':>10} | {'平均Fit':>8}")
+    print("-" * 66)
+
+    for size in args.sizes:
+        scaled = scale_candidates(candidates, size)
+        for method in ("greedy", "optimal"):
+            start = time.perf_counter()
+            result = assign_candidates(scaled, teams, method=method, skill_index=skill_index)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(
+                f"{size:>8} | {method:>8} | {elapsed:>10.1f} | {len(result.assignments):>6} | "
+                f"{result.total_fit:>10.1f} | {result.average_fit:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Fitスコア計算のベンチマーク
+
+- import時間（新しいプロセスで fit_score_calculator をimport、--max-import-ms で上限を設定）
+- 単一ペアのレイテンシ（calculate_fit_score、詳細あり/スコアのみ/キャッシュのミス・ヒット）
+- 全ペア計算のスループット（score_matrix、候補者 10^2〜10^5 人）とメモリピーク
+
+結果はJSONで保存し、--compare で前回結果と比較して劣化を検出します。
+
+    python scripts/benchmark_fit_score.py --output bench.json
+    python scripts/benchmark_fit_score.py --compare bench.json --output bench_new.json
+    python scripts/benchmark_fit_score.py --sizes 100 --max-import-ms 50
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+import numpy as np
+
+from src.core.fit_score_cache import FitScoreCache
+from src.core.fit_score_calculator import (
+    CandidateProfile,
+    FitScoreEngine,
+    SkillIndex,
+    TeamProfile,
+    pack_profiles,
+)
+from src.core.sharded_scoring import DEFAULT_SHARD_SIZE, score_matrix_sharded, shard_ranges
+from synthetic_population import generate_people, generate_teams
+
+# 値が大きいほど良い指標（それ以外は小さいほど良い）
+HIGHER_IS_BETTER = ("pairs_per_sec",)
+
+
+def measure_import_time(repeat=5):
+    """
+    新しいプロセスでのimport時間と、最初の1ペア計算までの時間（ミリ秒）
+
+    単一ペアの計算では numpy を読み込まないこと（numpy_loaded）も確認する。
+    """
+    code = (
+        "import sys, time; start = time.perf_counter(); "
+        "import src.core.fit_score_calculator as f; "
+        "imported = time.perf_counter(); "
+        "f.FitScoreEngine().calculate_fit_score("
+        "[f.Skill('sk_001', 4, 3.0)], [f.TeamRequirement('sk_001', 3, True, 1)], "
+        "f.PersonalityProfile(60, 50, 40, 70, 30), f.PersonalityProfile(55, 60, 45, 65, 35)); "
+        "end = time.perf_counter(); "
+        "print((imported - start) * 1000, (end - start) * 1000, int('numpy' in sys.modules))"
+    )
+    import_samples, cold_start_samples, numpy_loaded = [], [], False
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=project_root / "backend",
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        import_ms, cold_start_ms, loaded = output.split()
+        import_samples.append(float(import_ms))
+        cold_start_samples.append(float(cold_start_ms))
+        numpy_loaded = numpy_loaded or loaded == "1"
+    return {
+        "min_ms": min(import_samples),
+        "median_ms": statistics.median(import_samples),
+        "cold_start_median_ms": statistics.median(cold_start_samples),
+        "numpy_loaded": numpy_loaded
+    }
+
+
+def measure_single_pair(candidates, teams, iterations=2000):
+    """
+    単一ペアのレイテンシ（マイクロ秒）
+
+    cache_miss / cache_hit は FitScoreCache 経由のスコアのみの計算で、
+    1周目（全件ミス）と同じペアの2周目（全件ヒット）を計測する。
+    """
+    engine = FitScoreEngine()
+    cache = FitScoreCache(engine, max_entries=iterations)
+    results = {}
+    runs = (
+        ("full", engine, True),
+        ("scores_only", engine, False),
+        ("cache_miss", cache, False),
+        ("cache_hit", cache, False),
+    )
+    for name, scorer, include_breakdown in runs:
+        samples = []
+        for i in range(iterations):
+            candidate = candidates[i % len(candidates)]
+            team = teams[i % len(teams)]
+            start = time.perf_counter()
+            scorer.calculate_fit_score(
+                candidate.skills,
+                team.requirements,
+                candidate.personality,
+                team.culture,
+                workload_rate=team.workload_rate,
+                include_breakdown=include_breakdown
+            )
+            samples.append((time.perf_counter() - start) * 1e6)
+        samples.sort()
+        results[name] = {
+            "median_us": statistics.median(samples),
+            "p99_us": samples[int(len(samples) * 0.99) - 1]
+        }
+    return results
+
+
+def measure_all_pairs(size, teams, skill_index, seed=0, workers=1):
+    """全ペア計算の所要時間・スループット・メモリピーク（workers > 1 は分散計算も計測）"""
+    records = generate_people(size, teams, seed=seed, prefix="cand")
+    candidates = [CandidateProfile.from_dict(r) for r in records]
+    team_profiles = [TeamProfile.from_dict(t) for t in teams]
+    del records
+
+    engine = FitScoreEngine()
+    tracemalloc.start()
+    start = time.perf_counter()
+    candidate_batch, team_batch = pack_profiles(candidates, team_profiles, skill_index)
+    pack_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.score_matrix(candidate_batch, team_batch)
+    score_seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pairs = size * len(teams)
+    entry = {
+        "candidates": size,
+        "teams": len(teams),
+        "pack_s": pack_seconds,
+        "score_s": score_seconds,
+        "pairs_per_sec": pairs / score_seconds if score_seconds > 0 else float("inf"),
+        "peak_memory_mb": peak / 1024 / 1024
+    }
+    if workers > 1:
+        # 小さいサイズでも全ワーカーに行き渡るよう、シャードは size / workers 以下にする
+        shard_size = min(DEFAULT_SHARD_SIZE, -(-size // workers))
+        shards = len(shard_ranges(size, shard_size))
+        start = time.perf_counter()
+        score_matrix_sharded(
+            candidate_batch, team_batch, engine.weights, workers=workers, shard_size=shard_size
+        )
+        sharded_seconds = time.perf_counter() - start
+        entry["workers"] = workers
+        entry["shards"] = shards
+        entry["processes"] = min(workers, shards) if shards > 1 else 1
+        entry["sharded_score_s"] = sharded_seconds
+        entry["sharded_pairs_per_sec"] = pairs / sharded_seconds if sharded_seconds > 0 else float("inf")
+    return entry
+
+
+def flatten_metrics(results):
+    """比較用に指標を {名前: 値} に平坦化"""
+    metrics = {}
+    for key, value in results["import_time"].items():
+        if key.endswith("_ms"):
+            metrics[f"import_time.{key}"] = value
+    for mode, values in results["single_pair"].items():
+        for key, value in values.items():
+            metrics[f"single_pair.{mode}.{key}"] = value
+    for entry in results["all_pairs"]:
+        label = f"all_pairs.{entry['candidates']}x{entry['teams']}"
+        for key in ("pack_s", "score_s", "pairs_per_sec", "peak_memory_mb",
+                    "sharded_score_s", "sharded_pairs_per_sec"):
+            if key in entry:
+                metrics[f"{label}.{key}"] = entry[key]
+    return metrics
+
+
+def compare_results(previous, current, threshold):
+    """前回結果と比較し、threshold を超えて悪化した指標を返す"""
+    before = flatten_metrics(previous["results"])
+    after = flatten_metrics(current["results"])
+    regressions = []
+
+    print(f"\n{'指標':<48} | {'前回':>12} | {'今回':>12} | {'変化':>8}")
+    print("-" * 90)
+    for name in sorted(set(before) & set(after)):
+        if before[name] == 0:
+            continue
+        ratio = after[name] / before[name]
+        worse = ratio < 1 - threshold if name.endswith(HIGHER_IS_BETTER) else ratio > 1 + threshold
+        mark = " ⚠️" if worse else ""
+        print(f"{name:<48} | {before[name]:>12.3f} | {after[name]:>12.3f} | {ratio:>7.2f}x{mark}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fitスコア計算のベンチマーク")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--teams", type=int, default=43, help="チーム数（デモの43を超える分は合成）")
+    parser.add_argument("--workers", type=int, default=1, help="2以上で分散計算のスループットも計測")
+    parser.add_argument("--iterations", type=int, default=2000, help="単一ペア計測の反復回数")
+    parser.add_argument("--output", type=Path, help="結果JSONの保存先")
+    parser.add_argument("--compare", type=Path, help="比較対象の前回結果JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="劣化と判定する変化率")
+    parser.add_argument(
+        "--max-import-ms", type=float, default=None,
+        help="import時間（中央値）の上限。超えた場合や単一ペア計算で numpy を読み込んだ場合は失敗"
+    )
+    args = parser.parse_args()
+
+    teams = generate_teams(args.teams)
+    skill_index = SkillIndex.from_master_file(project_root / "data" / "demo" / "skills_master.json")
+
+    print("⏱  import時間を計測中...")
+    import_time = measure_import_time()
+    print(
+        f"  min {import_time['min_ms']:.1f} ms / median {import_time['median_ms']:.1f} ms / "
+        f"初回計算まで {import_time['cold_start_median_ms']:.1f} ms"
+        f"{'（numpy 読み込みあり）' if import_time['numpy_loaded'] else ''}"
+    )
+
+    print("⏱  単一ペアのレイテンシを計測中...")
+    sample = [CandidateProfile.from_dict(r) for r in generate_people(200, teams, seed=1)]
+    single_pair = measure_single_pair(sample, [TeamProfile.from_dict(t) for t in teams], args.iterations)
+    for mode, values in single_pair.items():
+        print(f"  {mode:<12}: median {values['median_us']:.1f} µs / p99 {values['p99_us']:.1f} µs")
+
+    print("⏱  全ペア計算を計測中...")
+    all_pairs = []
+    for size in args.sizes:
+        entry = measure_all_pairs(size, teams, skill_index, workers=args.workers)
+        all_pairs.append(entry)
+        print(
+            f"  {size:>7} × {entry['teams']}: pack {entry['pack_s']:.3f}s, "
+            f"score {entry['score_s']:.3f}s, {entry['pairs_per_sec']:,.0f} pairs/s, "
+            f"peak {entry['peak_memory_mb']:.1f} MB"
+        )
+        if "workers" in entry:
+            print(
+                f"  {'':>7}   {entry['processes']} processes / {entry['shards']} shards: "
+                f"score {entry['sharded_score_s']:.3f}s, "
+                f"{entry['sharded_pairs_per_sec']:,.0f} pairs/s"
+            )
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform()
+        },
+        "results": {
+            "import_time": import_time,
+            "single_pair": single_pair,
+            "all_pairs": all_pairs
+        }
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 保存先: {args.output}")
+
+    failed = False
+    if single_pair["cache_hit"]["median_us"] >= single_pair["scores_only"]["median_us"]:
+        print(
+            f"\n❌ キャッシュヒット {single_pair['cache_hit']['median_us']:.1f} µs が"
+            f"再計算 {single_pair['scores_only']['median_us']:.1f} µs より遅くなっています"
+        )
+        failed = True
+    if args.max_import_ms is not None:
+        if import_time["median_ms"] > args.max_import_ms:
+            print(f"\n❌ import時間 {import_time['median_ms']:.1f} ms が上限 {args.max_import_ms:.1f} ms を超えました")
+            failed = True
+        if import_time["numpy_loaded"]:
+            print("\n❌ 単一ペアの計算で numpy が読み込まれました")
+            failed = True
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        regressions = compare_results(previous, report, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)}件の指標が {args.threshold:.0%} 以上悪化しました")
+            failed = True
+        else:
+            print("\n✅ 劣化は検出されませんでした")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
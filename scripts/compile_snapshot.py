@@ -0,0 +1,55 @@
+"""
+JSONデータを列指向スナップショットに変換
+
+    python scripts/compile_snapshot.py                       # data/demo → data/demo/snapshot
+    python scripts/compile_snapshot.py --data-dir DIR --output OUT
+
+元JSONに変更がなければ再変換しません（--force で強制）。
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from src.core.snapshot import MANIFEST_FILE, Snapshot, SnapshotError, compile_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONデータを列指向スナップショットに変換")
+    parser.add_argument("--data-dir", type=Path, default=project_root / "data" / "demo")
+    parser.add_argument("--output", type=Path, help="出力ディレクトリ（既定は <data-dir>/snapshot）")
+    parser.add_argument("--force", action="store_true", help="変更がなくても再変換する")
+    args = parser.parse_args()
+    output = args.output or args.data_dir / "snapshot"
+
+    if not args.force and (output / MANIFEST_FILE).exists():
+        try:
+            if Snapshot.open(output).is_current(args.data_dir):
+                print(f"✅ スナップショットは最新です: {output}")
+                return
+        except SnapshotError as e:
+            print(f"⚠️  既存のスナップショットを再作成します: {e}")
+
+    start = time.perf_counter()
+    manifest = compile_snapshot(args.data_dir, output)
+    elapsed = time.perf_counter() - start
+
+    print(f"📦 スナップショットを作成しました: {output} ({elapsed * 1000:.1f} ms)")
+    for section, info in manifest["sections"].items():
+        print(f"  {section:<12}: {info['count']:>7} 件")
+    print(f"  スキル列数   : {len(manifest['skill_ids']):>7}")
+
+    start = time.perf_counter()
+    snapshot = Snapshot.open(output)
+    snapshot.candidate_batch("candidates")
+    snapshot.team_batch()
+    print(f"⏱  読み込み + 配列化: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -236,28 +236,31 @@ def compare_preference_modes(candidate, team, skills_master):
         PreferenceMode.INNOVATION: "異質補完（イノベーション重視）"
     }
     
+    # モード非依存の構成スコアは1回だけ計算し、各モードの重みで組み直す
+    candidate_skills, candidate_personality = convert_candidate_to_objects(candidate)
+    team_requirements, team_culture, workload = convert_team_to_objects(team)
+    
+    engine = FitScoreEngine()
+    mode_results = engine.compare_preference_modes(
+        candidate_skills=candidate_skills,
+        team_requirements=team_requirements,
+        candidate_personality=candidate_personality,
+        team_culture=team_culture,
+        workload_rate=workload
+    )
+    
     results = []
     
     for mode in modes:
-        candidate_skills, candidate_personality = convert_candidate_to_objects(candidate)
-        team_requirements, team_culture, workload = convert_team_to_objects(team)
-        
-        engine = FitScoreEngine(mode)
-        result = engine.calculate_fit_score(
-            candidate_skills=candidate_skills,
-            team_requirements=team_requirements,
-            candidate_personality=candidate_personality,
-            team_culture=team_culture,
-            workload_rate=workload
-        )
-        
+        result = mode_results[mode]
+        weights = result.breakdown["weights"]
         results.append((mode, result))
         
         print(f"\n【{mode.value.upper()}】: {mode_descriptions[mode]}")
         print(f"  総合スコア: {result.total_score}/100")
-        print(f"  ├ SkillMatch: {result.skill_match_score}/100 (重み: {engine.weights['alpha']})")
-        print(f"  ├ Retention : {result.retention_score}/100 (重み: {engine.weights['beta']})")
-        print(f"  └ Friction  : {result.friction_score}/100 (重み: {engine.weights['gamma']})")
+        print(f"  ├ SkillMatch: {result.skill_match_score}/100 (重み: {weights['alpha']})")
+        print(f"  ├ Retention : {result.retention_score}/100 (重み: {weights['beta']})")
+        print(f"  └ Friction  : {result.friction_score}/100 (重み: {weights['gamma']})")
     
     # 最適モード推薦
     best_mode, best_result = max(results, key=lambda x: x[1].total_score)
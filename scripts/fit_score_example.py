@@ -0,0 +1,64 @@
+"""
+Takei-prime Fitスコア計算の最小例
+
+1組の候補者・チームについて FitScoreEngine.calculate_fit_score を実行する。
+
+    python scripts/fit_score_example.py
+"""
+
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from src.core.fit_score_calculator import (
+    FitScoreEngine,
+    PersonalityProfile,
+    PreferenceMode,
+    Skill,
+    TeamRequirement,
+)
+
+
+def main():
+    # サンプルデータ
+    candidate_skills = [
+        Skill("sk_001", 5, 7.5),  # Python
+        Skill("sk_007", 4, 4.0),   # 機械学習
+        Skill("sk_009", 4, 6.0),   # SQL
+    ]
+
+    team_reqs = [
+        TeamRequirement("sk_001", 4, True, 1),   # Python必須
+        TeamRequirement("sk_007", 4, True, 1),   # ML必須
+        TeamRequirement("sk_009", 3, True, 2),   # SQL必須
+    ]
+
+    candidate_personality = PersonalityProfile(75, 80, 45, 60, 35)
+    team_culture = PersonalityProfile(80, 75, 50, 65, 40)
+
+    # Fitスコア計算
+    engine = FitScoreEngine(PreferenceMode.STABILITY)
+    result = engine.calculate_fit_score(
+        candidate_skills=candidate_skills,
+        team_requirements=team_reqs,
+        candidate_personality=candidate_personality,
+        team_culture=team_culture,
+        workload_rate=75.0,
+        recent_move=False,
+        move_count_last_year=0,
+        handover_load=20.0,
+        manager_change=False
+    )
+
+    print(f"総合Fitスコア: {result.total_score}/100")
+    print(f"├ SkillMatch: {result.skill_match_score}/100")
+    print(f"├ Retention: {result.retention_score}/100")
+    print(f"├ Friction: {result.friction_score}/100")
+    print(f"└ 信頼度: {result.confidence}")
+
+
+if __name__ == "__main__":
+    main()
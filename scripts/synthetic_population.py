@@ -0,0 +1,83 @@
+"""
+ベンチマーク用の合成データ生成
+
+generate_employees.py と同じ考え方（チームの文化プロファイル周辺に性格を、
+チームの要求スキル周辺にスキルを生成）で、任意の人数の候補者・従業員と
+任意数のチームを作ります。
+"""
+
+import copy
+import json
+import random
+from pathlib import Path
+
+BIG_FIVE = ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism"]
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "demo"
+
+
+def load_demo_teams():
+    """デモのチームデータをロード"""
+    with open(DATA_DIR / "teams.json", "r", encoding="utf-8") as f:
+        return json.load(f)["teams"]
+
+
+def generate_personality_around_average(culture_profile, rng):
+    """チーム平均の周辺に性格プロファイルを生成"""
+    return {
+        dim: max(0, min(100, int(rng.gauss(culture_profile[dim], culture_profile[f"{dim}_variance"]))))
+        for dim in BIG_FIVE
+    }
+
+
+def generate_skills_for_team(team, num_skills, rng):
+    """チームの必要スキルから要求レベル±1のスキルを生成"""
+    requirements = team.get("requirements", [])
+    selected = rng.sample(requirements, min(num_skills, len(requirements)))
+    return [
+        {
+            "skill_id": req["skill_id"],
+            "proficiency_level": max(1, min(5, req["required_level"] + rng.choice([-1, 0, 0, 1]))),
+            "years_of_experience": rng.uniform(1.0, 8.0)
+        }
+        for req in selected
+    ]
+
+
+def generate_teams(size, seed=0, base_teams=None):
+    """デモチームを複製し、文化・稼働率に揺らぎを加えて size チームにする"""
+    rng = random.Random(seed)
+    base_teams = base_teams or load_demo_teams()
+    if size <= len(base_teams):
+        return copy.deepcopy(base_teams[:size])
+
+    teams = []
+    for i in range(size):
+        team = copy.deepcopy(base_teams[i % len(base_teams)])
+        if i >= len(base_teams):
+            team["id"] = f"team_syn_{i:05d}"
+            for dim in BIG_FIVE:
+                team["culture_profile"][dim] = max(0, min(100, team["culture_profile"][dim] + rng.randint(-10, 10)))
+            team["workload_average"] = max(40, min(100, team["workload_average"] + rng.randint(-10, 10)))
+        teams.append(team)
+    return teams
+
+
+def generate_people(size, teams, seed=0, prefix="syn"):
+    """
+    チームを基に size 人の候補者・従業員レコードを生成
+
+    各人はランダムなチームを基準に性格・スキルを持ち、team_id にそのチームを記録する。
+    """
+    rng = random.Random(seed)
+    people = []
+    for i in range(size):
+        team = teams[rng.randrange(len(teams))]
+        people.append({
+            "id": f"{prefix}_{i:06d}",
+            "team_id": team["id"],
+            "department": team["department"],
+            "personality_profile": generate_personality_around_average(team["culture_profile"], rng),
+            "skills": generate_skills_for_team(team, rng.randint(3, 6), rng)
+        })
+    return people